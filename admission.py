@@ -0,0 +1,149 @@
+import logging
+import math
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+# ─────────────────────────────────────────────
+# 📌 요청 허용 제어 (클라이언트 + 라우트별 토큰 버킷, 비싼 라우트 동시 실행 상한)
+# ─────────────────────────────────────────────
+# 토큰 버킷은 앱 DB와 별도의 작은 SQLite 파일에 두어 같은 머신의 모든 워커가 공유한다 (외부 서비스 없음).
+# 요청마다 UPSERT ... RETURNING 한 문장으로 채우기 / 꺼내기 / 허용 여부를 원자적으로 처리한다.
+# 동시 실행 상한은 워커(프로세스)마다 따로 세고, 자리가 없으면 기다리지 않고 바로 거절한다.
+# 저장소가 잠겨 있거나 오류가 나면 요청을 막지 않고 통과시킨다 (store_errors로 셈).
+
+logger = logging.getLogger("cafe_wifi.admission")
+
+RATE_LIMITED, OVERLOADED = "rate_limited", "overloaded"
+PRUNE_SECONDS = 60   # 이 간격마다 오래 안 쓴 버킷 행을 지움
+IDLE_SECONDS = 3600
+
+Rule = namedtuple("Rule", "rate burst")                       # 초당 토큰 / 최대 토큰
+Decision = namedtuple("Decision", "status reason retry_after")  # 거절 응답 (429 / 503)
+
+CREATE_BUCKET_TABLE = (
+    "CREATE TABLE IF NOT EXISTS token_bucket "
+    "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, allowed INTEGER NOT NULL) WITHOUT ROWID"
+)
+# 지난 시간만큼 채운 토큰(available)이 1 이상이면 하나 꺼내고 allowed = 1
+TAKE_TOKEN = (
+    "INSERT INTO token_bucket (key, tokens, updated, allowed) VALUES (:key, :burst - 1, :now, 1) "
+    "ON CONFLICT (key) DO UPDATE SET "
+    "tokens = min(:burst, tokens + max(0, :now - updated) * :rate) "
+    "- (min(:burst, tokens + max(0, :now - updated) * :rate) >= 1), "
+    "allowed = min(:burst, tokens + max(0, :now - updated) * :rate) >= 1, "
+    "updated = max(updated, :now) "
+    "RETURNING tokens, allowed"
+)
+
+
+class TokenBucketStore:
+    """SQLite 파일 하나에 key별 토큰 버킷을 둔다. 스레드마다 커넥션을 따로 연다."""
+
+    def __init__(self, path, busy_timeout_ms=50, clock=time.time):
+        self.path = path
+        self._busy_timeout_ms = busy_timeout_ms
+        self._clock = clock  # 워커끼리 비교하므로 벽시계 시간
+        self._local = threading.local()
+        self._pruned_at = 0.0
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute(f"PRAGMA busy_timeout = {int(self._busy_timeout_ms)}")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = OFF")  # 재시작하면 버킷이 차 있어도 괜찮음
+            conn.execute(CREATE_BUCKET_TABLE)
+            self._local.conn = conn
+        return conn
+
+    def take(self, key, rule):
+        """토큰 하나를 꺼낸다. (허용 여부, 다음 토큰까지 남은 초)"""
+        now = self._clock()
+        conn = self._connection()
+        tokens, allowed = conn.execute(TAKE_TOKEN, {"key": key, "rate": rule.rate,
+                                                    "burst": rule.burst, "now": now}).fetchone()
+        if now - self._pruned_at >= PRUNE_SECONDS:
+            self._pruned_at = now
+            # 한동안 쓰지 않은 버킷은 이미 가득 찼으므로 지워도 결과가 같음 (burst / rate가 IDLE_SECONDS보다 짧을 때)
+            conn.execute("DELETE FROM token_bucket WHERE updated < :cutoff", {"cutoff": now - IDLE_SECONDS})
+        if allowed:
+            return True, 0.0
+        return False, (1 - tokens) / rule.rate
+
+
+class AdmissionControl:
+    """endpoint별 규칙(Rule)과 동시 실행 상한으로 요청을 허용하거나 거절한다.
+
+    rules에 없는 엔드포인트는 default_rule, default_rule도 None이면 토큰 버킷을 쓰지 않는다.
+    """
+
+    def __init__(self, store, rules=None, default_rule=None, concurrency=None):
+        self.store = store
+        self.rules = dict(rules or {})
+        self.default_rule = default_rule
+        self._slots = {endpoint: threading.BoundedSemaphore(limit)
+                       for endpoint, limit in (concurrency or {}).items() if limit > 0}
+        self._lock = threading.Lock()
+        self.running = {}   # endpoint -> 이 워커에서 실행 중인 요청 수 (동시 실행 상한이 있는 엔드포인트만)
+        self.allowed = {}   # endpoint -> int
+        self.shed = {}      # (endpoint, reason) -> int
+        self.store_errors = 0
+
+    def admit(self, endpoint, client):
+        """허용하면 None (이후 반드시 release(endpoint) 호출), 거절하면 Decision"""
+        rule = self.rules.get(endpoint, self.default_rule)
+        if rule is not None and self.store is not None:
+            try:
+                allowed, wait = self.store.take(f"{endpoint}|{client}", rule)
+            except sqlite3.Error:
+                logger.exception("token bucket store unavailable, admitting %s", endpoint)
+                with self._lock:
+                    self.store_errors += 1
+            else:
+                if not allowed:
+                    return self._reject(endpoint, Decision(429, RATE_LIMITED, max(1, math.ceil(wait))))
+        slots = self._slots.get(endpoint)
+        if slots is not None and not slots.acquire(blocking=False):
+            # 줄을 세우지 않고 바로 거절 (기다리는 요청이 워커 스레드를 붙잡지 않게)
+            return self._reject(endpoint, Decision(503, OVERLOADED, 1))
+        with self._lock:
+            self.allowed[endpoint] = self.allowed.get(endpoint, 0) + 1
+            if slots is not None:
+                self.running[endpoint] = self.running.get(endpoint, 0) + 1
+        return None
+
+    def release(self, endpoint):
+        slots = self._slots.get(endpoint)
+        if slots is not None:
+            with self._lock:
+                self.running[endpoint] -= 1
+            slots.release()
+
+    def _reject(self, endpoint, decision):
+        with self._lock:
+            key = (endpoint, decision.reason)
+            self.shed[key] = self.shed.get(key, 0) + 1
+        return decision
+
+    def metrics_lines(self, labels):
+        """Prometheus 텍스트 줄 (labels는 metrics.labels)"""
+        lines = ["# HELP cafe_admission_allowed_total Requests admitted by rate limit / concurrency checks",
+                 "# TYPE cafe_admission_allowed_total counter"]
+        with self._lock:
+            lines += [f"cafe_admission_allowed_total{{{labels(endpoint=endpoint)}}} {count}"
+                      for endpoint, count in sorted(self.allowed.items())]
+            lines += ["# HELP cafe_admission_shed_total Requests rejected (rate_limited = 429, overloaded = 503)",
+                      "# TYPE cafe_admission_shed_total counter"]
+            lines += [f"cafe_admission_shed_total{{{labels(endpoint=endpoint, reason=reason)}}} {count}"
+                      for (endpoint, reason), count in sorted(self.shed.items())]
+            lines += ["# HELP cafe_admission_store_errors_total Token bucket store errors (requests were admitted)",
+                      "# TYPE cafe_admission_store_errors_total counter",
+                      f"cafe_admission_store_errors_total {self.store_errors}"]
+            lines += ["# HELP cafe_admission_in_flight Requests running on concurrency-capped endpoints in this worker",
+                      "# TYPE cafe_admission_in_flight gauge"]
+            lines += [f"cafe_admission_in_flight{{{labels(endpoint=endpoint)}}} {self.running.get(endpoint, 0)}"
+                      for endpoint in sorted(self._slots)]
+        return lines
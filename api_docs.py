@@ -0,0 +1,89 @@
+import json
+import os
+import threading
+
+import click
+from flask import Flask, current_app, jsonify
+from flask.cli import with_appcontext
+
+# ─────────────────────────────────────────────
+# 📌 Swagger 문서 지연 로딩 (flasgger는 문서 경로에 처음 요청이 올 때 import)
+# ─────────────────────────────────────────────
+# @swag_from은 스펙 dict를 뷰 함수에 붙여 두기만 한다 (flasgger가 읽는 속성 이름 specs_dict 그대로).
+# Flask는 첫 요청 이후 라우트 추가를 막으므로 문서 경로는 가벼운 뷰로 미리 등록하고,
+# 첫 요청 때 flasgger로 스펙을 만들고 문서 UI / 정적 파일은 flasgger가 등록된 별도 앱이 처리한다.
+# APISPEC_FILE(flask apispec 명령으로 미리 만든 JSON)이 있으면 스펙을 만들지 않고 그 파일을 쓴다.
+
+SPEC_ENDPOINT = "apispec_1"
+SPEC_ROUTE = "/apispec_1.json"
+DOCS_ROUTES = ("/apidocs/", "/apidocs/index.html", "/oauth2-redirect.html", "/flasgger_static/<path:filename>")
+
+
+def swag_from(specs):
+    """flasgger.utils.swag_from(dict)와 같은 스펙 등록 (요청마다 거치는 래퍼 없음)"""
+    def decorator(function):
+        function.specs_dict = specs
+        return function
+    return decorator
+
+
+class LazyDocs:
+    def __init__(self, template, spec_file=None):
+        self.template = template
+        self.spec_file = spec_file
+        self._lock = threading.Lock()
+        self._swagger = None
+        self._docs_app = None
+        self._spec = None
+
+    def init_app(self, app):
+        app.add_url_rule(SPEC_ROUTE, "apispec", self.spec_view)
+        for rule in DOCS_ROUTES:
+            app.add_url_rule(rule, "apidocs", self.docs_view)
+        app.cli.add_command(dump_apispec)
+        app.extensions["api_docs"] = self
+
+    def _load(self):
+        with self._lock:
+            if self._docs_app is None:
+                from flasgger import Swagger
+
+                docs_app = Flask(__name__)
+                docs_app.config["SWAGGER"] = current_app.config["SWAGGER"]
+                self._swagger = Swagger(docs_app, template=self.template)
+                self._docs_app = docs_app
+        return self._swagger, self._docs_app
+
+    def build_spec(self):
+        """current_app의 라우트로 스펙을 만든다."""
+        swagger, _ = self._load()
+        return swagger.get_apispecs(SPEC_ENDPOINT)
+
+    def spec(self):
+        """미리 만든 파일 또는 build_spec() 결과 (프로세스당 한 번)"""
+        if self._spec is None:
+            if self.spec_file and os.path.exists(self.spec_file):
+                with open(self.spec_file, encoding="utf-8") as f:
+                    self._spec = json.load(f)
+            else:
+                self._spec = self.build_spec()
+        return self._spec
+
+    def spec_view(self):
+        return jsonify(self.spec())
+
+    def docs_view(self, filename=None):
+        # Flask는 WSGI 앱을 반환하면 현재 요청 environ으로 호출해서 응답을 만든다
+        _, docs_app = self._load()
+        return docs_app.wsgi_app
+
+
+@click.command("apispec")
+@with_appcontext
+@click.option("--output", "-o", default="apispec.json", show_default=True, help="저장할 JSON 파일 경로")
+def dump_apispec(output):
+    """OpenAPI 스펙을 미리 만들어 파일로 저장 (APISPEC_FILE로 지정하면 워커가 스펙을 만들지 않음)"""
+    spec = current_app.extensions["api_docs"].build_spec()
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(spec, f, ensure_ascii=False, indent=2)
+    click.echo(f"{len(spec.get('paths', {}))} paths -> {output}")
@@ -0,0 +1,475 @@
+"""비동기 읽기 API (ASGI 진입점)
+
+    uvicorn asgi:app --host 0.0.0.0 --port 8000
+
+GET /cafes, /cafes/{id}, /cafes/random, /cafes/location/{location} 은 aiosqlite 커넥션 풀을
+쓰는 비동기 핸들러가 처리하고, 나머지 경로(쓰기 API, 페이지, Swagger)는 기존 Flask 앱으로 넘긴다.
+모델 / cafe_to_dict / 인메모리 인덱스 / 응답 캐시를 Flask 앱과 같은 프로세스에서 공유하므로
+Flask 쪽 쓰기 라우트가 갱신한 내용이 바로 반영된다. 기존 WSGI 실행(flask run)은 그대로 동작한다.
+"""
+import json
+import os
+from contextlib import asynccontextmanager
+from urllib.parse import urlencode
+
+from a2wsgi import WSGIMiddleware
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.applications import Starlette
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Mount, Route
+from werkzeug.datastructures import MultiDict
+from werkzeug.http import parse_accept_header, parse_etags
+
+import main
+import cafe_rows
+import compression
+import metrics
+import sqlite_profile
+from cafe_serializer import join_fragments
+from response_cache import CACHED_HEADERS
+from main import (
+    Cafe, cafe_index, fragment_store, list_body_cache, response_cache,
+    MAX_RANDOM_SAMPLES, STREAM_BATCH_SIZE,
+)
+from cafe_index import bits_from_ids, ids_from_bits
+
+# ─────────────────────────────────────────────
+# 📌 비동기 엔진 (읽기 전용, Flask 앱과 같은 DB 파일)
+# ─────────────────────────────────────────────
+
+engine = create_async_engine(
+    f"sqlite+aiosqlite:///{main.db_path}",
+    pool_size=int(os.getenv("ASGI_DB_POOL_SIZE", 8)),
+    max_overflow=int(os.getenv("ASGI_DB_POOL_OVERFLOW", 8)),
+)
+sqlite_profile.install_reader(engine.sync_engine, main.DB_PROFILE)
+metrics.instrument_engine(engine.sync_engine)
+Session = async_sessionmaker(engine, expire_on_commit=False)
+
+
+# ─────────────────────────────────────────────
+# 📌 유틸리티 (Flask 쪽 함수의 비동기 버전)
+# ─────────────────────────────────────────────
+
+def query_args(request):
+    # main.parse_* 함수가 Flask request.args와 같은 방식(get(..., type=int))으로 읽을 수 있도록 변환
+    return MultiDict(request.query_params.multi_items())
+
+
+def json_response(data, status=200):
+    # jsonify와 같은 출력 (키 정렬, 공백 없음, 끝에 줄바꿈)
+    return Response(json.dumps(data, sort_keys=True, separators=(",", ":")) + "\n",
+                    status_code=status, media_type="application/json")
+
+
+def json_body_response(body, status=200):
+    return Response(body, status_code=status, media_type="application/json")
+
+
+def next_link(request, **params):
+    return f'<{request.url.path}?{urlencode({**dict(request.query_params), **params})}>; rel="next"'
+
+
+async def execute_cafe_rows(session, stmt, params):
+    """main.execute_cafe_rows의 비동기 버전 (세션의 커넥션에서 Core로 실행, ORM 인스턴스 대신 CafeRow 목록)"""
+    connection = await session.connection()
+    return list(cafe_rows.from_result(await connection.execute(stmt, params)))
+
+
+async def load_cafes_by_ids(session, ids):
+    return await execute_cafe_rows(session, main.CAFE_ROWS_BY_IDS, {"ids": list(ids)})
+
+
+async def fragments_for_ids(session, ids, on_missing=None):
+    """fragment_store.fragments_for_ids의 비동기 버전 (캐시에 없는 id만 한 번의 IN 쿼리로 조회)"""
+    found, missing = fragment_store.cached(ids)
+    if missing:
+        for cafe in await load_cafes_by_ids(session, missing):
+            found[cafe.id] = fragment_store.fragment(cafe)
+        if on_missing:
+            on_missing(set(missing) - found.keys())
+    return [found[cafe_id] for cafe_id in ids if cafe_id in found]
+
+
+async def ensure_index_loaded(session):
+    if not cafe_index.loaded:
+        version = await session.scalar(main.change_version_stmt())
+        rows = (await session.execute(main.cafe_index_rows_stmt())).all()
+        cafe_index.ensure_loaded(lambda: rows, lambda: version)
+
+
+async def sync_index(session):
+    """main.sync_cafe_index의 비동기 버전 (다른 워커의 변경을 변경 피드에서 반영)"""
+    await ensure_index_loaded(session)
+    version = await session.scalar(main.change_version_stmt()) or 0
+    if version <= cafe_index.version:
+        return
+    rows = (await session.execute(main.cafe_changes_stmt(cafe_index.version))).all()
+    ids = [row.cafe_id for row in rows if not row.deleted]
+    current = {}
+    for start in range(0, len(ids), main.MAX_PAGE_LIMIT):
+        stmt = main.cafe_index_rows_stmt().where(Cafe.id.in_(ids[start:start + main.MAX_PAGE_LIMIT]))
+        current.update((row[0], tuple(row[1:])) for row in await session.execute(stmt))
+    cafe_index.apply_changes(main.cafe_index_changes([(row.cafe_id, current.get(row.cafe_id)) for row in rows]),
+                             version)
+
+
+async def sync_catalog(session):
+    """main.sync_catalog의 비동기 버전 (순번이 앞서 있으면 그 사이에 바뀐 카페의 조각을 먼저 지움)"""
+    version = await session.scalar(main.change_version_stmt()) or 0
+    since = response_cache.version
+    rows = ()
+    if version > since and main.fragments_may_be_stale(since):
+        # sync의 drop_changed는 동기 함수라서 변경 피드를 미리 읽어 둠
+        rows = (await session.execute(main.cafe_changes_stmt(since))).all()
+    return response_cache.sync(version, lambda _: main.drop_changed_fragments(rows))
+
+
+async def filtered_cafe_bits(session, filters, location=None):
+    await sync_index(session)
+    restrict = None
+    if location:
+        matches = main.search_index.match_subquery(location, columns=("location",))
+        restrict = 0
+        if matches is not None:
+            restrict = bits_from_ids(await session.scalars(select(Cafe.id).where(Cafe.id.in_(matches))))
+    return cafe_index.filter_bits(filters, restrict)
+
+
+async def generate_cafe_chunks(batches, fmt="json"):
+    """조각 배치(async iterator)를 JSON 배열 / NDJSON 청크로 변환"""
+    if fmt == "json":
+        yield b"["
+    first = True
+    async for fragments in batches:
+        if not fragments:
+            continue
+        if fmt == "ndjson":
+            yield b"\n".join(fragments) + b"\n"
+        else:
+            yield (b"" if first else b",") + b",".join(fragments)
+            first = False
+    if fmt == "json":
+        yield b"]"
+
+
+async def fragment_batches_for_ids(ids):
+    # 스트리밍은 핸들러가 반환된 뒤에 진행되므로 세션을 제너레이터 안에서 연다
+    async with Session() as session:
+        for start in range(0, len(ids), STREAM_BATCH_SIZE):
+            yield await fragments_for_ids(session, ids[start:start + STREAM_BATCH_SIZE])
+
+
+async def fragment_batches_after(after):
+    async with Session() as session:
+        connection = await session.connection()
+        result = await connection.stream(main.CAFE_ROWS_STREAM, {"after": after})
+        async for rows in result.partitions():
+            yield [fragment_store.fragment(cafe) for cafe in cafe_rows.from_result(rows)]
+
+
+def stream_cafes(batches, fmt="json"):
+    media_type = "application/x-ndjson" if fmt == "ndjson" else "application/json"
+    return StreamingResponse(generate_cafe_chunks(batches, fmt), media_type=media_type)
+
+
+def precompressed_list_response(request, bodies):
+    accept = parse_accept_header(request.headers.get("accept-encoding"))
+    encoding = accept.best_match(list_body_cache.encodings + ("identity",), default="identity")
+    response = json_body_response(bodies.get(encoding, bodies["identity"]))
+    if encoding in bodies and encoding != "identity":
+        response.headers["Content-Encoding"] = encoding
+    response.headers["Vary"] = "Accept-Encoding"
+    return response
+
+
+def timed(endpoint):
+    """main의 metrics.init_flask 훅과 같은 이름(뷰 함수 이름)으로 지연 시간 / 쿼리 수를 기록한다.
+    스트리밍 응답은 핸들러가 응답을 반환한 시점까지만 잰다."""
+    def decorator(handler):
+        async def wrapper(request):
+            token = metrics.registry.start_request()
+            metrics.set_endpoint(endpoint)
+            status = 500
+            try:
+                response = await handler(request)
+                status = response.status_code
+                return response
+            finally:
+                metrics.registry.finish_request(token, endpoint, request.method, status)
+        return wrapper
+    return decorator
+
+
+class ReleaseAfterSend:
+    """응답을 다 보내거나 중간에 끊긴 뒤 동시 실행 자리를 돌려준다 (스트리밍 응답도 끝까지 자리를 차지)."""
+
+    def __init__(self, response, endpoint):
+        self.response = response
+        self.endpoint = endpoint
+
+    def __getattr__(self, name):
+        return getattr(self.response, name)
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await self.response(scope, receive, send)
+        finally:
+            main.admission.release(self.endpoint)
+
+
+def admitted(endpoint):
+    """main.admit_request와 같은 토큰 버킷 / 동시 실행 상한 (관리자는 통과, 거절하면 429 / 503 + Retry-After)"""
+    def decorator(handler):
+        async def wrapper(request):
+            admission = main.admission
+            if admission is None or main.is_admin_token(request.headers.get("authorization"),
+                                                        request.cookies.get("admin_token")):
+                return await handler(request)
+            client = main.admission_client(request.client.host if request.client else None, request.headers)
+            decision = admission.admit(endpoint, client)
+            if decision is not None:
+                response = json_response({"error": main.shed_message(decision)}, decision.status)
+                response.headers["Retry-After"] = str(decision.retry_after)
+                return response
+            try:
+                response = await handler(request)
+            except BaseException:
+                admission.release(endpoint)
+                raise
+            return ReleaseAfterSend(response, endpoint)
+        return wrapper
+    return decorator
+
+
+def compressed(handler):
+    """main의 compression 훅과 같은 조건으로 br / gzip 압축 (이미 압축된 응답은 그대로, 스트리밍은 청크마다 flush)"""
+    async def wrapper(request):
+        response = await handler(request)
+        streamed = isinstance(response, StreamingResponse)
+        if (main.COMPRESS_LEVEL <= 0
+                or not compression.compressible(response.status_code, response.media_type, response.headers)
+                or (not streamed and len(response.body) < main.COMPRESS_MIN_BYTES)):
+            return response
+        response.headers.add_vary_header("Accept-Encoding")
+        encoding = compression.negotiate(parse_accept_header(request.headers.get("accept-encoding")))
+        if encoding is None:
+            return response
+        if streamed:
+            response.body_iterator = compression.compress_async_chunks(
+                response.body_iterator, encoding, main.COMPRESS_LEVEL, main.BROTLI_QUALITY)
+        else:
+            response.body = compression.compress(response.body, encoding, main.COMPRESS_LEVEL, main.BROTLI_QUALITY)
+            response.headers["Content-Length"] = str(len(response.body))
+        response.headers["Content-Encoding"] = encoding
+        return response
+    return wrapper
+
+
+def cached_read(endpoint):
+    """main.cached_read와 같은 캐시 키 / ETag를 써서 Flask 쪽과 응답 캐시를 공유한다."""
+    def decorator(handler):
+        async def wrapper(request):
+            async with Session() as session:
+                version = await sync_catalog(session)
+            etag = response_cache.etag(version)
+            if parse_etags(request.headers.get("if-none-match")).contains_weak(etag):
+                return Response(status_code=304, headers={"ETag": f'W/"{etag}"'})
+
+            key = (endpoint, request.url.path, tuple(sorted(request.query_params.multi_items())))
+            entry = response_cache.get(key)
+            if entry is not None:
+                body, encoding, vary = compression.cached_body(
+                    entry, parse_accept_header(request.headers.get("accept-encoding")),
+                    main.COMPRESS_MIN_BYTES, main.COMPRESS_LEVEL, main.BROTLI_QUALITY)
+                response = Response(body, status_code=entry.status, media_type=entry.mimetype,
+                                    headers=dict(entry.headers))
+                if encoding is not None:
+                    response.headers["Content-Encoding"] = encoding
+                if vary:
+                    response.headers.add_vary_header("Accept-Encoding")
+            else:
+                response = await handler(request)
+                if (response.status_code in (200, 404) and not isinstance(response, StreamingResponse)
+                        and "vary" not in response.headers):
+                    response_cache.put(key, version, response.status_code, response.body, response.media_type,
+                                       [(name, response.headers[name]) for name in CACHED_HEADERS if name in response.headers])
+
+            if response.status_code == 200:
+                response.headers["ETag"] = f'W/"{etag}"'
+            return response
+        return wrapper
+    return decorator
+
+
+# ─────────────────────────────────────────────
+# 📌 비동기 읽기 라우트 (응답 형식 / 파라미터는 Flask 라우트와 동일)
+# ─────────────────────────────────────────────
+
+# [GET] 모든 카페 조회 API
+@timed("get_all_cafes")
+@admitted("get_all_cafes")
+@compressed
+@cached_read("get_all_cafes")
+async def get_all_cafes(request):
+    args = query_args(request)
+    after = main.parse_after(args)
+    stream = args.get("stream")
+    if stream and stream not in ("ndjson", "json"):
+        return json_response({"error": "stream must be 'ndjson' or 'json'"}, 400)
+    try:
+        filters = main.parse_amenity_filters(args)
+        ranges = main.parse_range_filters(args)
+        sort = main.parse_sort(args)
+        cursor = main.decode_cursor(args["cursor"]) if args.get("cursor") else None
+        main.check_after_mode(args, ranges, sort, cursor)
+    except ValueError as e:
+        return json_response({"error": str(e)}, 400)
+    location = args.get("location", "").strip()
+    limit = main.parse_page_limit(args)
+
+    async with Session() as session:
+        # 범위 / 정렬 모드
+        if ranges or sort or cursor:
+            stmt = main.sorted_cafe_rows_stmt(filters, location, ranges, sort or "id", cursor,
+                                              None if limit is None else limit + 1)
+            rows = [] if stmt is None else (await session.execute(stmt)).all()
+            ids = [row[0] for row in rows]
+            if stream:
+                return stream_cafes(fragment_batches_for_ids(ids), stream)
+            response = json_body_response(join_fragments(await fragments_for_ids(session, ids[:limit])))
+            if limit is not None and len(rows) > limit:
+                last_id, last_value = rows[limit - 1]
+                response.headers["Link"] = next_link(request, limit=limit,
+                                                     cursor=main.encode_cursor(last_value, last_id))
+            return response
+
+        # 필터 모드 (인메모리 비트셋)
+        if filters or location:
+            bits = await filtered_cafe_bits(session, filters, location)
+            if stream:
+                return stream_cafes(fragment_batches_for_ids(ids_from_bits(bits, after)), stream)
+            ids = ids_from_bits(bits, after, None if limit is None else limit + 1)
+            response = json_body_response(join_fragments(await fragments_for_ids(session, ids[:limit])))
+            if limit is not None and len(ids) > limit:
+                response.headers["Link"] = next_link(request, limit=limit, after=ids[limit - 1])
+            return response
+
+        # 스트리밍 모드
+        if stream:
+            return stream_cafes(fragment_batches_after(after), stream)
+
+        # 페이지네이션 모드
+        if limit is not None:
+            cafes = await execute_cafe_rows(session, main.CAFE_ROWS_PAGE, {"after": after, "limit": limit + 1})
+            response = json_body_response(join_fragments([fragment_store.fragment(cafe) for cafe in cafes[:limit]]))
+            if len(cafes) > limit:
+                response.headers["Link"] = next_link(request, limit=limit, after=cafes[limit - 1].id)
+            return response
+
+        # 기본 모드: 카탈로그 버전별 전체 목록 (Flask 쪽과 같은 압축본 캐시 사용, LIST_BODY_MAX_ROWS보다 크면 스트리밍)
+        version = response_cache.version
+        bodies = list_body_cache.cached(version)
+        if bodies is None:
+            ids = (await session.scalars(
+                select(Cafe.id).order_by(Cafe.id).limit(main.LIST_BODY_MAX_ROWS + 1)
+            )).all()
+            body = None
+            if len(ids) <= main.LIST_BODY_MAX_ROWS:
+                fragments = []
+                for start in range(0, len(ids), STREAM_BATCH_SIZE):
+                    fragments.extend(await fragments_for_ids(session, ids[start:start + STREAM_BATCH_SIZE]))
+                body = join_fragments(fragments)
+            bodies = list_body_cache.store(version, body)
+    if not bodies:
+        return stream_cafes(fragment_batches_after(0))
+    if bodies["identity"] == b"[]":
+        return json_response({"error": "No cafes found"}, 404)
+    return precompressed_list_response(request, bodies)
+
+
+# [GET] 랜덤 카페 조회 API
+@timed("get_random_cafe")
+@admitted("get_random_cafe")
+@compressed
+async def get_random_cafe(request):
+    args = query_args(request)
+    n = args.get("n", type=int)
+    try:
+        filters = main.parse_amenity_filters(args)
+    except ValueError as e:
+        return json_response({"error": str(e)}, 400)
+    k = 1 if n is None else max(1, min(n, MAX_RANDOM_SAMPLES))
+
+    async with Session() as session:
+        await sync_index(session)
+        await sync_catalog(session)
+        ids = cafe_index.sample(k, filters)
+
+        def drop_deleted(deleted_ids):
+            # 변경 피드를 읽은 뒤에 삭제된 id는 인덱스에서 제거
+            for cafe_id in deleted_ids:
+                main.drop_cafe_from_indexes(cafe_id)
+
+        fragments = await fragments_for_ids(session, ids, on_missing=drop_deleted)
+    if not fragments:
+        return json_response({"error": "No cafes found"}, 404)
+
+    if n is None:
+        return json_body_response(fragments[0])
+    return json_body_response(join_fragments(fragments))
+
+
+# [GET] 개별 카페 정보 조회 API
+@timed("get_cafe_by_id")
+@admitted("get_cafe_by_id")
+@compressed
+@cached_read("get_cafe_by_id")
+async def get_cafe_by_id(request):
+    async with Session() as session:
+        fragments = await fragments_for_ids(session, [request.path_params["cafe_id"]])
+    if not fragments:
+        return json_response({"error": "Cafe not found"}, 404)
+    return json_body_response(fragments[0])
+
+
+# [GET] 위치 기반 카페 검색 API
+@timed("search_cafes_by_location")
+@admitted("search_cafes_by_location")
+@compressed
+@cached_read("search_cafes_by_location")
+async def search_cafes_by_location(request):
+    location = request.path_params["location"]
+    args = query_args(request)
+    try:
+        ranges = main.parse_range_filters(args)
+        sort = main.parse_sort(args)
+    except ValueError as e:
+        return json_response({"error": str(e)}, 400)
+
+    async with Session() as session:
+        stmt = main.sorted_cafe_rows_stmt({}, location, ranges, sort or "id")
+        ids = [] if stmt is None else [row[0] for row in (await session.execute(stmt)).all()]
+        if ids:
+            return json_body_response(join_fragments(await fragments_for_ids(session, ids)))
+    return json_response({"error": f"No cafes found at location '{location}'"}, 404)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    await engine.dispose()
+
+
+# 위 네 경로의 GET만 비동기로 처리하고 나머지는 모두 Flask 앱으로 전달
+app = Starlette(
+    routes=[
+        Route("/cafes", get_all_cafes, methods=["GET"]),
+        Route("/cafes/random", get_random_cafe, methods=["GET"]),
+        Route("/cafes/{cafe_id:int}", get_cafe_by_id, methods=["GET"]),
+        Route("/cafes/location/{location}", search_cafes_by_location, methods=["GET"]),
+        Mount("/", app=WSGIMiddleware(main.app)),
+    ],
+    lifespan=lifespan,
+)
@@ -0,0 +1,164 @@
+"""Flask(WSGI, 스레드 서버) vs 비동기 읽기 API(ASGI, uvicorn) 부하 테스트
+
+    python benchmarks/asgi_vs_wsgi.py --cafes 5000 --concurrency 200 --idle 500 --seconds 10
+
+같은 임시 DB로 두 서버를 차례로 띄우고, --idle 개의 느린 클라이언트(요청 헤더를 끝내지 않는
+연결)를 붙잡아 둔 채 --concurrency 개의 keep-alive 연결로 네 읽기 API에 요청을 보낸다.
+두 서버 모두 DB_PROFILE=production, 응답 캐시는 끄고 측정한다. uvicorn 필요.
+(클라이언트는 표준 라이브러리 asyncio로 만든 최소한의 HTTP/1.1 keep-alive 클라이언트,
+ 연결 수가 많으면 클라이언트 쪽이 먼저 병목이 되지 않도록 httpx 등은 쓰지 않음)
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from sqlite_profiles import LOCATIONS, percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVERS = {
+    "wsgi": lambda port: [sys.executable, "-c",
+                          "import main; from werkzeug.serving import run_simple; "
+                          f"run_simple('127.0.0.1', {port}, main.app, threaded=True)"],
+    "asgi": lambda port: [sys.executable, "-m", "uvicorn", "asgi:app", "--port", str(port), "--log-level", "warning"],
+}
+
+
+def seed_database(env, cafes):
+    """자식 프로세스에서 main을 import해서 (설정은 import 시점에 읽힘) 데이터를 넣는다."""
+    code = ("import sys; sys.path.insert(0, 'benchmarks'); import main; from sqlite_profiles import seed; "
+            "main.app.app_context().push(); main.init_db(); "
+            f"print(seed(main.app.test_client(), {{'Authorization': 'Bearer bench-token'}}, {cafes}))")
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, check=True, capture_output=True)
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+def random_url(rng, cafe_count):
+    choice = rng.random()
+    if choice < 0.4:
+        return f"/cafes/{rng.randint(1, cafe_count)}"
+    if choice < 0.6:
+        return f"/cafes/random?n=5&has_wifi={rng.randint(0, 1)}"
+    if choice < 0.8:
+        return f"/cafes/location/{rng.choice(LOCATIONS)}?sort=price"
+    return f"/cafes?limit=20&after={rng.randint(0, cafe_count)}"
+
+
+async def open_idle_connections(port, count):
+    # 요청 헤더를 보내다 만 느린 클라이언트 (서버 쪽 워커 / 스레드를 붙잡음)
+    connections = []
+    for _ in range(count):
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"GET /cafes/1 HTTP/1.1\r\nHost: localhost\r\n")
+            await writer.drain()
+            connections.append(writer)
+        except OSError:
+            break
+    return connections
+
+
+async def get(reader, writer, url):
+    """GET 요청 하나를 보내고 (상태 코드, 연결 유지 여부)를 돌려준다 (Content-Length 응답만 지원)"""
+    writer.write(f"GET {url} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    headers = dict(line.lower().split(": ", 1) for line in lines[1:] if ": " in line)
+    await reader.readexactly(int(headers.get("content-length", 0)))
+    # 서버가 keep-alive를 지원하지 않으면 (werkzeug 개발 서버) 다음 요청은 새 연결로 보냄
+    return int(lines[0].split()[1]), headers.get("connection") != "close"
+
+
+async def load(port, cafe_count, concurrency, seconds, idle):
+    idle_connections = await open_idle_connections(port, idle)
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + seconds
+
+    async def user(rng):
+        nonlocal errors
+        reader = writer = None
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                status, keep_alive = await get(reader, writer, random_url(rng, cafe_count))
+                if status >= 500:
+                    errors += 1
+                if not keep_alive:
+                    writer.close()
+                    reader = writer = None
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                errors += 1
+                if writer is not None:
+                    writer.close()
+                reader = writer = None
+            latencies.append(time.perf_counter() - started)
+        if writer is not None:
+            writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user(random.Random(i)) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    for writer in idle_connections:
+        writer.close()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "idle_connections": len(idle_connections),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cafes", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--idle", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--servers", default="wsgi,asgi")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, "DB_PROFILE": "production", "CAFE_DB_PATH": os.path.join(tmp, "bench.db"),
+               "ADMIN_TOKEN": "bench-token", "CACHE_MAX_ENTRIES": "0"}
+        seed_database(env, args.cafes)
+        for name in args.servers.split(","):
+            server = subprocess.Popen(SERVERS[name](args.port), cwd=ROOT, env=env,
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                wait_for_port(args.port)
+                results[name] = asyncio.run(load(args.port, args.cafes, args.concurrency, args.seconds, args.idle))
+            finally:
+                server.terminate()
+                server.wait()
+
+    print(f"{'server':<6} {'req/s':>8} {'requests':>9} {'errors':>7} {'idle':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, result in results.items():
+        print(f"{name:<6} {result['requests_per_second']:>8} {result['requests']:>9} {result['errors']:>7} "
+              f"{result['idle_connections']:>6} {result['p50_ms']:>8} {result['p95_ms']:>8} {result['p99_ms']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""벤치마크용 합성 카페 카탈로그 생성 (1k / 100k / 1M)
+
+    python benchmarks/catalog.py --size 100k
+    python benchmarks/catalog.py --size 1m --seed 7 --backlog 50000
+
+실제 데이터처럼 보이는 한국 지역명(시 / 구 / 동), 가격 문자열('₩4,500', '4500원', '4.5천원'),
+좌석 문자열('50석', '20-30', '50+'), 좌표가 들어 있는 지도 URL로 카페를 만들어 /cafes/bulk로 넣고
+(검색 / 좌표 인덱스까지 앱과 같은 경로로 채워짐) 수정 요청(UpdateRequest) 백로그를 추가한다.
+같은 크기 + 시드면 항상 같은 카탈로그가 나오며, 결과 DB는 benchmarks/catalogs/에 저장해 재사용한다.
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import closing
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CATALOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalogs")
+DEFAULT_SEED = 42
+IMPORT_CHUNK = 20000
+SIZES = {"1k": 1000, "100k": 100000, "1m": 1000000}
+
+# (시, 위도, 경도, 구 / 동 목록)
+CITIES = (
+    ("서울", 37.5665, 126.9780, (("강남구", ("역삼동", "삼성동", "논현동", "신사동", "청담동")),
+                                ("마포구", ("연남동", "합정동", "망원동", "상수동", "서교동")),
+                                ("종로구", ("익선동", "삼청동", "혜화동", "부암동")),
+                                ("성동구", ("성수동1가", "성수동2가", "옥수동")),
+                                ("용산구", ("이태원동", "한남동", "후암동")),
+                                ("송파구", ("잠실동", "방이동", "문정동")))),
+    ("부산", 35.1796, 129.0756, (("해운대구", ("우동", "중동", "좌동")),
+                                ("수영구", ("광안동", "민락동")),
+                                ("부산진구", ("전포동", "부전동")))),
+    ("인천", 37.4563, 126.7052, (("연수구", ("송도동", "연수동")),
+                                ("중구", ("신포동", "운서동")))),
+    ("대구", 35.8714, 128.6014, (("중구", ("삼덕동", "동인동")),
+                                ("수성구", ("범어동", "황금동")))),
+    ("대전", 36.3504, 127.3845, (("유성구", ("봉명동", "궁동")),
+                                ("서구", ("둔산동",)))),
+    ("광주", 35.1595, 126.8526, (("동구", ("충장동", "동명동")),)),
+    ("제주", 33.4996, 126.5312, (("제주시", ("애월읍", "한림읍", "연동")),)),
+)
+BRANDS = ("카페", "커피", "로스터리", "스타벅스", "투썸플레이스", "이디야", "블루보틀", "빽다방", "Cafe", "Coffee Lab")
+WORDS = ("온도", "모음", "담", "소소", "하루", "빈", "숲", "오후", "달빛", "모퉁이", "Nook", "Grind", "Bean", "Daily")
+
+
+def size_value(label):
+    """'1k' / '100k' / '1m' 또는 숫자 문자열"""
+    label = str(label).lower()
+    if label in SIZES:
+        return SIZES[label]
+    return int(label)
+
+
+def catalog_path(size, seed=DEFAULT_SEED):
+    return os.path.join(CATALOG_DIR, f"cafes-{str(size).lower()}-seed{seed}.db")
+
+
+def neighborhoods():
+    """(시, 구, 동, 위도, 경도) 목록 (검색 / 위치 시나리오에서도 사용)"""
+    return [(city, district, dong, lat, lng)
+            for city, lat, lng, districts in CITIES
+            for district, dongs in districts
+            for dong in dongs]
+
+
+def price_text(rng):
+    won = rng.randrange(2500, 8001, 100)
+    style = rng.random()
+    if style < 0.4:
+        return f"₩{won:,}"
+    if style < 0.7:
+        return f"{won}원"
+    if style < 0.85:
+        return f"{won / 1000:g}천원"
+    if style < 0.95:
+        return f"₩ {won:,}"
+    return "정보 없음"
+
+
+def seats_text(rng):
+    seats = rng.choice((6, 10, 12, 16, 20, 24, 30, 40, 50, 60, 80, 100))
+    style = rng.random()
+    if style < 0.5:
+        return f"{seats}석"
+    if style < 0.7:
+        return f"{seats}-{seats + 10}"
+    if style < 0.85:
+        return f"{seats}+"
+    if style < 0.95:
+        return f"약 {seats}석"
+    return "Unknown"
+
+
+def map_url(rng, name, lat, lng):
+    # 10%는 좌표가 없는 단축 링크
+    if rng.random() < 0.1:
+        return f"https://g.page/{rng.getrandbits(40):x}"
+    lat, lng = lat + rng.gauss(0, 0.03), lng + rng.gauss(0, 0.03)
+    return f"https://www.google.com/maps/place/{name.replace(' ', '+')}/@{lat:.6f},{lng:.6f},17z"
+
+
+def cafe_records(count, seed=DEFAULT_SEED):
+    """카페 레코드(dict)를 count개 만든다 (이름은 번호를 붙여 항상 고유)"""
+    rng = random.Random(seed)
+    places = neighborhoods()
+    for i in range(count):
+        city, district, dong, lat, lng = rng.choice(places)
+        name = f"{rng.choice(BRANDS)} {rng.choice(WORDS)} {dong} {i + 1}호점"
+        yield {
+            "name": name,
+            "map_url": map_url(rng, name, lat, lng),
+            "img_url": f"https://images.example.com/cafes/{i + 1}.jpg",
+            "location": f"{city} {district} {dong}",
+            "seats": seats_text(rng),
+            "coffee_price": price_text(rng),
+            "has_toilet": rng.random() < 0.8,
+            "has_wifi": rng.random() < 0.7,
+            "has_sockets": rng.random() < 0.5,
+            "can_take_calls": rng.random() < 0.4,
+        }
+
+
+def update_request_rows(count, cafe_count, seed=DEFAULT_SEED):
+    """수정 요청 백로그 (80%는 pending, 나머지는 이미 처리된 요청)"""
+    rng = random.Random(seed + 1)
+    started = datetime(2025, 1, 1)
+    for i in range(count):
+        row = {
+            "cafe_id": rng.randint(1, cafe_count),
+            "status": "pending" if rng.random() < 0.8 else rng.choice(("approved", "rejected")),
+            "created_at": (started + timedelta(minutes=i)).isoformat(),
+        }
+        change = rng.random()
+        if change < 0.5:
+            row["proposed_coffee_price"] = price_text(rng)
+        elif change < 0.7:
+            row["proposed_seats"] = seats_text(rng)
+        elif change < 0.9:
+            row["proposed_has_wifi"] = rng.random() < 0.5
+            row["proposed_has_sockets"] = rng.random() < 0.5
+        else:
+            row["proposed_img_url"] = f"https://images.example.com/updates/{i + 1}.jpg"
+        yield row
+
+
+def default_backlog(count):
+    return max(1000, count // 20)
+
+
+def generate(db_file, count, seed=DEFAULT_SEED, backlog=None):
+    """db_file에 카탈로그를 만든다. main이 import 시점에 설정을 읽으므로 새 프로세스에서 한 번만 호출."""
+    os.environ.update({"DB_PROFILE": "production", "CAFE_DB_PATH": db_file,
+                       "ADMIN_TOKEN": "bench-token", "CACHE_MAX_ENTRIES": "0", "SLOW_REQUEST_MS": "1e9"})
+    sys.path.insert(0, ROOT)
+    import main
+    from sqlalchemy import insert
+
+    with main.app.app_context():
+        main.init_db()
+    client = main.app.test_client()
+    headers = {"Authorization": "Bearer bench-token", "Content-Type": "application/x-ndjson"}
+    inserted = 0
+    records = cafe_records(count, seed)
+    while True:
+        lines = [json.dumps(record, ensure_ascii=False) for _, record in zip(range(IMPORT_CHUNK), records)]
+        if not lines:
+            break
+        response = client.post("/cafes/bulk", data="\n".join(lines).encode(), headers=headers)
+        inserted += response.get_json()["inserted"]
+
+    backlog = default_backlog(count) if backlog is None else backlog
+    with main.app.app_context():
+        rows = list(update_request_rows(backlog, inserted, seed))
+        for start in range(0, len(rows), IMPORT_CHUNK):
+            main.db.session.execute(insert(main.UpdateRequest), rows[start:start + IMPORT_CHUNK])
+        main.db.session.commit()
+        main.db.session.remove()
+        for engine in main.db.engines.values():
+            engine.dispose()
+    # WAL 내용을 본 파일에 합쳐서 DB 파일 하나만 복사해도 되게 함 (앱이 열 때 다시 WAL로 바뀜)
+    with closing(sqlite3.connect(db_file)) as conn:
+        conn.execute("PRAGMA journal_mode=DELETE")
+    return inserted, backlog
+
+
+def ensure_catalog(size, seed=DEFAULT_SEED, backlog=None):
+    """카탈로그 DB 경로를 돌려준다 (없으면 별도 프로세스에서 생성)"""
+    path = catalog_path(size, seed)
+    if os.path.exists(path):
+        return path
+    os.makedirs(CATALOG_DIR, exist_ok=True)
+    fd, partial = tempfile.mkstemp(suffix=".db", dir=CATALOG_DIR)
+    os.close(fd)
+    os.remove(partial)
+    command = [sys.executable, os.path.abspath(__file__), "--size", str(size), "--seed", str(seed), "--db", partial]
+    if backlog is not None:
+        command += ["--backlog", str(backlog)]
+    try:
+        subprocess.run(command, cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+        os.replace(partial, path)
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(partial + suffix):
+                os.remove(partial + suffix)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", default="1k", help="1k, 100k, 1m 또는 카페 수")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--backlog", type=int, help="수정 요청 수 (기본: 카페 수의 5%%, 최소 1000)")
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.db:
+        generate(args.db, size_value(args.size), args.seed, args.backlog)
+        return
+
+    started = time.perf_counter()
+    path = ensure_catalog(args.size, args.seed, args.backlog)
+    print(f"{path} ({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
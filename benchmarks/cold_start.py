@@ -0,0 +1,70 @@
+"""워커 콜드 스타트 측정 (새 프로세스에서 main import → 첫 요청 → 첫 /apispec_1.json)
+
+    python benchmarks/cold_start.py --runs 20
+
+instance/cafes.db 복사본을 쓰는 새 파이썬 프로세스를 --runs 번 띄워서 단계별 시간의 중앙값 / 최대값,
+import 직후 로드된 모듈 수와 최대 RSS를 출력한다. (프로세스 전체 시간은 인터프리터 시작 포함)
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULT_PREFIX = "BENCH_RESULT "
+
+PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+modules = len(sys.modules)
+client = main.app.test_client()
+assert client.get("/cafes/1").status_code in (200, 404)
+first_request = time.perf_counter()
+assert client.get("/apispec_1.json").status_code == 200
+first_spec = time.perf_counter()
+print("BENCH_RESULT " + json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "first_request_ms": (first_request - imported) * 1000,
+    "first_apispec_ms": (first_spec - first_request) * 1000,
+    "modules": modules,
+    "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    samples = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "cafes.db")
+        shutil.copyfile(os.path.join(ROOT, "instance", "cafes.db"), db)
+        env = {**os.environ, "DB_PROFILE": "production", "CAFE_DB_PATH": db,
+               "ADMIN_TOKEN": "bench-token", "ADMIN_DOCS_PASSWORD": "bench"}
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            output = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, env=env,
+                                    capture_output=True, text=True).stdout
+            elapsed = (time.perf_counter() - started) * 1000
+            lines = [line for line in output.splitlines() if line.startswith(RESULT_PREFIX)]
+            if not lines:
+                sys.exit("probe process failed")
+            samples.append({**json.loads(lines[-1][len(RESULT_PREFIX):]), "process_ms": elapsed})
+
+    print(f"{'metric':<18} {'median':>9} {'max':>9}")
+    for key in ("process_ms", "import_ms", "first_request_ms", "first_apispec_ms", "modules", "peak_rss_mb"):
+        values = [sample[key] for sample in samples]
+        print(f"{key:<18} {statistics.median(values):>9.1f} {max(values):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""주변 카페 검색(cafe_geo.nearby) 지연 시간 측정
+
+    python benchmarks/nearby.py --points 1000000 --queries 2000
+
+임시 DB의 R*Tree 테이블에 무작위 좌표를 넣고 (절반은 서울 부근에 몰리게, 절반은 전 세계에 흩뿌림)
+무작위 기준점에서 반경 / k 조합별로 검색 시간의 p50 / p95 / p99를 출력한다.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import cafe_geo  # noqa: E402
+from sqlite_profiles import percentile  # noqa: E402
+
+SEOUL = (37.5665, 126.9780)
+CASES = ((1000, 10), (5000, 10), (50000, 10), (50000, 100))
+
+
+def random_point(rng):
+    if rng.random() < 0.5:
+        return SEOUL[0] + rng.gauss(0, 0.1), SEOUL[1] + rng.gauss(0, 0.1)
+    return rng.uniform(-60, 70), rng.uniform(-180, 180)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=1000000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'geo.db')}")
+        with engine.begin() as conn:
+            conn.execute(cafe_geo.CREATE_GEO_TABLE)
+            started = time.perf_counter()
+            for start in range(1, args.points + 1, 10000):
+                rows = []
+                for cafe_id in range(start, min(start + 10000, args.points + 1)):
+                    lat, lng = random_point(rng)
+                    rows.append((cafe_id, lat, lng))
+                cafe_geo.index_new_points(conn, rows)
+            print(f"indexed {args.points} points in {time.perf_counter() - started:.1f}s")
+
+        print(f"{'radius m':>9} {'k':>4} {'found':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        with engine.connect() as conn:
+            for radius, k in CASES:
+                latencies, found = [], 0
+                for _ in range(args.queries):
+                    lat, lng = random_point(rng)
+                    started = time.perf_counter()
+                    found += len(cafe_geo.nearby(conn, lat, lng, radius, k))
+                    latencies.append(time.perf_counter() - started)
+                print(f"{radius:>9} {k:>4} {found / args.queries:>6.1f} {percentile(latencies, 0.50) * 1000:>8.2f} "
+                      f"{percentile(latencies, 0.95) * 1000:>8.2f} {percentile(latencies, 0.99) * 1000:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""카페 조회 경로 비교: ORM 인스턴스(select(Cafe)) vs Core select + CafeRow
+
+    python benchmarks/row_path.py --size 100k --rows 50000
+
+benchmarks/catalog.py 카탈로그 복사본에서 같은 카페들을 두 경로로 읽어서 cafe_to_dict까지 거친 시간을
+행당 µs로 (반복 --repeat 번 중 최솟값), 읽은 객체를 모두 들고 있을 때의 메모리를 행당 바이트로
+(tracemalloc) 출력한다. 작은 페이지(--page 개씩 id IN 조회)는 요청 하나의 비용에 해당한다.
+"""
+import argparse
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from catalog import DEFAULT_SEED, ensure_catalog  # noqa: E402
+
+
+def measure(label, load, repeat, to_dict):
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        count = sum(1 for cafe in load() if to_dict(cafe))
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = list(load())
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    print(f"{label:<28} {count:>8} {best / count * 1e6:>10.2f} {retained / count:>12.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", default="100k", help="카탈로그 크기 (1k, 100k, 1m)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--rows", type=int, default=50000, help="전체 조회에서 읽을 행 수")
+    parser.add_argument("--page", type=int, default=50, help="id IN 조회 한 번의 카페 수")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, "cafes.db")
+        shutil.copyfile(ensure_catalog(args.size, args.seed), db_file)
+        os.environ.update({"DB_PROFILE": "production", "CAFE_DB_PATH": db_file, "SLOW_REQUEST_MS": "1e9"})
+        import main
+        from sqlalchemy import select
+
+        cafe_table = main.Cafe.__table__
+        with main.app.app_context():
+            session = main.db.session
+            scan_orm = select(main.Cafe).where(main.Cafe.id <= args.rows).order_by(main.Cafe.id)
+            scan_core = main.CAFE_ROWS.where(cafe_table.c.id <= args.rows).order_by(cafe_table.c.id)
+            page_ids = list(range(1, args.rows + 1, max(1, args.rows // args.page)))[:args.page]
+
+            def orm_scan():
+                session.expunge_all()  # identity map에 남은 인스턴스를 재사용하지 않게
+                return session.scalars(scan_orm).all()
+
+            def orm_page():
+                session.expunge_all()
+                return session.scalars(select(main.Cafe).where(main.Cafe.id.in_(page_ids))).all()
+
+            print(f"{'path':<28} {'rows':>8} {'us/row':>10} {'bytes/row':>12}")
+            measure("orm scan", orm_scan, args.repeat, main.cafe_to_dict)
+            measure("core CafeRow scan", lambda: list(main.execute_cafe_rows(scan_core, {})),
+                    args.repeat, main.cafe_to_dict)
+            measure(f"orm id IN ({args.page})", orm_page, args.repeat * 20, main.cafe_to_dict)
+            measure(f"core CafeRow id IN ({args.page})", lambda: main.load_cafes_by_ids(page_ids),
+                    args.repeat * 20, main.cafe_to_dict)
+
+
+if __name__ == "__main__":
+    main()
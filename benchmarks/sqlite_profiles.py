@@ -0,0 +1,163 @@
+"""DB_PROFILE=development / production 처리량 비교 (읽기 + 쓰기 혼합 부하)
+
+    python benchmarks/sqlite_profiles.py --cafes 5000 --threads 8 --seconds 10 --write-ratio 0.2
+
+프로파일마다 새 임시 DB를 만들고 별도 프로세스에서 앱을 띄운 뒤 (설정은 import 시점에 읽힘)
+여러 스레드가 Flask 테스트 클라이언트로 요청을 보낸다. 응답 캐시는 끄고 측정한다.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULT_PREFIX = "BENCH_RESULT "
+LOCATIONS = ("Seoul", "Busan", "Incheon", "Daegu", "Peckham", "Shoreditch")
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def seed(client, headers, count):
+    lines = [json.dumps({
+        "name": f"Bench Cafe {i}",
+        "map_url": f"https://maps.example.com/{i}",
+        "img_url": f"https://images.example.com/{i}.jpg",
+        "location": f"{LOCATIONS[i % len(LOCATIONS)]} {i % 97}",
+        "seats": f"{10 + i % 50}석",
+        "coffee_price": f"₩{3000 + (i % 30) * 100}",
+        "has_wifi": i % 2 == 0,
+        "has_sockets": i % 3 == 0,
+    }) for i in range(count)]
+    response = client.post("/cafes/bulk", data="\n".join(lines).encode(),
+                           headers={**headers, "Content-Type": "application/x-ndjson"})
+    return response.get_json()["inserted"]
+
+
+def worker(app, headers, cafe_count, deadline, write_ratio, rng, stats, lock):
+    client = app.test_client()
+    reads, writes, errors, latencies = 0, 0, 0, []
+    serial = 0
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        if rng.random() < write_ratio:
+            serial += 1
+            if serial % 4:
+                response = client.post(f"/cafes/{rng.randint(1, cafe_count)}/update-request",
+                                       json={"coffee_price": f"₩{rng.randint(30, 60) * 100}"})
+            else:
+                response = client.post("/cafes", json={
+                    "name": f"Bench New {threading.get_ident()}-{serial}", "map_url": "m", "img_url": "i",
+                    "location": rng.choice(LOCATIONS)})
+            writes += 1
+        else:
+            choice = rng.random()
+            if choice < 0.4:
+                response = client.get(f"/cafes/location/{rng.choice(LOCATIONS)}?sort=price&limit=20")
+            elif choice < 0.7:
+                response = client.get("/admin/update-requests?status=pending&limit=50", headers=headers)
+            else:
+                response = client.get(f"/cafes?min_price={rng.randint(30, 55) * 100}&sort=-seats&limit=20")
+            reads += 1
+        latencies.append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            errors += 1
+    with lock:
+        stats["reads"] += reads
+        stats["writes"] += writes
+        stats["errors"] += errors
+        stats["latencies"].extend(latencies)
+
+
+def run_profile(args):
+    """자식 프로세스: 환경 변수를 맞춘 뒤 main을 import하고 부하를 건다."""
+    os.environ.update({
+        "DB_PROFILE": args.profile,
+        "CAFE_DB_PATH": args.db,
+        "ADMIN_TOKEN": "bench-token",
+        "CACHE_MAX_ENTRIES": "0",
+    })
+    sys.path.insert(0, ROOT)
+    import main
+
+    with main.app.app_context():
+        main.init_db()
+    headers = {"Authorization": "Bearer bench-token"}
+    cafe_count = seed(main.app.test_client(), headers, args.cafes)
+
+    stats = {"reads": 0, "writes": 0, "errors": 0, "latencies": []}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.seconds
+    threads = [
+        threading.Thread(target=worker, args=(main.app, headers, cafe_count, deadline, args.write_ratio,
+                                              random.Random(seed_value), stats, lock))
+        for seed_value in range(args.threads)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = stats.pop("latencies")
+    stats.update({
+        "profile": args.profile,
+        "seconds": round(elapsed, 2),
+        "requests_per_second": round((stats["reads"] + stats["writes"]) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    })
+    print(RESULT_PREFIX + json.dumps(stats), flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cafes", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--profiles", default="development,production")
+    parser.add_argument("--profile", help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.profile:
+        run_profile(args)
+        return
+
+    results = []
+    for profile in args.profiles.split(","):
+        with tempfile.TemporaryDirectory() as tmp:
+            command = [sys.executable, os.path.abspath(__file__), "--profile", profile,
+                       "--db", os.path.join(tmp, "bench.db"), "--cafes", str(args.cafes),
+                       "--threads", str(args.threads), "--seconds", str(args.seconds),
+                       "--write-ratio", str(args.write_ratio)]
+            # development 프로파일의 쿼리 로그는 버리고 결과 줄만 읽음
+            output = subprocess.run(command, cwd=ROOT, capture_output=True, text=True).stdout
+            lines = [line for line in output.splitlines() if line.startswith(RESULT_PREFIX)]
+            if not lines:
+                sys.exit(f"{profile}: benchmark process failed")
+            results.append(json.loads(lines[-1][len(RESULT_PREFIX):]))
+
+    print(f"{'profile':<12} {'req/s':>8} {'reads':>7} {'writes':>7} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for result in results:
+        print(f"{result['profile']:<12} {result['requests_per_second']:>8} {result['reads']:>7} {result['writes']:>7} "
+              f"{result['errors']:>7} {result['p50_ms']:>8} {result['p95_ms']:>8} {result['p99_ms']:>8}")
+    if len(results) == 2 and results[0]["requests_per_second"]:
+        ratio = results[1]["requests_per_second"] / results[0]["requests_per_second"]
+        print(f"{results[1]['profile']} / {results[0]['profile']}: {ratio:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,515 @@
+"""전체 라우트 벤치마크 + 기준선(baseline) 회귀 검사
+
+    python benchmarks/suite.py --sizes 1k,100k
+    python benchmarks/suite.py --sizes 1k,100k --record          # 현재 결과를 기준선으로 저장 (비교하지 않음)
+    python benchmarks/suite.py --sizes 1k,100k,1m --threshold 0.3 --output /tmp/bench.json
+
+카탈로그 크기마다 (benchmarks/catalog.py로 만든 DB의 복사본을 써서) 별도 프로세스에서 앱을 띄우고
+ 1) 순차 단계: main.py의 모든 라우트를 시나리오별로 --iterations 번씩 Flask 테스트 클라이언트로 호출
+ 2) 동시 단계: --threads 개 스레드가 --seconds 동안 읽기 위주 혼합 부하를 보냄
+시나리오마다 p50 / p95 / p99 지연 시간, 처리량, 요청당 SQL 쿼리 수(metrics 모듈 집계), 최대 RSS를
+JSON으로 저장하고, 기준선(benchmarks/baseline.json)보다 --threshold 이상 나빠진 항목을 출력하고 종료 코드 1로 끝낸다.
+기준선 파일이 없거나 측정한 크기가 기준선에 없어도 종료 코드 1이다 (--record로 기준선을 만들 때만 비교하지 않음).
+응답 캐시는 기본으로 끄고 측정한다 (--cache로 켤 수 있음).
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from catalog import BRANDS, DEFAULT_SEED, ensure_catalog, neighborhoods, size_value
+from sqlite_profiles import percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULT_PREFIX = "BENCH_RESULT "
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, "results", "latest.json")
+ADMIN_HEADERS = {"Authorization": "Bearer bench-token"}
+
+# 기준선 비교에서 무시할 만큼 작은 차이 (ms / 쿼리 수)
+MIN_LATENCY_DELTA_MS = 0.5
+MIN_QUERY_DELTA = 0.5
+
+
+# ─────────────────────────────────────────────
+# 📌 시나리오 (엔드포인트 하나에 여러 시나리오가 있을 수 있음)
+# ─────────────────────────────────────────────
+
+class Context:
+    """시나리오가 공유하는 상태 (카페 수, 처리할 수정 요청 id, 새로 추가한 카페 id 등)"""
+
+    def __init__(self, app, db, cafe_count, rng):
+        self.app = app
+        self.db = db
+        self.cafe_count = cafe_count
+        self.rng = rng
+        self.places = neighborhoods()
+        self.pending = []
+        self.added = []
+        self.serial = 0
+        self._lock = threading.Lock()
+
+    def cafe_id(self):
+        return self.rng.randint(1, self.cafe_count)
+
+    def place(self):
+        return self.rng.choice(self.places)
+
+    def next_serial(self):
+        with self._lock:
+            self.serial += 1
+            return self.serial
+
+    def take(self, pool, n=1):
+        with self._lock:
+            if len(pool) < n:
+                return None
+            taken, pool[-n:] = pool[-n:], []
+            return taken
+
+    def refresh(self, column, condition):
+        # 응답에 id가 없는 쓰기 라우트를 위해 DB에서 직접 id를 읽어옴
+        from sqlalchemy import select
+        with self.app.app_context():
+            return list(self.db.session.scalars(select(column).where(condition).order_by(column)))
+
+
+def new_cafe(ctx, prefix="Bench New"):
+    city, district, dong, lat, lng = ctx.place()
+    return {"name": f"{prefix} {dong} {ctx.next_serial()}", "location": f"{city} {district} {dong}",
+            "map_url": f"https://www.google.com/maps/@{lat:.6f},{lng:.6f},17z",
+            "img_url": "https://images.example.com/new.jpg", "seats": "30석", "coffee_price": "₩4,500",
+            "has_wifi": True, "has_sockets": ctx.rng.random() < 0.5}
+
+
+def nearby_url(ctx):
+    _, _, _, lat, lng = ctx.place()
+    return f"/cafes/nearby?lat={lat + ctx.rng.gauss(0, 0.02):.5f}&lng={lng + ctx.rng.gauss(0, 0.02):.5f}&radius=2000&k=20"
+
+
+# 자동 완성 초성 검색어 (catalog.BRANDS의 한글 브랜드 초성)
+SUGGEST_CHOSEONG = ("ㅋㅍ", "ㅋㅍ ㅇ", "ㅅㅌㅂ", "ㅌㅆㅍ", "ㅇㄷ", "ㅂㄹㅂ", "ㅃㄷ")
+
+
+def duplicates_url(ctx):
+    # 카탈로그 이름에서 지점 번호를 뺀 이름 (같은 브랜드 / 동의 카페가 많은 경우)
+    city, district, dong, _, _ = ctx.place()
+    return f"/cafes/duplicates?name={ctx.rng.choice(BRANDS)} {dong}&location={city} {district} {dong}"
+
+
+def take_pending(ctx, n=1):
+    return ctx.take(ctx.pending, n)
+
+
+# (이름, 엔드포인트, 요청 생성 함수, 최대 반복 횟수)
+# 요청 생성 함수는 (method, url, test client kwargs)를 돌려주고, 더 보낼 요청이 없으면 None
+READ_SCENARIOS = [
+    ("home", "home", lambda ctx: ("GET", "/", {}), None),
+    ("add_cafe_page", "add_cafe_page", lambda ctx: ("GET", "/add", {}), None),
+    ("update_cafe_page", "update_cafe_page", lambda ctx: ("GET", "/update", {}), None),
+    ("cafe_detail_page", "cafe_detail_page", lambda ctx: ("GET", f"/cafe/{ctx.cafe_id()}", {}), None),
+    ("login_page", "login_page", lambda ctx: ("GET", "/login", {}), None),
+    ("login_page:post", "login_page", lambda ctx: ("POST", "/login", {"data": {"token": "bench-token"}}), None),
+    ("admin_page", "admin_page", lambda ctx: ("GET", "/admin", {"headers": ADMIN_HEADERS}), None),
+    ("admin_cafes_page", "admin_cafes_page", lambda ctx: ("GET", "/admin/cafes/delete", {"headers": ADMIN_HEADERS}), None),
+    ("static", "static", lambda ctx: ("GET", "/static/js/script.js", {}), None),
+    ("get_all_cafes:page", "get_all_cafes",
+     lambda ctx: ("GET", f"/cafes?limit=20&after={ctx.cafe_id()}", {}), None),
+    ("get_all_cafes:filter", "get_all_cafes",
+     lambda ctx: ("GET", "/cafes?has_wifi=1&has_sockets=1&limit=20", {}), None),
+    ("get_all_cafes:sorted", "get_all_cafes",
+     lambda ctx: ("GET", f"/cafes?min_price={ctx.rng.randrange(3000, 7000, 500)}&sort=-seats&limit=20", {}), None),
+    ("get_all_cafes:location", "get_all_cafes",
+     lambda ctx: ("GET", f"/cafes?location={ctx.place()[2]}&limit=20", {}), None),
+    ("get_all_cafes:full", "get_all_cafes", lambda ctx: ("GET", "/cafes", {"headers": {"Accept-Encoding": "gzip"}}), 5),
+    ("get_cafe_facets", "get_cafe_facets", lambda ctx: ("GET", "/cafes/facets?has_wifi=1", {}), None),
+    ("get_random_cafe", "get_random_cafe", lambda ctx: ("GET", "/cafes/random?n=5&has_wifi=1", {}), None),
+    ("get_nearby_cafes", "get_nearby_cafes", lambda ctx: ("GET", nearby_url(ctx), {}), None),
+    ("get_cafe_by_id", "get_cafe_by_id", lambda ctx: ("GET", f"/cafes/{ctx.cafe_id()}", {}), None),
+    ("search_cafes_by_location", "search_cafes_by_location",
+     lambda ctx: ("GET", f"/cafes/location/{ctx.place()[2]}?sort=price", {}), 20),
+    ("search_cafes", "search_cafes", lambda ctx: ("GET", f"/cafes/search?q={ctx.place()[2][:2]}", {}), None),
+    ("get_cafe_changes", "get_cafe_changes",
+     lambda ctx: ("GET", f"/cafes/changes?since={max(0, ctx.cafe_count - 200)}", {}), None),
+    ("suggest_cafes", "suggest_cafes", lambda ctx: ("GET", f"/cafes/suggest?q={ctx.rng.choice(BRANDS)[:2]}", {}), None),
+    ("suggest_cafes:choseong", "suggest_cafes",
+     lambda ctx: ("GET", f"/cafes/suggest?q={ctx.rng.choice(SUGGEST_CHOSEONG)}", {}), None),
+    ("suggest_cafes:location", "suggest_cafes", lambda ctx: ("GET", f"/cafes/suggest?q={ctx.place()[2][:2]}", {}), None),
+    ("find_duplicate_cafes", "find_duplicate_cafes",
+     lambda ctx: ("GET", f"/cafes/duplicates?id={ctx.cafe_id()}", {}), None),
+    ("find_duplicate_cafes:name", "find_duplicate_cafes", lambda ctx: ("GET", duplicates_url(ctx), {}), None),
+    ("export_cafes", "export_cafes", lambda ctx: ("GET", "/cafes/export?format=ndjson", {}), 3),
+    ("get_cafe_list", "get_cafe_list", lambda ctx: ("GET", "/admin/cafes", {"headers": ADMIN_HEADERS}), 5),
+    ("get_update_requests", "get_update_requests",
+     lambda ctx: ("GET", "/admin/update-requests?status=pending&limit=50", {"headers": ADMIN_HEADERS}), None),
+    ("get_cache_stats", "get_cache_stats", lambda ctx: ("GET", "/admin/cache-stats", {"headers": ADMIN_HEADERS}), None),
+    ("get_metrics", "get_metrics", lambda ctx: ("GET", "/metrics", {"headers": ADMIN_HEADERS}), None),
+]
+
+
+def request_update(ctx):
+    return ("POST", f"/cafes/{ctx.cafe_id()}/update-request",
+            {"json": {"coffee_price": f"₩{ctx.rng.randrange(3000, 8000, 100):,}"}})
+
+
+def process_one(ctx):
+    ids = take_pending(ctx)
+    if ids is None:
+        return None
+    action = "approve" if ids[0] % 2 else "reject"
+    return "PATCH", f"/admin/update-requests/{ids[0]}", {"json": {"action": action}, "headers": ADMIN_HEADERS}
+
+
+def process_batch(ctx):
+    ids = take_pending(ctx, 10)
+    if ids is None:
+        return None
+    actions = [{"request_id": i, "action": "approve" if i % 2 else "reject"} for i in ids]
+    return "PATCH", "/admin/update-requests", {"json": actions, "headers": ADMIN_HEADERS}
+
+
+def delete_request(ctx):
+    ids = take_pending(ctx)
+    if ids is None:
+        return None
+    return "DELETE", f"/admin/update-requests/{ids[0]}", {"headers": ADMIN_HEADERS}
+
+
+def bulk_import(ctx):
+    body = "\n".join(json.dumps(new_cafe(ctx, "Bench Bulk"), ensure_ascii=False) for _ in range(100))
+    return "POST", "/cafes/bulk", {"data": body.encode(),
+                                   "headers": {**ADMIN_HEADERS, "Content-Type": "application/x-ndjson"}}
+
+
+def remove_added(ctx):
+    ids = ctx.take(ctx.added)
+    if ids is None:
+        return None
+    return "DELETE", f"/cafes/{ids[0]}", {"headers": ADMIN_HEADERS}
+
+
+WRITE_SCENARIOS = [
+    ("add_cafe", "add_cafe", lambda ctx: ("POST", "/cafes", {"json": new_cafe(ctx)}), None),
+    ("request_cafe_update", "request_cafe_update", request_update, None),
+    ("bulk_import_cafes", "bulk_import_cafes", bulk_import, 20),
+    ("process_update_request", "process_update_request", process_one, None),
+    ("process_update_requests_batch", "process_update_requests_batch", process_batch, None),
+    ("delete_update_request", "delete_update_request", delete_request, None),
+    ("remove_cafe", "remove_cafe", remove_added, None),
+]
+
+# 동시 단계 혼합 비율 (시나리오 이름, 가중치)
+CONCURRENT_MIX = [
+    ("get_cafe_by_id", 30), ("get_all_cafes:page", 15), ("get_all_cafes:filter", 10),
+    ("get_all_cafes:sorted", 10), ("get_random_cafe", 10), ("get_nearby_cafes", 10),
+    ("search_cafes", 5), ("get_cafe_facets", 5), ("request_cafe_update", 5),
+]
+
+
+# ─────────────────────────────────────────────
+# 📌 측정 (자식 프로세스)
+# ─────────────────────────────────────────────
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def query_totals(metrics):
+    """엔드포인트별 (요청 수, 쿼리 수 합계)"""
+    totals = {}
+    with metrics.registry._lock:
+        for (endpoint, _), histogram in metrics.registry.query_counts.items():
+            count, total = totals.get(endpoint, (0, 0.0))
+            totals[endpoint] = (count + histogram.count, total + histogram.total)
+    return totals
+
+
+def summarize(latencies, errors, elapsed, queries=None):
+    count = len(latencies)
+    return {
+        "requests": count,
+        "errors": errors,
+        "requests_per_second": round(count / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "queries_per_request": None if queries is None else round(queries, 2),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def send(client, request):
+    method, url, kwargs = request
+    started = time.perf_counter()
+    response = client.open(url, method=method, **kwargs)
+    response.get_data()  # 스트리밍 응답까지 끝까지 읽음
+    return time.perf_counter() - started, response.status_code
+
+
+def run_sequential(app, metrics, ctx, scenarios, iterations):
+    client = app.test_client()
+    results = {}
+    for name, endpoint, build, limit in scenarios:
+        before = query_totals(metrics).get(endpoint, (0, 0.0))
+        latencies, errors = [], 0
+        started = time.perf_counter()
+        for _ in range(iterations if limit is None else min(iterations, limit)):
+            request = build(ctx)
+            if request is None:
+                break
+            elapsed, status = send(client, request)
+            latencies.append(elapsed)
+            if status >= 400:
+                errors += 1
+        elapsed = time.perf_counter() - started
+        after = query_totals(metrics).get(endpoint, (0, 0.0))
+        count = after[0] - before[0]
+        results[name] = summarize(latencies, errors, elapsed, (after[1] - before[1]) / count if count else None)
+    return results
+
+
+def run_concurrent(app, metrics, ctx, scenarios, threads, seconds):
+    by_name = {name: (endpoint, build) for name, endpoint, build, _ in scenarios}
+    names = [name for name, _ in CONCURRENT_MIX]
+    weights = [weight for _, weight in CONCURRENT_MIX]
+    samples = {name: ([], [0]) for name in names}
+    lock = threading.Lock()
+    before = query_totals(metrics)
+    deadline = time.perf_counter() + seconds
+
+    def worker(seed_value):
+        client = app.test_client()
+        rng = random.Random(seed_value)
+        local = {name: ([], [0]) for name in names}
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            elapsed, status = send(client, by_name[name][1](ctx))
+            local[name][0].append(elapsed)
+            if status >= 400:
+                local[name][1][0] += 1
+        with lock:
+            for name, (latencies, errors) in local.items():
+                samples[name][0].extend(latencies)
+                samples[name][1][0] += errors[0]
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    # 같은 엔드포인트를 쓰는 시나리오는 쿼리 수를 따로 나눌 수 없으므로 엔드포인트 평균을 씀
+    after = query_totals(metrics)
+    per_endpoint = {}
+    for endpoint, (count, total) in after.items():
+        count0, total0 = before.get(endpoint, (0, 0.0))
+        if count > count0:
+            per_endpoint[endpoint] = (total - total0) / (count - count0)
+    results = {name: summarize(latencies, errors[0], elapsed, per_endpoint.get(by_name[name][0]))
+               for name, (latencies, errors) in samples.items()}
+    all_latencies = [value for latencies, _ in samples.values() for value in latencies]
+    results["all"] = summarize(all_latencies, sum(errors[0] for _, errors in samples.values()), elapsed)
+    return results
+
+
+def run_size(args):
+    """자식 프로세스: 카탈로그 복사본으로 앱을 띄우고 두 단계를 실행한다."""
+    os.environ.update({
+        "DB_PROFILE": args.profile,
+        "CAFE_DB_PATH": args.db,
+        "ADMIN_TOKEN": "bench-token",
+        "SLOW_REQUEST_MS": "1e9",
+        "SLOW_QUERY_MS": "1e9",
+    })
+    if not args.cache:
+        os.environ["CACHE_MAX_ENTRIES"] = "0"
+    sys.path.insert(0, ROOT)
+    started = time.perf_counter()
+    import main
+    import metrics
+    from sqlalchemy import func, select
+    import_seconds = time.perf_counter() - started
+
+    with main.app.app_context():
+        cafe_count = main.db.session.scalar(select(func.max(main.Cafe.id)))
+    ctx = Context(main.app, main.db, cafe_count, random.Random(args.seed))
+
+    covered = {endpoint for _, endpoint, _, _ in READ_SCENARIOS + WRITE_SCENARIOS}
+    uncovered = sorted(endpoint for endpoint, view in main.app.view_functions.items()
+                       if endpoint not in covered and (view.__module__ == "main" or endpoint == "static"))
+
+    sequential = run_sequential(main.app, metrics, ctx, READ_SCENARIOS, args.iterations)
+    # 쓰기 시나리오: 추가 / 수정 요청을 먼저 보낸 뒤 처리 / 삭제할 id를 DB에서 읽어옴
+    sequential.update(run_sequential(main.app, metrics, ctx, WRITE_SCENARIOS[:3], args.iterations))
+    ctx.pending = ctx.refresh(main.UpdateRequest.id, main.UpdateRequest.status == "pending")
+    ctx.added = ctx.refresh(main.Cafe.id, main.Cafe.name.like("Bench New %"))
+    sequential.update(run_sequential(main.app, metrics, ctx, WRITE_SCENARIOS[3:], args.iterations))
+
+    concurrent = run_concurrent(main.app, metrics, ctx, READ_SCENARIOS + WRITE_SCENARIOS,
+                                args.threads, args.seconds)
+    result = {
+        "size": args.size,
+        "cafes": cafe_count,
+        "import_seconds": round(import_seconds, 3),
+        "peak_rss_mb": peak_rss_mb(),
+        "uncovered_endpoints": uncovered,
+        "sequential": sequential,
+        "concurrent": concurrent,
+    }
+    print(RESULT_PREFIX + json.dumps(result), flush=True)
+
+
+# ─────────────────────────────────────────────
+# 📌 기준선 비교
+# ─────────────────────────────────────────────
+
+def compare(current, baseline, threshold):
+    """기준선보다 threshold(비율) 이상 나빠진 항목 목록"""
+    regressions = []
+
+    def check(label, metric, now, before, higher_is_worse=True, min_delta=0.0):
+        if now is None or before is None:
+            return
+        if higher_is_worse:
+            worse = now > before * (1 + threshold) and now - before >= min_delta
+        else:
+            worse = now < before * (1 - threshold)
+        if worse:
+            regressions.append(f"{label} {metric}: {before} -> {now}")
+
+    for size, result in current["sizes"].items():
+        base = baseline.get("sizes", {}).get(size)
+        if base is None:
+            regressions.append(f"{size}: not in baseline (run with --record to add it)")
+            continue
+        check(size, "peak_rss_mb", result["peak_rss_mb"], base.get("peak_rss_mb"))
+        for phase in ("sequential", "concurrent"):
+            for name, stats in result[phase].items():
+                before = base.get(phase, {}).get(name)
+                if before is None:
+                    continue
+                label = f"{size} {phase} {name}"
+                check(label, "p95_ms", stats["p95_ms"], before["p95_ms"], min_delta=MIN_LATENCY_DELTA_MS)
+                check(label, "queries_per_request", stats["queries_per_request"],
+                      before["queries_per_request"], min_delta=MIN_QUERY_DELTA)
+                if phase == "concurrent":
+                    check(label, "requests_per_second", stats["requests_per_second"],
+                          before["requests_per_second"], higher_is_worse=False)
+    return regressions
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(size, result):
+    print(f"\n[{size}] {result['cafes']} cafes, peak RSS {result['peak_rss_mb']} MB")
+    print(f"{'phase':<10} {'scenario':<32} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'queries':>8} {'errors':>6}")
+    for phase in ("sequential", "concurrent"):
+        for name, stats in result[phase].items():
+            queries = "-" if stats["queries_per_request"] is None else stats["queries_per_request"]
+            print(f"{phase:<10} {name:<32} {stats['requests_per_second']:>9} {stats['p50_ms']:>8} "
+                  f"{stats['p95_ms']:>8} {stats['p99_ms']:>8} {queries:>8} {stats['errors']:>6}")
+    if result["uncovered_endpoints"]:
+        print("no scenario for:", ", ".join(result["uncovered_endpoints"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1k,100k", help="카탈로그 크기 목록 (1k, 100k, 1m)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--iterations", type=int, default=200, help="순차 단계 시나리오별 요청 수")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10, help="동시 단계 시간")
+    parser.add_argument("--profile", default="production", help="DB_PROFILE")
+    parser.add_argument("--cache", action="store_true", help="응답 캐시를 켜고 측정")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25, help="허용 악화 비율 (0.25 = 25%%)")
+    parser.add_argument("--record", "--update-baseline", dest="record", action="store_true",
+                        help="현재 결과를 기준선으로 저장 (비교하지 않음)")
+    parser.add_argument("--size", help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.db:
+        run_size(args)
+        return
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "settings": {"seed": args.seed, "iterations": args.iterations, "threads": args.threads,
+                     "seconds": args.seconds, "profile": args.profile, "cache": args.cache},
+        "sizes": {},
+    }
+    for size in args.sizes.split(","):
+        size_value(size)  # 잘못된 크기는 카탈로그를 만들기 전에 거름
+        catalog = ensure_catalog(size, args.seed)
+        with tempfile.TemporaryDirectory() as tmp:
+            db = os.path.join(tmp, "bench.db")
+            shutil.copyfile(catalog, db)
+            command = [sys.executable, os.path.abspath(__file__), "--size", size, "--db", db,
+                       "--seed", str(args.seed), "--iterations", str(args.iterations),
+                       "--threads", str(args.threads), "--seconds", str(args.seconds), "--profile", args.profile]
+            if args.cache:
+                command.append("--cache")
+            output = subprocess.run(command, cwd=ROOT, capture_output=True, text=True).stdout
+            lines = [line for line in output.splitlines() if line.startswith(RESULT_PREFIX)]
+            if not lines:
+                sys.exit(f"{size}: benchmark process failed")
+            report["sizes"][size] = json.loads(lines[-1][len(RESULT_PREFIX):])
+        print_table(size, report["sizes"][size])
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nresults: {args.output}")
+
+    if args.record:
+        shutil.copyfile(args.output, args.baseline)
+        print(f"baseline updated: {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        sys.exit(f"no baseline at {args.baseline} (run with --record to create one)")
+    with open(args.baseline, encoding="utf-8") as f:
+        regressions = compare(report, json.load(f), args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+        for line in regressions:
+            print("  " + line)
+        sys.exit(1)
+    print(f"no regressions over {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
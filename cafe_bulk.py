@@ -0,0 +1,95 @@
+import csv
+import io
+import json
+
+from cafe_geo import coordinates_from, parse_coordinates
+from cafe_index import AMENITIES
+from cafe_parsing import parse_price, parse_seats
+
+# ─────────────────────────────────────────────
+# 📌 대량 가져오기 / 내보내기 형식 처리 (NDJSON, CSV)
+# ─────────────────────────────────────────────
+# 필드는 POST /cafes 요청 본문과 같다 (편의시설은 평평한 컬럼).
+
+FORMATS = ("ndjson", "csv")
+MIMETYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+REQUIRED_FIELDS = ("name", "map_url", "img_url", "location")
+EXPORT_FIELDS = ("id", "name", "map_url", "img_url", "location", "seats", *AMENITIES, "coffee_price", "lat", "lng")
+
+TRUE_VALUES = ("1", "true", "yes", "y", "t")
+FALSE_VALUES = ("0", "false", "no", "n", "f", "")
+
+
+def detect_format(content_type, requested=None):
+    """format 파라미터가 우선, 없으면 Content-Type으로 판단 (기본 NDJSON)"""
+    if requested:
+        if requested not in FORMATS:
+            raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+        return requested
+    return "csv" if "csv" in (content_type or "") else "ndjson"
+
+
+def iter_records(stream, fmt):
+    """바이너리 스트림에서 (줄 번호, dict 또는 오류 메시지) 를 하나씩 읽는다. 본문 전체를 메모리에 올리지 않음."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for line_no, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_no, f"Invalid JSON: {e}"
+            continue
+        yield line_no, record if isinstance(record, dict) else "Each line must be a JSON object"
+
+
+def parse_bool(value):
+    if isinstance(value, bool) or value is None:
+        return bool(value)
+    value = str(value).strip().lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ValueError(f"Invalid boolean value '{value}'")
+
+
+def cafe_values(record):
+    """레코드를 cafe 테이블 INSERT 값으로 변환 (필수 필드가 없거나 값이 잘못되면 ValueError)"""
+    missing = [field for field in REQUIRED_FIELDS if not str(record.get(field) or "").strip()]
+    if missing:
+        raise ValueError(f"Missing required fields: {', '.join(missing)}")
+    values = {field: str(record[field]).strip() for field in REQUIRED_FIELDS}
+    for name in AMENITIES:
+        values[name] = parse_bool(record.get(name))
+    values["seats"] = str(record.get("seats") or "Unknown")
+    values["coffee_price"] = str(record.get("coffee_price") or "Unknown")
+    values["seats_min"] = parse_seats(values["seats"])
+    values["coffee_price_value"] = parse_price(values["coffee_price"])
+    # 좌표: lat / lng 필드가 있으면 우선, 없으면 map_url에서 추출
+    coordinates = coordinates_from(record.get("lat"), record.get("lng")) or parse_coordinates(values["map_url"])
+    values["lat"], values["lng"] = coordinates or (None, None)
+    return values
+
+
+def export_chunks(rows, fmt, batch_size=500):
+    """(EXPORT_FIELDS 순서의) 행 이터레이터를 NDJSON / CSV 청크로 변환"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer:
+        writer.writerow(EXPORT_FIELDS)
+    for count, row in enumerate(rows, start=1):
+        if writer:
+            writer.writerow([int(value) if isinstance(value, bool) else value for value in row])
+        else:
+            buffer.write(json.dumps(dict(zip(EXPORT_FIELDS, row)), ensure_ascii=False) + "\n")
+        if count % batch_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
@@ -0,0 +1,226 @@
+import random
+import re
+import zlib
+from collections import namedtuple
+from functools import lru_cache
+
+from sqlalchemy import text
+
+from hangul import normalize
+
+# ─────────────────────────────────────────────
+# 📌 유사 중복 카페 검사 (정규화 키 + 이름 2-gram MinHash / LSH 후보 인덱스)
+# ─────────────────────────────────────────────
+# 이름은 공백 / 기호를 지운 글자 2-gram 집합으로 비교한다 ('스타벅스 강남점' == '스타벅스 강남 점').
+# 모든 카페와 비교하지 않도록 2-gram 집합의 MinHash 서명을 BANDS개 밴드로 나눠 cafe_dedupe 테이블의
+# band0..band11 컬럼(각각 인덱스)에 저장하고, 밴드 값이 같은 카페를 겹친 밴드 수가 많은 순으로
+# MAX_CANDIDATES개만 골라 실제 유사도를 다시 계산한다 (LSH). 카페가 MAX_BUCKET개보다 많은 밴드 값은
+# 흔한 2-gram('스타', '벅스')끼리 묶인 것이라 건너뛰고, 모든 밴드가 그렇다면 서명 전체가 같은 카페만 찾는다.
+# 지점 번호('3호점')는 숫자 전체를 토큰 하나로 쓰고 따로도 비교한다 (번호가 서로 다르면 다른 지점이므로 중복이 아님).
+# 모든 함수는 Session 또는 Connection을 받아서 호출한 쪽의 트랜잭션 안에서 실행된다.
+
+DEDUPE_TABLE = "cafe_dedupe"
+
+BANDS = 12
+ROWS = 3  # 밴드당 MinHash 수 (이름 유사도 0.6이면 약 96%, 0.33이면 약 36% 확률로 후보가 됨)
+MAX_CANDIDATES = 200  # 실제 유사도를 계산할 최대 후보 수 (겹친 밴드가 많은 순)
+MAX_BUCKET = 500      # 같은 밴드 값인 카페가 이보다 많으면 그 밴드는 건너뜀 (체인점 이름처럼 흔한 2-gram만으로 된 밴드)
+NAME_WEIGHT = 0.7     # 점수 = 이름 유사도 * 0.7 + 위치 유사도 * 0.3 (위치 없이 찾으면 이름 유사도)
+LOCATION_WEIGHT = 0.3
+
+BAND_COLUMNS = [f"band{band}" for band in range(BANDS)]
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20250301)  # 저장된 밴드 값과 맞아야 하므로 해시 함수는 프로세스와 상관없이 고정
+_BAND_MULTIPLIER = _rng.randrange(1, _PRIME)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(_PRIME)) for _ in range(BANDS * ROWS)]
+
+_LETTERS = re.compile(r"[^\W\d_]+")
+_NUMBERS = re.compile(r"\d+")
+
+CREATE_DEDUPE_TABLE = text(
+    f"CREATE TABLE IF NOT EXISTS {DEDUPE_TABLE} "
+    f"(id INTEGER PRIMARY KEY, {', '.join(f'{name} INTEGER' for name in BAND_COLUMNS)})"
+)
+CREATE_BAND_INDEXES = [
+    text(f"CREATE INDEX IF NOT EXISTS ix_{DEDUPE_TABLE}_{name} ON {DEDUPE_TABLE} ({name})")
+    for name in BAND_COLUMNS
+]
+UPSERT_ROW = text(
+    f"INSERT OR REPLACE INTO {DEDUPE_TABLE} (id, {', '.join(BAND_COLUMNS)}) "
+    f"VALUES (:id, {', '.join(f':{name}' for name in BAND_COLUMNS)})"
+)
+DELETE_ROW = text(f"DELETE FROM {DEDUPE_TABLE} WHERE id = :id")
+# 밴드별 후보 수 (MAX_BUCKET + 1에서 세기를 멈춤)
+COUNT_BUCKETS = text(
+    "SELECT " + ", ".join(
+        f"(SELECT count(*) FROM (SELECT 1 FROM {DEDUPE_TABLE} WHERE {name} = :{name} LIMIT :cap))"
+        for name in BAND_COLUMNS
+    )
+)
+# 모든 밴드 값이 같은 카페 (2-gram / 번호 집합이 같음)
+SELECT_SAME_SIGNATURE = text(
+    f"SELECT cafe.id, cafe.name, cafe.location FROM {DEDUPE_TABLE} JOIN cafe ON cafe.id = {DEDUPE_TABLE}.id "
+    f"WHERE {' AND '.join(f'{name} = :{name}' for name in BAND_COLUMNS)} LIMIT :limit"
+)
+
+Duplicate = namedtuple("Duplicate", "id name location score name_score location_score exact")
+
+
+def name_key(text):
+    """'스타벅스 강남 01호점' -> ('스타벅스강남호점', ('1',)) (글자만 이어 붙인 문자열, 지점 번호)"""
+    text = normalize(text)
+    return "".join(_LETTERS.findall(text)), tuple(number.lstrip("0") or "0" for number in _NUMBERS.findall(text))
+
+
+def location_key(text):
+    """'서울 강남구, 역삼동' -> '서울강남구역삼동'"""
+    return "".join(char for char in normalize(text) if char.isalnum())
+
+
+def bigrams(text):
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def name_tokens(letters, numbers):
+    # 번호도 토큰으로 넣어서 번호까지 같은 카페가 밴드가 더 많이 겹치게 함 ('#' 접두어로 글자 2-gram과 구분)
+    return bigrams(letters) | {f"#{number}" for number in numbers}
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+def containment(a, b):
+    """짧은 쪽이 긴 쪽에 얼마나 포함되는지 ('서울 강남구' vs '서울 강남구 역삼동' -> 1.0)"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / min(len(a), len(b))
+
+
+@lru_cache(maxsize=1 << 16)
+def token_hashes(token):
+    base = zlib.crc32(token.encode())
+    return tuple((a * base + b) % _PRIME for a, b in _PERMUTATIONS)
+
+
+def band_values(tokens):
+    """토큰 집합의 MinHash 서명을 ROWS개씩 묶은 32비트 밴드 값 BANDS개 (토큰이 없으면 None)"""
+    if not tokens:
+        return [None] * BANDS
+    signature = list(map(min, zip(*map(token_hashes, tokens))))
+    values = []
+    for start in range(0, BANDS * ROWS, ROWS):
+        # 저장되는 값이므로 hash() 대신 파이썬 버전과 상관없는 계산으로 묶음
+        value = 0
+        for minhash in signature[start:start + ROWS]:
+            value = (value * _BAND_MULTIPLIER + minhash) % _PRIME
+        values.append(value & 0xFFFFFFFF)
+    return values
+
+
+def dedupe_row(cafe_id, name):
+    return {"id": cafe_id, **dict(zip(BAND_COLUMNS, band_values(name_tokens(*name_key(name)))))}
+
+
+def ensure_dedupe_table(conn):
+    """중복 검사 테이블을 만들고, 카페 수와 맞지 않으면 전체를 다시 색인한다."""
+    conn.execute(CREATE_DEDUPE_TABLE)
+    indexed = conn.execute(text(f"SELECT count(*) FROM {DEDUPE_TABLE}")).scalar()
+    total = conn.execute(text("SELECT count(*) FROM cafe")).scalar()
+    if indexed != total:
+        rebuild_dedupe_index(conn)
+    for statement in CREATE_BAND_INDEXES:
+        conn.execute(statement)
+
+
+def rebuild_dedupe_index(conn, batch_size=1000):
+    # 밴드 인덱스는 지웠다가 다 넣은 뒤 다시 만듦 (행마다 무작위 위치에 넣는 것보다 한 번에 정렬하는 게 훨씬 빠름)
+    for name in BAND_COLUMNS:
+        conn.execute(text(f"DROP INDEX IF EXISTS ix_{DEDUPE_TABLE}_{name}"))
+    conn.execute(text(f"DELETE FROM {DEDUPE_TABLE}"))
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            text("SELECT id, name FROM cafe WHERE id > :last_id ORDER BY id LIMIT :limit"),
+            {"last_id": last_id, "limit": batch_size},
+        ).all()
+        if not rows:
+            break
+        conn.execute(UPSERT_ROW, [dedupe_row(*row) for row in rows])
+        last_id = rows[-1][0]
+    for statement in CREATE_BAND_INDEXES:
+        conn.execute(statement)
+
+
+def index_cafe(conn, cafe_id, name):
+    conn.execute(UPSERT_ROW, dedupe_row(cafe_id, name))
+
+
+def index_new_cafes(conn, rows):
+    """새로 추가된 카페 (id, name) 여러 개를 한 번에 색인"""
+    if rows:
+        conn.execute(UPSERT_ROW, [dedupe_row(*row) for row in rows])
+
+
+def unindex_cafe(conn, cafe_id):
+    conn.execute(DELETE_ROW, {"id": cafe_id})
+
+
+@lru_cache(maxsize=None)
+def candidates_stmt(bands):
+    """bands 밴드의 인덱스에서 후보를 찾아 카페마다 겹친 밴드 수를 센다."""
+    arms = " UNION ALL ".join(
+        f"SELECT id FROM {DEDUPE_TABLE} WHERE {BAND_COLUMNS[band]} = :{BAND_COLUMNS[band]}" for band in bands
+    )
+    return text(
+        "SELECT cafe.id, cafe.name, cafe.location FROM ("
+        f"SELECT id, count(*) AS hits FROM ({arms}) GROUP BY id ORDER BY hits DESC, id LIMIT :limit"
+        ") AS candidate JOIN cafe ON cafe.id = candidate.id"
+    )
+
+
+def find_duplicates(conn, name, location=None, limit=10, min_score=0.6, exclude=None):
+    """name(+ location)과 비슷한 카페를 점수가 높은 순으로 최대 limit개 (Duplicate 목록)
+
+    exact는 정규화한 이름과 (location을 준 경우) 위치까지 같은 카페다.
+    """
+    letters, numbers = name_key(name)
+    tokens = name_tokens(letters, numbers)
+    if not tokens:
+        return []
+    place = location_key(location) if location is not None else None
+    params = dict(zip(BAND_COLUMNS, band_values(tokens)), limit=MAX_CANDIDATES)
+    sizes = conn.execute(COUNT_BUCKETS, dict(params, cap=MAX_BUCKET + 1)).one()
+    bands = tuple(band for band, size in enumerate(sizes) if 0 < size <= MAX_BUCKET)
+    if bands:
+        rows = conn.execute(candidates_stmt(bands), params)
+    elif any(sizes):
+        rows = conn.execute(SELECT_SAME_SIGNATURE, params)
+    else:
+        return []
+    results = []
+    for cafe_id, other, other_location in rows:
+        if cafe_id == exclude:
+            continue
+        other_letters, other_numbers = name_key(other)
+        if numbers and other_numbers and numbers != other_numbers:
+            continue  # 지점 번호가 다르면 다른 지점
+        name_score = jaccard(tokens, name_tokens(other_letters, other_numbers))
+        if place is None:
+            location_score, score = None, name_score
+        else:
+            other_place = location_key(other_location)
+            location_score = containment(bigrams(place), bigrams(other_place))
+            score = NAME_WEIGHT * name_score + LOCATION_WEIGHT * location_score
+        if score < min_score:
+            continue
+        exact = (letters, numbers) == (other_letters, other_numbers) and (place is None or place == other_place)
+        results.append(Duplicate(cafe_id, other, other_location, round(score, 3), round(name_score, 3),
+                                 None if location_score is None else round(location_score, 3), exact))
+    results.sort(key=lambda match: (-match.score, match.id))
+    return results[:limit]
@@ -0,0 +1,170 @@
+import math
+import re
+
+from sqlalchemy import text
+
+# ─────────────────────────────────────────────
+# 📌 카페 좌표 추출 + 주변 카페 검색 인덱스 (SQLite R*Tree)
+# ─────────────────────────────────────────────
+# rowid(id) = cafe.id, 점 하나를 (min = max) 상자로 저장하고 정확한 좌표는 보조 컬럼(+lat, +lng)에 둔다.
+# R*Tree 좌표는 32비트 float라서 상자 검색으로 후보만 고르고 거리는 보조 컬럼 값으로 다시 계산한다.
+# 모든 함수는 Session 또는 Connection을 받아서 호출한 쪽의 트랜잭션 안에서 실행된다.
+
+GEO_TABLE = "cafe_geo"
+EARTH_RADIUS_M = 6371008.8
+
+# 첫 검색 반경 (m). 이 안에서 k개를 못 찾으면 반경을 4배씩 늘려서 다시 찾는다.
+INITIAL_SEARCH_M = 500
+
+CREATE_GEO_TABLE = text(
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {GEO_TABLE} "
+    "USING rtree(id, min_lat, max_lat, min_lng, max_lng, +lat, +lng)"
+)
+INSERT_POINT = text(
+    f"INSERT INTO {GEO_TABLE} (id, min_lat, max_lat, min_lng, max_lng, lat, lng) "
+    "VALUES (:id, :lat, :lat, :lng, :lng, :lat, :lng)"
+)
+DELETE_POINT = text(f"DELETE FROM {GEO_TABLE} WHERE id = :id")
+SELECT_BOX = text(
+    f"SELECT id, lat, lng FROM {GEO_TABLE} "
+    "WHERE max_lat >= :min_lat AND min_lat <= :max_lat AND max_lng >= :min_lng AND min_lng <= :max_lng"
+)
+
+# 구글 지도 URL 좌표 표기: 장소 핀(!3d위도!4d경도) > 지도 중심(@위도,경도) > 검색어(?q=위도,경도)
+NUMBER = r"(-?\d{1,3}(?:\.\d+)?)"
+COORDINATE_PATTERNS = (
+    re.compile(rf"!3d{NUMBER}!4d{NUMBER}"),
+    re.compile(rf"@{NUMBER},{NUMBER}"),
+    re.compile(rf"[?&](?:q|ll|query|center)={NUMBER}(?:,|%2C)\s*{NUMBER}", re.IGNORECASE),
+)
+
+
+def valid_coordinates(lat, lng):
+    return -90 <= lat <= 90 and -180 <= lng <= 180
+
+
+def parse_coordinates(map_url):
+    """지도 URL에서 (위도, 경도)를 찾는다. 좌표가 없는 URL(g.page 단축 링크 등)은 None."""
+    if not map_url:
+        return None
+    for pattern in COORDINATE_PATTERNS:
+        match = pattern.search(map_url)
+        if match:
+            lat, lng = float(match.group(1)), float(match.group(2))
+            if valid_coordinates(lat, lng):
+                return lat, lng
+    return None
+
+
+def coordinates_from(lat, lng):
+    """요청 본문에 직접 넣은 좌표 검증. 둘 다 없으면 None, 하나만 있거나 범위를 벗어나면 ValueError"""
+    if lat in (None, "") and lng in (None, ""):
+        return None
+    try:
+        lat, lng = float(lat), float(lng)
+    except (TypeError, ValueError):
+        raise ValueError("lat and lng must both be numbers")
+    if not (math.isfinite(lat) and math.isfinite(lng)):
+        raise ValueError("lat and lng must be finite numbers")
+    if not valid_coordinates(lat, lng):
+        raise ValueError("lat must be between -90 and 90, lng between -180 and 180")
+    return lat, lng
+
+
+def distance_m(lat1, lng1, lat2, lng2):
+    """두 좌표 사이의 거리 (하버사인, m)"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_boxes(lat, lng, radius_m):
+    """반경 radius_m 원을 감싸는 상자들 (날짜 변경선을 넘으면 두 개로 나눔)"""
+    dlat = math.degrees(radius_m / EARTH_RADIUS_M)
+    min_lat, max_lat = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+    cos_lat = min(math.cos(math.radians(min_lat)), math.cos(math.radians(max_lat)))
+    if min_lat <= -90 or max_lat >= 90 or cos_lat <= 1e-9:
+        return [(min_lat, max_lat, -180.0, 180.0)]
+    dlng = math.degrees(radius_m / (EARTH_RADIUS_M * cos_lat))
+    if dlng >= 180:
+        return [(min_lat, max_lat, -180.0, 180.0)]
+    min_lng, max_lng = lng - dlng, lng + dlng
+    if min_lng < -180:
+        return [(min_lat, max_lat, min_lng + 360, 180.0), (min_lat, max_lat, -180.0, max_lng)]
+    if max_lng > 180:
+        return [(min_lat, max_lat, min_lng, 180.0), (min_lat, max_lat, -180.0, max_lng - 360)]
+    return [(min_lat, max_lat, min_lng, max_lng)]
+
+
+def ensure_geo_table(conn):
+    """좌표 인덱스 테이블을 만들고, 좌표가 있는 카페 수와 맞지 않으면 전체를 다시 색인한다.
+
+    cafe 테이블에 좌표 컬럼이 아직 없으면 (마이그레이션 전) 아무것도 하지 않는다.
+    """
+    columns = {row[1] for row in conn.execute(text("PRAGMA table_info(cafe)"))}
+    if not {"lat", "lng"} <= columns:
+        return
+    conn.execute(CREATE_GEO_TABLE)
+    indexed = conn.execute(text(f"SELECT count(*) FROM {GEO_TABLE}")).scalar()
+    total = conn.execute(text("SELECT count(*) FROM cafe WHERE lat IS NOT NULL AND lng IS NOT NULL")).scalar()
+    if indexed != total:
+        rebuild_geo_index(conn)
+
+
+def rebuild_geo_index(conn, batch_size=1000):
+    conn.execute(text(f"DELETE FROM {GEO_TABLE}"))
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            text("SELECT id, lat, lng FROM cafe WHERE id > :last_id AND lat IS NOT NULL AND lng IS NOT NULL "
+                 "ORDER BY id LIMIT :limit"),
+            {"last_id": last_id, "limit": batch_size},
+        ).all()
+        if not rows:
+            return
+        conn.execute(INSERT_POINT, [{"id": row[0], "lat": row[1], "lng": row[2]} for row in rows])
+        last_id = rows[-1][0]
+
+
+def index_point(conn, cafe_id, lat, lng):
+    conn.execute(DELETE_POINT, {"id": cafe_id})
+    if lat is not None and lng is not None:
+        conn.execute(INSERT_POINT, {"id": cafe_id, "lat": lat, "lng": lng})
+
+
+def index_new_points(conn, rows):
+    """새로 추가된 카페 (id, lat, lng) 여러 개를 한 번에 색인 (좌표가 없는 카페는 건너뜀)"""
+    points = [{"id": cafe_id, "lat": lat, "lng": lng} for cafe_id, lat, lng in rows
+              if lat is not None and lng is not None]
+    if points:
+        conn.execute(INSERT_POINT, points)
+
+
+def unindex_point(conn, cafe_id):
+    conn.execute(DELETE_POINT, {"id": cafe_id})
+
+
+def nearby(conn, lat, lng, radius_m, k, accept=None):
+    """반경 radius_m 안에서 가까운 순으로 (cafe_id, 거리 m)를 최대 k개 돌려준다.
+
+    작은 반경부터 상자 검색으로 후보를 고르고 정확한 거리로 거른다. 현재 반경 안에서 k개를
+    찾으면 그보다 먼 카페는 볼 필요가 없으므로 멈춘다. accept(cafe_id)가 False인 카페는 제외.
+    """
+    search_m = min(radius_m, INITIAL_SEARCH_M)
+    while True:
+        found = []
+        for min_lat, max_lat, min_lng, max_lng in bounding_boxes(lat, lng, search_m):
+            rows = conn.execute(SELECT_BOX, {"min_lat": min_lat, "max_lat": max_lat,
+                                             "min_lng": min_lng, "max_lng": max_lng})
+            for cafe_id, point_lat, point_lng in rows:
+                if accept is not None and not accept(cafe_id):
+                    continue
+                distance = distance_m(lat, lng, point_lat, point_lng)
+                if distance <= search_m:
+                    found.append((distance, cafe_id))
+        if len(found) >= k or search_m >= radius_m:
+            found.sort()
+            return [(cafe_id, distance) for distance, cafe_id in found[:k]]
+        search_m = min(radius_m, search_m * 4)
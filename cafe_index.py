@@ -0,0 +1,216 @@
+import itertools
+import random
+import threading
+
+# 편의시설 컬럼 이름 (Cafe 모델의 Boolean 컬럼과 동일)
+AMENITIES = ("has_toilet", "has_wifi", "has_sockets", "can_take_calls")
+
+
+# ─────────────────────────────────────────────
+# 📌 O(1) 추가 / 삭제 / 무작위 추출이 가능한 id 집합
+# ─────────────────────────────────────────────
+
+class IdPool:
+    def __init__(self):
+        self.ids = []          # 무작위 접근용 리스트
+        self.positions = {}    # id -> 리스트 인덱스
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, cafe_id):
+        return cafe_id in self.positions
+
+    def add(self, cafe_id):
+        if cafe_id in self.positions:
+            return
+        self.positions[cafe_id] = len(self.ids)
+        self.ids.append(cafe_id)
+
+    def discard(self, cafe_id):
+        # 마지막 원소를 빈자리로 옮겨서 O(1) 삭제
+        position = self.positions.pop(cafe_id, None)
+        if position is None:
+            return
+        last = self.ids.pop()
+        if position < len(self.ids):
+            self.ids[position] = last
+            self.positions[last] = position
+
+
+# ─────────────────────────────────────────────
+# 📌 비트셋 유틸리티 (파이썬 int의 i번째 비트 = cafe id i)
+# ─────────────────────────────────────────────
+
+def bits_from_ids(ids):
+    bits = 0
+    for cafe_id in ids:
+        bits |= 1 << cafe_id
+    return bits
+
+
+def ids_from_bits(bits, after=0, limit=None):
+    """켜진 비트의 id를 오름차순으로 돌려준다 (after보다 큰 id만, 최대 limit개)."""
+    bits >>= after + 1
+    if not bits:
+        return []
+    # 2진 문자열을 뒤집어서 '1'의 위치를 C 수준의 str.find로 찾음
+    digits = bin(bits)[:1:-1]
+    ids = []
+    position = digits.find("1")
+    while position != -1 and (limit is None or len(ids) < limit):
+        ids.append(position + after + 1)
+        position = digits.find("1", position + 1)
+    return ids
+
+
+# ─────────────────────────────────────────────
+# 📌 카페 id 인덱스 (전체 + 편의시설 값별 풀 + 편의시설 비트셋)
+# ─────────────────────────────────────────────
+
+class CafeIdIndex:
+    """랜덤 추천 / 편의시설 필터용 인메모리 id 인덱스.
+
+    처음 사용할 때 id와 편의시설 컬럼만 한 번 읽어 오고, 이후에는 쓰기 라우트가
+    upsert/remove 로 갱신한다. 프로세스마다 따로 유지되므로 다른 워커의 추가 / 수정 / 삭제는
+    refresh()가 변경 피드 순번(change_sequence)을 확인해서 앞서 있으면 그 뒤의 변경을 읽어 반영한다.
+    """
+
+    def __init__(self, rng=None):
+        self._lock = threading.Lock()
+        self._rng = rng or random.Random()
+        self._loaded = False
+        self._all = IdPool()
+        self._pools = {(name, value): IdPool() for name in AMENITIES for value in (True, False)}
+        self._all_bits = 0
+        self._bits = {name: 0 for name in AMENITIES}  # 편의시설이 있는 카페 id 비트셋
+        self.version = 0  # 이 순번까지의 변경은 반영됨 (로컬 upsert / remove는 올리지 않음)
+
+    @property
+    def loaded(self):
+        return self._loaded
+
+    def __len__(self):
+        return len(self._all)
+
+    def ensure_loaded(self, load_rows, load_version=None):
+        """load_rows()는 (id, has_toilet, has_wifi, has_sockets, can_take_calls) 행을 돌려줘야 한다.
+
+        load_version()은 현재 변경 피드 순번 (행보다 먼저 읽으므로 그 사이의 변경은 refresh가 다시 적용)
+        """
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self.version = (load_version() if load_version else None) or 0
+            for row in load_rows():
+                self._put(row[0], dict(zip(AMENITIES, row[1:])))
+            self._loaded = True
+
+    def upsert(self, cafe_id, amenities):
+        # 아직 로드되지 않았다면 첫 사용 시 DB에서 최신 상태를 읽으므로 무시
+        if not self._loaded:
+            return
+        with self._lock:
+            self._drop(cafe_id)
+            self._put(cafe_id, amenities)
+
+    def remove(self, cafe_id):
+        if not self._loaded:
+            return
+        with self._lock:
+            self._drop(cafe_id)
+
+    def refresh(self, load_version, load_changes):
+        """load_version()이 반영한 순번보다 크면 load_changes(since)의 변경을 적용한다.
+
+        load_changes(since)는 since 이후에 바뀐 [(id, 편의시설 dict)]를 돌려줘야 한다 (삭제는 dict 대신 None).
+        순번을 먼저 읽고 변경을 나중에 읽으므로 변경 목록은 적어도 그 순번까지를 담고 있다.
+        """
+        if not self._loaded:
+            return
+        version = load_version() or 0
+        if version > self.version:
+            self.apply_changes(load_changes(self.version), version)
+
+    def apply_changes(self, changes, version):
+        with self._lock:
+            # 동시에 읽은 더 새로운 변경이 먼저 적용되었다면 이 결과는 버림 (같은 카페를 예전 값으로 되돌리지 않게)
+            if version <= self.version:
+                return
+            for cafe_id, amenities in changes:
+                self._drop(cafe_id)
+                if amenities is not None:
+                    self._put(cafe_id, amenities)
+            self.version = version
+
+    def sample(self, k=1, filters=None):
+        """조건(filters: {편의시설: bool})을 만족하는 서로 다른 id를 최대 k개 무작위로 뽑는다."""
+        with self._lock:
+            pools = sorted((self._pools[(name, bool(value))] for name, value in (filters or {}).items()), key=len)
+            if not pools:
+                return self._rng.sample(self._all.ids, min(k, len(self._all)))
+
+            base, others = pools[0], pools[1:]
+            if not others:
+                return self._rng.sample(base.ids, min(k, len(base)))
+
+            # 가장 작은 풀에서 뽑고 나머지 조건으로 거른다 (rejection sampling)
+            picked = []
+            seen = set()
+            for _ in range(20 * k + 50):
+                if len(picked) >= k or len(seen) >= len(base):
+                    return picked
+                cafe_id = base.ids[self._rng.randrange(len(base))]
+                if cafe_id in seen:
+                    continue
+                seen.add(cafe_id)
+                if all(cafe_id in pool for pool in others):
+                    picked.append(cafe_id)
+
+            # 조건이 드물게 맞는 경우: 가장 작은 풀 기준으로 교집합을 구해서 추출
+            candidates = [cafe_id for cafe_id in base.ids if all(cafe_id in pool for pool in others)]
+            return self._rng.sample(candidates, min(k, len(candidates)))
+
+    def filter_bits(self, filters=None, restrict=None):
+        """조건(filters: {편의시설: bool})을 만족하는 id 비트셋 (restrict 비트셋과 AND)"""
+        with self._lock:
+            bits = self._all_bits if restrict is None else self._all_bits & restrict
+            for name, value in (filters or {}).items():
+                bits = bits & self._bits[name] if value else bits & ~self._bits[name]
+            return bits
+
+    def facets(self, bits):
+        """비트셋 안에서 편의시설별 개수와 16가지 편의시설 조합별 개수"""
+        with self._lock:
+            amenity_bits = {name: bits & self._bits[name] for name in AMENITIES}
+        combinations = []
+        for values in itertools.product((True, False), repeat=len(AMENITIES)):
+            combination = bits
+            for name, value in zip(AMENITIES, values):
+                combination = combination & amenity_bits[name] if value else combination & ~amenity_bits[name]
+            combinations.append({**dict(zip(AMENITIES, values)), "count": combination.bit_count()})
+        return {
+            "total": bits.bit_count(),
+            "amenities": {name: amenity_bits[name].bit_count() for name in AMENITIES},
+            "combinations": combinations,
+        }
+
+    def _put(self, cafe_id, amenities):
+        self._all.add(cafe_id)
+        bit = 1 << cafe_id
+        self._all_bits |= bit
+        for name in AMENITIES:
+            self._pools[(name, bool(amenities.get(name)))].add(cafe_id)
+            if amenities.get(name):
+                self._bits[name] |= bit
+
+    def _drop(self, cafe_id):
+        self._all.discard(cafe_id)
+        mask = ~(1 << cafe_id)
+        self._all_bits &= mask
+        for name in AMENITIES:
+            self._bits[name] &= mask
+        for pool in self._pools.values():
+            pool.discard(cafe_id)
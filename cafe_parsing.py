@@ -0,0 +1,42 @@
+import re
+
+# ─────────────────────────────────────────────
+# 📌 자유 입력 문자열(커피 가격, 좌석 수)을 숫자로 변환
+# ─────────────────────────────────────────────
+# 정렬 / 범위 검색용 숫자 컬럼(coffee_price_value, seats_min)을 채울 때 사용한다.
+# 해석할 수 없는 값("Unknown", "정보 없음" 등)은 None.
+# 가격은 원화 표기(₩, 원, 천원, KRW)만 숫자로 바꾼다. 다른 통화('£2.40')나 통화를 알 수 없는 값('4500')을
+# 원화와 같은 숫자로 비교하지 않도록 None (범위 검색에서 빠지고 정렬에서는 마지막).
+
+NUMBER = re.compile(r"\d+(?:,\d{3})*(?:\.\d+)?|\.\d+")
+THOUSANDS = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*천\s*원?\s*$")
+WON_MARK = re.compile(r"₩|원|KRW", re.IGNORECASE)
+OTHER_CURRENCY = re.compile(r"[£$€¥円]|\b(?:GBP|USD|EUR|JPY|CNY)\b", re.IGNORECASE)
+
+
+def parse_price(text):
+    """원화 가격만: '₩4,500' -> 4500.0, '4500원' -> 4500.0, '4.5천원' -> 4500.0, '£2.40' / '4500' -> None"""
+    if not text:
+        return None
+    text = str(text).strip()
+    thousands = THOUSANDS.match(text)
+    if thousands:
+        return float(thousands.group(1)) * 1000
+    if not WON_MARK.search(text) or OTHER_CURRENCY.search(text):
+        return None
+    match = NUMBER.search(text)
+    if not match:
+        return None
+    return float(match.group().replace(",", ""))
+
+
+def parse_seats(text):
+    """좌석 수의 최소값. '50석' -> 50, '50+' -> 50, '20-30' -> 20, '약 40석' -> 40"""
+    if text is None or text == "":
+        return None
+    if isinstance(text, (int, float)):
+        return int(text)
+    match = NUMBER.search(str(text))
+    if not match:
+        return None
+    return int(float(match.group().replace(",", "")))
@@ -0,0 +1,46 @@
+from itertools import starmap
+
+# ─────────────────────────────────────────────
+# 📌 읽기 전용 카페 행 (ORM 인스턴스 대신 Core select 결과)
+# ─────────────────────────────────────────────
+# 조회 라우트는 카페를 cafe_to_dict / 조각 캐시에 넘길 뿐 수정하지 않으므로 identity map,
+# 속성 계측, validates 훅이 필요 없다. Core select가 돌려준 튜플을 __slots__ 객체에 그대로 담는다.
+# 속성 이름이 Cafe 모델과 같아서 cafe_to_dict / FragmentStore에 그대로 넘길 수 있다.
+
+
+class CafeRow:
+    __slots__ = ("id", "name", "map_url", "img_url", "location", "seats",
+                 "has_toilet", "has_wifi", "has_sockets", "can_take_calls",
+                 "coffee_price", "lat", "lng", "version", "updated_at")
+
+    def __init__(self, id, name, map_url, img_url, location, seats,
+                 has_toilet, has_wifi, has_sockets, can_take_calls,
+                 coffee_price, lat, lng, version, updated_at):
+        self.id = id
+        self.name = name
+        self.map_url = map_url
+        self.img_url = img_url
+        self.location = location
+        self.seats = seats
+        self.has_toilet = has_toilet
+        self.has_wifi = has_wifi
+        self.has_sockets = has_sockets
+        self.can_take_calls = can_take_calls
+        self.coffee_price = coffee_price
+        self.lat = lat
+        self.lng = lng
+        self.version = version
+        self.updated_at = updated_at
+
+    def __repr__(self):
+        return f"<CafeRow {self.id} {self.name!r}>"
+
+
+def columns(table):
+    """CafeRow 필드 순서의 컬럼 목록 (select(*columns(Cafe.__table__)))"""
+    return [table.c[name] for name in CafeRow.__slots__]
+
+
+def from_result(result):
+    """Core 결과(튜플 행) -> CafeRow 이터레이터 (스트리밍 결과도 한 행씩 변환)"""
+    return starmap(CafeRow, result)
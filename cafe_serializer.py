@@ -0,0 +1,173 @@
+import gzip
+import json
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import brotli  # 선택 의존성 (설치되어 있으면 br 압축본도 미리 생성)
+except ImportError:
+    brotli = None
+
+# ─────────────────────────────────────────────
+# 📌 카페 JSON 직렬화 캐시 (카페별 조각 + 전체 목록 압축본)
+# ─────────────────────────────────────────────
+
+
+def encode_fragment(data):
+    # jsonify와 같은 키 순서(sort_keys), 한글은 UTF-8 그대로 저장해서 크기를 줄임
+    return json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def join_fragments(fragments):
+    return b"[" + b",".join(fragments) + b"]"
+
+
+class FragmentStore:
+    """cafe id -> 인코딩된 JSON bytes (또는 encode가 만든 다른 형식). 해당 카페가 바뀔 때만 다시 만든다.
+
+    조각과 함께 카페의 변경 버전(version)을 저장해 두므로, 버전을 아는 호출자(변경 피드)는 오래된 조각을 쓰지 않는다.
+    다른 워커에서 바뀐 카페는 호출자가 변경 피드를 읽어 invalidate(id, 순번)으로 지운다.
+    ttl(초)이 지난 조각은 다시 인코딩하고 (찾을 때 지움), 조각 수가 max_entries를 넘으면 오래 쓰지 않은 것부터 지운다.
+    """
+
+    def __init__(self, to_dict, ttl=600, max_entries=20000, clock=time.monotonic, encode=encode_fragment):
+        self._to_dict = to_dict
+        self._encode = encode
+        self._ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        # cafe id -> (조각, 만료 시각, 버전), 오래 쓰지 않은 순서. 조각이 None이면 그 버전보다 오래된 값은 저장하지 않음
+        self._fragments = OrderedDict()
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._fragments)
+
+    def _lookup(self, cafe_id, now, version=None):
+        # 잠금 안에서 호출
+        entry = self._fragments.get(cafe_id)
+        if entry is None:
+            return None
+        if entry[1] <= now:
+            del self._fragments[cafe_id]
+            return None
+        if entry[0] is None or (version is not None and entry[2] != version):
+            return None
+        self._fragments.move_to_end(cafe_id)
+        return entry[0]
+
+    def _store(self, cafe_id, entry):
+        # 잠금 안에서 호출
+        self._fragments[cafe_id] = entry
+        self._fragments.move_to_end(cafe_id)
+        while len(self._fragments) > self.max_entries:
+            self._fragments.popitem(last=False)
+            self.evictions += 1
+
+    def fragment(self, cafe):
+        """이미 조회한 카페 객체의 조각 (없으면 인코딩 후 저장)"""
+        now = self._clock()
+        with self._lock:
+            fragment = self._lookup(cafe.id, now)
+        if fragment is None:
+            fragment = self._encode(self._to_dict(cafe))
+            version = getattr(cafe, "version", None)
+            with self._lock:
+                # 변경 전에 읽은 행이면 이번 응답에만 쓰고 저장하지 않음 (더 새로운 조각 / 무효화 기록을 덮지 않게)
+                entry = self._fragments.get(cafe.id)
+                if entry is None or entry[1] <= now or entry[2] is None or version is None or entry[2] <= version:
+                    self._store(cafe.id, (fragment, now + self._ttl, version))
+        return fragment
+
+    def cached(self, ids, versions=None):
+        """캐시에 있는 조각 {id: bytes}와 캐시에 없는 id 목록 (versions {id: version}과 다른 조각은 없는 것으로 봄)"""
+        now = self._clock()
+        found = {}
+        missing = []
+        with self._lock:
+            for cafe_id in ids:
+                fragment = self._lookup(cafe_id, now, versions.get(cafe_id) if versions else None)
+                if fragment is None:
+                    missing.append(cafe_id)
+                else:
+                    found[cafe_id] = fragment
+        return found, missing
+
+    def fragments_for_ids(self, ids, load_cafes, versions=None):
+        """id 순서대로 조각을 돌려준다. 캐시에 없는 id만 load_cafes(ids)로 한 번에 조회한다."""
+        found, missing = self.cached(ids, versions)
+        if missing:
+            for cafe in load_cafes(missing):
+                found[cafe.id] = self.fragment(cafe)
+        return [found[cafe_id] for cafe_id in ids if cafe_id in found]
+
+    def invalidate(self, cafe_id, version=None):
+        """조각을 지운다. version(바뀐 순번)을 주면 ttl 동안 그보다 오래된 값으로 만든 조각은 다시 저장하지 않는다."""
+        with self._lock:
+            if version is None:
+                self._fragments.pop(cafe_id, None)
+                return
+            entry = self._fragments.get(cafe_id)
+            if entry is None or entry[2] is None or entry[2] < version:
+                self._store(cafe_id, (None, self._clock() + self._ttl, version))
+
+
+class ListBodyCache:
+    """카탈로그 버전별 전체 목록 본문과 gzip / br 압축본.
+
+    본문을 만들기에 카탈로그가 너무 크면(build_body가 None) 그 버전에는 빈 dict를 저장해 두고
+    돌려준다 (호출자는 스트리밍으로 응답, 버전마다 크기를 다시 확인하지 않음).
+    """
+
+    def __init__(self, ttl=300, gzip_level=6, brotli_quality=5, clock=time.monotonic):
+        self._ttl = ttl
+        self._gzip_level = gzip_level
+        self._brotli_quality = brotli_quality
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._version = None
+        self._expires_at = 0.0
+        self._bodies = None
+
+    @property
+    def encodings(self):
+        return ("br", "gzip") if brotli is not None else ("gzip",)
+
+    def get(self, version, build_body):
+        """build_body()는 압축 전 JSON bytes(너무 크면 None)를 돌려줘야 한다.
+
+        결과: {"identity": ..., "gzip": ..., "br": ...}, 너무 크면 빈 dict
+        """
+        with self._lock:
+            bodies = self._current(version)
+            return bodies if bodies is not None else self._store(version, build_body())
+
+    def cached(self, version):
+        """해당 버전의 본문이 아직 유효하면 돌려준다 (없으면 None)"""
+        with self._lock:
+            return self._current(version)
+
+    def store(self, version, body):
+        """미리 만든 본문(너무 크면 None)을 압축해서 저장 (비동기 경로처럼 build_body를 잠금 안에서 부를 수 없을 때)"""
+        with self._lock:
+            return self._store(version, body)
+
+    def clear(self):
+        with self._lock:
+            self._version, self._bodies = None, None
+
+    def _current(self, version):
+        if self._bodies is not None and self._version == version and self._expires_at > self._clock():
+            return self._bodies
+        return None
+
+    def _store(self, version, body):
+        bodies = {}
+        if body is not None:
+            bodies = {"identity": body, "gzip": gzip.compress(body, compresslevel=self._gzip_level)}
+            if brotli is not None:
+                bodies["br"] = brotli.compress(body, quality=self._brotli_quality)
+        self._version, self._expires_at, self._bodies = version, self._clock() + self._ttl, bodies
+        return bodies
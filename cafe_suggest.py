@@ -0,0 +1,276 @@
+import bisect
+import threading
+import time
+from array import array
+from itertools import islice
+
+from hangul import CHOSEONG_SET, SYLLABLE_CHOSEONG, matches_prefix, normalize
+
+# ─────────────────────────────────────────────
+# 📌 자동 완성용 접두어 인덱스 (카페 이름 / 위치, 한글 음절·초성 접두어)
+# ─────────────────────────────────────────────
+# 정렬된 키를 BLOCK_SIZE개씩 '\n'으로 이어 붙인 문자열 블록에 저장한다 (키마다 str 객체를 두지 않으므로
+# 이름 100만 개에서도 메모리가 작다). 블록의 첫 키로 블록을 찾고 블록 안에서 다시 이분 탐색한다.
+# 보여 줄 이름 / 위치도 id로 바로 찾을 수 있게 메모리에 두므로 요청마다 DB를 읽지 않는다.
+
+BLOCK_SIZE = 512
+SEPARATOR = "\x1f"  # 키와 값(cafe id / 위치 번호) 구분자 (key()가 공백으로 취급해 지우므로 키에는 없음)
+MAX_SCAN_FACTOR = 64  # 초성이 섞인 검색어('스ㅌ')는 후보를 다시 확인하므로 최대 limit * 64개까지만 훑음
+
+
+def key(text):
+    """정규화 + 연속 공백 / 줄바꿈 / 제어 문자를 공백 하나로"""
+    return " ".join(normalize(text).split())
+
+
+def word_suffixes(text):
+    """'서울 강남구 역삼동' -> '서울 강남구 역삼동', '강남구 역삼동', '역삼동'"""
+    words = text.split(" ")
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+class SortedKeys:
+    """중복 없는 정렬된 문자열 집합 (BLOCK_SIZE개씩 한 문자열로 저장)"""
+
+    def __init__(self, block_size=BLOCK_SIZE):
+        self.block_size = block_size
+        self._firsts = []  # 블록별 첫 키
+        self._blocks = []
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def load(self, entries):
+        """정렬된 entries(list)로 전체를 다시 만든다."""
+        self._blocks = ["\n".join(entries[start:start + self.block_size])
+                        for start in range(0, len(entries), self.block_size)]
+        # 첫 키는 블록에서 새로 잘라 냄 (entries의 문자열을 붙잡고 있으면 entries를 지워도 메모리가 반환되지 않음)
+        self._firsts = [block.partition("\n")[0] for block in self._blocks]
+        self._count = len(entries)
+
+    def blocks(self):
+        return list(self._blocks)
+
+    def _locate(self, entry):
+        return max(0, bisect.bisect_right(self._firsts, entry) - 1)
+
+    def add(self, entry):
+        if not self._blocks:
+            self.load([entry])
+            return
+        i = self._locate(entry)
+        lines = self._blocks[i].split("\n")
+        j = bisect.bisect_left(lines, entry)
+        if j < len(lines) and lines[j] == entry:
+            return
+        lines.insert(j, entry)
+        self._count += 1
+        if len(lines) > 2 * self.block_size:
+            half = len(lines) // 2
+            self._firsts[i:i + 1] = [lines[0], lines[half]]
+            self._blocks[i:i + 1] = ["\n".join(lines[:half]), "\n".join(lines[half:])]
+        else:
+            self._firsts[i] = lines[0]
+            self._blocks[i] = "\n".join(lines)
+
+    def discard(self, entry):
+        if not self._blocks:
+            return
+        i = self._locate(entry)
+        lines = self._blocks[i].split("\n")
+        j = bisect.bisect_left(lines, entry)
+        if j == len(lines) or lines[j] != entry:
+            return
+        del lines[j]
+        self._count -= 1
+        if lines:
+            self._firsts[i] = lines[0]
+            self._blocks[i] = "\n".join(lines)
+        else:
+            del self._firsts[i], self._blocks[i]
+
+    def iter_prefix(self, prefix):
+        """prefix로 시작하는 키를 정렬 순서대로 (다 읽기 전에 수정하지 말 것)"""
+        for i in range(self._locate(prefix), len(self._blocks)):
+            lines = self._blocks[i].split("\n")
+            for line in islice(lines, bisect.bisect_left(lines, prefix), None):
+                if not line.startswith(prefix):
+                    return
+                yield line
+
+
+class SuggestIndex:
+    """카페 이름 / 위치 접두어 -> (id, 이름, 위치). 프로세스마다 따로 유지된다.
+
+    처음 사용할 때 카페 테이블에서 한 번 읽어 오고, 이후에는
+    쓰기 라우트가 upsert/remove 로 갱신한다. 다른 워커의 추가 / 수정 / 삭제는 refresh()가
+    refresh_seconds마다 변경 피드(cafe.version, 삭제 기록)에서 읽어 반영한다.
+    """
+
+    def __init__(self, refresh_seconds=5.0, clock=time.monotonic):
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._names = SortedKeys()              # "이름\x1fid"
+        self._name_choseong = SortedKeys()      # "이름 초성\x1fid"
+        self._location_keys = SortedKeys()      # "위치 단어 접미사\x1f위치 번호"
+        self._location_choseong = SortedKeys()  # "위치 단어 접미사 초성\x1f위치 번호"
+        self._name_of = []                      # cafe id -> 이름 (없으면 None)
+        self._location_of = array("I")          # cafe id -> 위치 번호 (0 = 없음)
+        self._location_names = [None]           # 위치 번호 -> 위치
+        self._location_numbers = {}             # 위치 -> 위치 번호
+        self._location_ids = [None]             # 위치 번호 -> 정렬된 cafe id array
+        self._refresh_seconds = refresh_seconds
+        self._clock = clock
+        self._refreshed_at = 0.0
+        self.version = 0  # 이 순번까지의 변경은 반영됨 (로컬 upsert / remove는 올리지 않음)
+
+    @property
+    def loaded(self):
+        return self._loaded
+
+    def __len__(self):
+        return len(self._names)
+
+    def ensure_loaded(self, load_rows, load_version):
+        """load_rows()는 id 순서로 (id, 이름, 위치) 행을 돌려줘야 한다."""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self.version = load_version() or 0
+            for cafe_id, name, location in load_rows():
+                self._set_name(cafe_id, name)
+                number = self._location_numbers.get(location)
+                if number is None:
+                    number = self._new_location(location)
+                self._location_of[cafe_id] = number
+                self._location_ids[number].append(cafe_id)  # id 순서로 들어오므로 정렬 유지
+
+            self._names.load(sorted(f"{key(name)}{SEPARATOR}{cafe_id}"
+                                    for cafe_id, name in enumerate(self._name_of) if name is not None))
+            # 키가 이미 정규화되어 있으므로 음절만 초성으로 바꾸면 됨 (구분자 / id 숫자는 그대로)
+            self._name_choseong.load(sorted(entry.translate(SYLLABLE_CHOSEONG)
+                                            for block in self._names.blocks() for entry in block.split("\n")))
+
+            entries, choseong_entries = [], []
+            for number in range(1, len(self._location_names)):
+                plain, initials = self._location_entries(number)
+                entries += plain
+                choseong_entries += initials
+            self._location_keys.load(sorted(set(entries)))
+            self._location_choseong.load(sorted(set(choseong_entries)))
+            self._refreshed_at = self._clock()
+            self._loaded = True
+
+    def upsert(self, cafe_id, name, location):
+        # 아직 로드되지 않았다면 첫 사용 시 DB에서 최신 상태를 읽으므로 무시
+        if not self._loaded:
+            return
+        with self._lock:
+            self._drop(cafe_id)
+            self._put(cafe_id, name, location)
+
+    def remove(self, cafe_id):
+        if not self._loaded:
+            return
+        with self._lock:
+            self._drop(cafe_id)
+
+    def refresh(self, load_changes):
+        """load_changes(since)는 ([(id, 이름, 위치)], 마지막 순번)을 돌려줘야 한다 (삭제는 이름 / 위치가 None)."""
+        if not self._loaded or self._clock() - self._refreshed_at < self._refresh_seconds:
+            return
+        self._refreshed_at = self._clock()
+        changes, version = load_changes(self.version)
+        with self._lock:
+            for cafe_id, name, location in changes:
+                self._drop(cafe_id)
+                if name is not None:
+                    self._put(cafe_id, name, location)
+            self.version = max(self.version, version)
+
+    def suggest(self, query, limit):
+        """query로 시작하는 (id, 이름, 위치)를 최대 limit개 (이름 일치 먼저, 그다음 위치 일치 id 순)"""
+        query = key(query)
+        if not query:
+            return []
+        # 초성 앞의 음절 부분('스ㅌ' -> '스')은 일반 키에서, 초성으로 시작하면 초성 키에서 찾는다
+        split = next((i for i, char in enumerate(query) if char in CHOSEONG_SET), len(query))
+        choseong = split == 0
+        prefix = query.translate(SYLLABLE_CHOSEONG) if choseong else query[:split]
+        exact = choseong or split == len(query)  # 찾은 키가 곧 일치 (다시 확인할 필요 없음)
+        budget = limit * MAX_SCAN_FACTOR
+        results = {}
+        with self._lock:
+            for entry in (self._name_choseong if choseong else self._names).iter_prefix(prefix):
+                cafe_id = int(entry.rpartition(SEPARATOR)[2])
+                name = self._name_of[cafe_id]
+                if cafe_id not in results and (exact or matches_prefix(key(name), query)):
+                    results[cafe_id] = (cafe_id, name, self._location_names[self._location_of[cafe_id]])
+                budget -= 1
+                if len(results) >= limit or budget <= 0:
+                    return list(results.values())
+            for entry in (self._location_choseong if choseong else self._location_keys).iter_prefix(prefix):
+                number = int(entry.rpartition(SEPARATOR)[2])
+                location = self._location_names[number]
+                if not (exact or any(matches_prefix(suffix, query) for suffix in word_suffixes(key(location)))):
+                    continue
+                for cafe_id in self._location_ids[number]:
+                    results.setdefault(cafe_id, (cafe_id, self._name_of[cafe_id], location))
+                    if len(results) >= limit:
+                        return list(results.values())
+        return list(results.values())
+
+    def _set_name(self, cafe_id, name):
+        missing = cafe_id + 1 - len(self._name_of)
+        if missing > 0:
+            self._name_of.extend([None] * missing)
+            self._location_of.extend(array("I", [0]) * missing)
+        self._name_of[cafe_id] = name
+
+    def _new_location(self, location):
+        number = len(self._location_names)
+        self._location_names.append(location)
+        self._location_ids.append(array("I"))
+        self._location_numbers[location] = number
+        return number
+
+    def _put(self, cafe_id, name, location):
+        name_key = key(name)
+        self._names.add(f"{name_key}{SEPARATOR}{cafe_id}")
+        self._name_choseong.add(f"{name_key.translate(SYLLABLE_CHOSEONG)}{SEPARATOR}{cafe_id}")
+        self._set_name(cafe_id, name)
+        number = self._location_numbers.get(location)
+        if number is None:
+            number = self._new_location(location)
+            plain, initials = self._location_entries(number)
+            for entry in plain:
+                self._location_keys.add(entry)
+            for entry in initials:
+                self._location_choseong.add(entry)
+        self._location_of[cafe_id] = number
+        ids = self._location_ids[number]
+        ids.insert(bisect.bisect_left(ids, cafe_id), cafe_id)
+
+    def _drop(self, cafe_id):
+        name = self._name_of[cafe_id] if cafe_id < len(self._name_of) else None
+        if name is None:
+            return
+        name_key = key(name)
+        self._names.discard(f"{name_key}{SEPARATOR}{cafe_id}")
+        self._name_choseong.discard(f"{name_key.translate(SYLLABLE_CHOSEONG)}{SEPARATOR}{cafe_id}")
+        self._name_of[cafe_id] = None
+        # 위치 번호와 위치 키는 남겨 둠 (카페가 없는 위치는 결과에 나오지 않음)
+        ids = self._location_ids[self._location_of[cafe_id]]
+        position = bisect.bisect_left(ids, cafe_id)
+        if position < len(ids) and ids[position] == cafe_id:
+            del ids[position]
+        self._location_of[cafe_id] = 0
+
+    def _location_entries(self, number):
+        location = key(self._location_names[number])
+        choseong = location.translate(SYLLABLE_CHOSEONG)
+        return ([f"{suffix}{SEPARATOR}{number}" for suffix in word_suffixes(location)],
+                [f"{suffix}{SEPARATOR}{number}" for suffix in word_suffixes(choseong)])
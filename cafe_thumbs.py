@@ -0,0 +1,417 @@
+import hashlib
+import http.client
+import ipaddress
+import logging
+import os
+import socket
+import tempfile
+import threading
+import time
+import urllib.parse
+import urllib.request
+from collections import namedtuple
+from functools import partial
+from io import BytesIO
+
+try:
+    from PIL import Image, ImageOps  # 선택 의존성 (없으면 줄이지 않고 원본 이미지를 캐시해서 제공)
+except ImportError:
+    Image = None
+
+# ─────────────────────────────────────────────
+# 📌 카페 썸네일 디스크 캐시 (원본은 한 번만 가져오고 너비별로 줄인 이미지를 저장)
+# ─────────────────────────────────────────────
+# 디렉터리 구조 (같은 머신의 워커끼리 공유, 임시 파일에 쓴 뒤 os.replace로 바꿔서 쓰는 중인 파일을 읽지 않음)
+#   refs/ab/<sha256(img_url)>           원본 내용의 sha256 / Content-Type / 가져온 시각 (URL -> 내용)
+#   blobs/ab/<sha256(원본)>              원본 이미지 (같은 이미지를 쓰는 URL끼리 공유)
+#   variants/ab/<sha256(원본:너비)>.jpg   너비를 줄인 이미지 (투명도가 있으면 .png)
+# 파일의 mtime을 마지막 사용 시각으로 쓰고, 전체 크기가 max_bytes를 넘으면 오래된 파일부터 지운다.
+# 가져오기에 실패한 URL은 failure_seconds 동안 다시 시도하지 않는다 (예전에 가져온 이미지가 있으면 그것을 제공).
+# img_url은 누구나 등록할 수 있으므로 연결할 때마다(리디렉트 포함) 호스트를 직접 해석해서 공개 주소에만 연결하고,
+# 내용의 시그니처로 확인한 래스터 이미지(JPEG / PNG / WebP / GIF)만 저장한다 (SVG 등은 거절).
+
+logger = logging.getLogger("cafe_wifi.thumbs")
+
+USER_AGENT = "cafe-wifi-thumbnailer/1.0"
+MAX_REDIRECTS = 5
+TOUCH_SECONDS = 600  # 마지막 사용 시각(mtime)을 이보다 자주 갱신하지 않음
+LOCK_STRIPES = 64
+JPEG_QUALITY = 82
+
+Thumb = namedtuple("Thumb", "path content_type etag")
+Source = namedtuple("Source", "digest content_type fetched_at")
+
+
+class ThumbnailError(Exception):
+    pass
+
+
+def sha256(value):
+    return hashlib.sha256(value if isinstance(value, bytes) else value.encode()).hexdigest()
+
+
+# ─────────────────────────────────────────────
+# 📌 원본 가져오기 보호 (내부 주소 차단, 래스터 이미지만)
+# ─────────────────────────────────────────────
+
+# 내용 앞부분 -> Content-Type (서버가 보낸 Content-Type은 믿지 않음)
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+RASTER_TYPES = ("image/jpeg", "image/png", "image/webp", "image/gif")
+NAT64_NETWORK = ipaddress.ip_network("64:ff9b::/96")
+
+
+def sniff_image_type(data):
+    """내용으로 판별한 래스터 이미지 Content-Type, 지원하지 않는 형식이면 None"""
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    return next((content_type for signature, content_type in IMAGE_SIGNATURES if data.startswith(signature)), None)
+
+
+def is_public_address(address):
+    """루프백 / 사설 / 링크 로컬 / 예약 / 멀티캐스트 주소가 아니면 True (IPv4를 담은 IPv6 주소는 IPv4로 판단)"""
+    if address.version == 6:
+        embedded = address.ipv4_mapped or address.sixtofour
+        if embedded is None and address in NAT64_NETWORK:
+            embedded = ipaddress.IPv4Address(address.packed[-4:])
+        if embedded is not None:
+            address = embedded
+    return address.is_global and not address.is_multicast
+
+
+def resolve_checked(host, port, allow_address=is_public_address):
+    """host의 모든 주소를 확인해서 (주소, 포트) 목록을 돌려준다. 허용하지 않는 주소가 하나라도 있으면 ThumbnailError"""
+    addresses = []
+    for _, _, _, _, sockaddr in socket.getaddrinfo(host, port, type=socket.SOCK_STREAM):
+        address = ipaddress.ip_address(sockaddr[0].partition("%")[0])
+        if not allow_address(address):
+            raise ThumbnailError(f"image host {host} resolves to a blocked address ({address})")
+        addresses.append(sockaddr[:2])
+    return addresses
+
+
+def check_url(url, allow_address=is_public_address):
+    """http(s) URL이고 호스트가 허용된 주소로만 해석되는지 확인 (아니면 ThumbnailError)"""
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme.lower() not in ("http", "https") or not parts.hostname:
+        raise ThumbnailError("unsupported image URL")
+    try:
+        port = parts.port or (443 if parts.scheme.lower() == "https" else 80)
+    except ValueError:
+        raise ThumbnailError("invalid port in image URL") from None
+    resolve_checked(parts.hostname, port, allow_address)
+
+
+def create_checked_connection(address, timeout=None, source_address=None, allow_address=is_public_address):
+    """socket.create_connection과 같지만 확인한 주소로만 연결한다 (확인 뒤 DNS 응답이 바뀌어도 내부로 붙지 않음)."""
+    host, port = address
+    error = OSError(f"no address for {host}")
+    for resolved in resolve_checked(host, port, allow_address):
+        try:
+            return socket.create_connection(resolved, timeout, source_address)
+        except OSError as e:
+            error = e
+    raise error
+
+
+class CheckedHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, *args, allow_address=is_public_address, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._create_connection = partial(create_checked_connection, allow_address=allow_address)
+
+
+class CheckedHTTPSConnection(http.client.HTTPSConnection):
+    def __init__(self, *args, allow_address=is_public_address, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._create_connection = partial(create_checked_connection, allow_address=allow_address)
+
+
+class CheckedHTTPHandler(urllib.request.HTTPHandler):
+    def __init__(self, allow_address):
+        super().__init__()
+        self.allow_address = allow_address
+
+    def http_open(self, req):
+        return self.do_open(partial(CheckedHTTPConnection, allow_address=self.allow_address), req)
+
+
+class CheckedHTTPSHandler(urllib.request.HTTPSHandler):
+    def __init__(self, allow_address):
+        super().__init__()
+        self.allow_address = allow_address
+
+    def https_open(self, req):
+        return self.do_open(partial(CheckedHTTPSConnection, allow_address=self.allow_address), req)
+
+
+class CheckedRedirectHandler(urllib.request.HTTPRedirectHandler):
+    """리디렉트마다 다음 주소를 확인한다 (http(s)만, 공개 주소만, 최대 MAX_REDIRECTS번)"""
+    max_redirections = MAX_REDIRECTS
+
+    def __init__(self, allow_address):
+        super().__init__()
+        self.allow_address = allow_address
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        check_url(newurl, self.allow_address)
+        return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+
+def build_opener(allow_address=is_public_address):
+    # 환경 변수의 프록시는 쓰지 않음 (프록시를 거치면 실제 연결 대상을 확인할 수 없음)
+    return urllib.request.build_opener(urllib.request.ProxyHandler({}), CheckedHTTPHandler(allow_address),
+                                       CheckedHTTPSHandler(allow_address), CheckedRedirectHandler(allow_address))
+
+
+class ThumbnailCache:
+    def __init__(self, root, max_bytes=256 << 20, fetch_timeout=5.0, max_source_bytes=10 << 20,
+                 refresh_seconds=7 * 86400, failure_seconds=60, allow_address=is_public_address, clock=time.time):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.fetch_timeout = fetch_timeout
+        self.max_source_bytes = max_source_bytes
+        self.refresh_seconds = refresh_seconds
+        self.failure_seconds = failure_seconds
+        self.allow_address = allow_address  # 원본 서버 주소 허용 여부 (ipaddress 객체 -> bool)
+        self._opener = build_opener(allow_address)
+        self._clock = clock
+        self._lock = threading.Lock()
+        # 같은 URL / 변형을 동시에 여러 번 만들지 않도록 키마다 잠금 (개수가 늘지 않게 해시로 나눠 씀)
+        self._stripes = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        self._failures = {}  # img_url -> 다시 시도할 시각
+        self._written = 0    # 마지막 정리 이후 쓴 바이트
+        self.requests = 0
+        self.fetches = 0
+        self.fetch_errors = 0
+        self.resized = 0
+        self.evicted = 0
+
+    def get(self, url, width=None):
+        """url 이미지를 width 너비 이하로 줄인 Thumb (Pillow가 없거나 width가 None이면 원본)
+
+        원본을 가져올 수 없으면 ThumbnailError
+        """
+        with self._lock:
+            self.requests += 1
+        source = self._source(url)
+        blob = self._path("blobs", source.digest)
+        if Image is None or width is None:
+            return Thumb(blob, source.content_type, source.digest)
+        return self._variant(source, blob, width)
+
+    def forget(self, url):
+        """url의 원본 정보를 지워서 다음 요청 때 다시 가져오게 한다 (이미지 파일은 정리 때 지워짐)."""
+        with self._lock:
+            self._failures.pop(url, None)
+        try:
+            os.remove(self._path("refs", sha256(url)))
+        except FileNotFoundError:
+            pass
+
+    # 원본 가져오기 / 저장
+
+    def _source(self, url):
+        url_key = sha256(url)
+        source = self._read_source(url_key)
+        if source is not None and self._clock() - source.fetched_at < self.refresh_seconds:
+            return source
+        with self._stripe(url_key):
+            source = self._read_source(url_key)  # 기다리는 동안 다른 스레드가 가져왔을 수 있음
+            if source is not None and self._clock() - source.fetched_at < self.refresh_seconds:
+                return source
+            with self._lock:
+                retry_at = self._failures.get(url, 0)
+            if retry_at > self._clock():
+                if source is not None:
+                    return source
+                raise ThumbnailError("image fetch failed recently")
+            try:
+                data, content_type = self._fetch(url)
+            except ThumbnailError as e:
+                logger.warning("thumbnail source %s could not be fetched: %s", url, e)
+                with self._lock:
+                    self.fetch_errors += 1
+                    if len(self._failures) > 10000:
+                        self._failures.clear()
+                    self._failures[url] = self._clock() + self.failure_seconds
+                if source is not None:
+                    return source  # 예전에 가져온 이미지를 계속 제공
+                raise
+            digest = sha256(data)
+            blob = self._path("blobs", digest)
+            if not os.path.exists(blob):
+                self._write(blob, data)
+            source = Source(digest, content_type, self._clock())
+            self._write(self._path("refs", url_key), f"{digest}\n{content_type}\n{source.fetched_at}\n".encode())
+            with self._lock:
+                self.fetches += 1
+                self._failures.pop(url, None)
+            return source
+
+    def _read_source(self, url_key):
+        """저장된 원본 정보 (원본 파일이 정리되어 없으면 None)"""
+        ref = self._path("refs", url_key)
+        try:
+            with open(ref, encoding="utf-8") as file:
+                digest, content_type, fetched_at = file.read().split("\n")[:3]
+            source = Source(digest, content_type, float(fetched_at))
+        except (OSError, ValueError):
+            return None
+        if source.content_type not in RASTER_TYPES:
+            return None  # 형식 확인 전에 저장된 원본 (다시 가져와서 확인)
+        if not self._touch(self._path("blobs", digest)):
+            return None
+        self._touch(ref)
+        return source
+
+    def _fetch(self, url):
+        request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT, "Accept": ", ".join(RASTER_TYPES)})
+        try:
+            check_url(url, self.allow_address)
+            with self._opener.open(request, timeout=self.fetch_timeout) as response:
+                declared = response.headers.get_content_type()
+                if not declared.startswith("image/"):
+                    raise ThumbnailError(f"not an image ({declared})")
+                data = response.read(self.max_source_bytes + 1)
+        except (OSError, ValueError, http.client.HTTPException) as e:
+            raise ThumbnailError(str(e) or type(e).__name__) from None
+        if len(data) > self.max_source_bytes:
+            raise ThumbnailError("image is too large")
+        content_type = sniff_image_type(data)
+        if content_type is None:
+            raise ThumbnailError(f"unsupported image format ({declared})")
+        return data, content_type
+
+    # 너비별 변형
+
+    def _variant(self, source, blob, width):
+        key = sha256(f"{source.digest}:{width}")
+        found = self._find_variant(key)
+        if found is not None:
+            return found
+        with self._stripe(key):
+            found = self._find_variant(key)
+            if found is not None:
+                return found
+            try:
+                data, extension = render_variant(blob, width)
+            except (OSError, ValueError, Image.DecompressionBombError) as e:
+                # 시그니처는 맞지만 읽을 수 없는 이미지는 원본을 그대로 내보내지 않음 (라우트가 원본 주소로 보냄)
+                logger.info("thumbnail %s could not be resized: %s", source.digest, e)
+                raise ThumbnailError("image could not be decoded") from None
+            path = self._path("variants", key) + extension
+            self._write(path, data)
+            with self._lock:
+                self.resized += 1
+            return Thumb(path, CONTENT_TYPES[extension], key)
+
+    def _find_variant(self, key):
+        base = self._path("variants", key)
+        for extension, content_type in CONTENT_TYPES.items():
+            if self._touch(base + extension):
+                return Thumb(base + extension, content_type, key)
+        return None
+
+    # 파일 / 정리
+
+    def _path(self, kind, key):
+        return os.path.join(self.root, kind, key[:2], key)
+
+    def _stripe(self, key):
+        return self._stripes[int(key[:8], 16) % LOCK_STRIPES]
+
+    def _touch(self, path):
+        """파일이 있으면 마지막 사용 시각을 갱신하고 True"""
+        try:
+            modified = os.stat(path).st_mtime
+        except OSError:
+            return False
+        if self._clock() - modified > TOUCH_SECONDS:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        return True
+
+    def _write(self, path, data):
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        with self._lock:
+            self._written += len(data)
+            # 상한의 5%를 쓸 때마다 한 번 전체 크기를 확인 (디렉터리를 훑는 비용을 나눠서 냄)
+            due = self._written >= self.max_bytes // 20
+            if due:
+                self._written = 0
+        if due:
+            self.evict()
+
+    def evict(self):
+        """전체 크기가 max_bytes를 넘으면 오래 쓰지 않은 파일부터 지워서 90% 아래로 줄인다."""
+        files = []
+        total = 0
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        if total <= self.max_bytes:
+            return 0
+        removed = 0
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        with self._lock:
+            self.evicted += removed
+        return removed
+
+    def size(self):
+        return sum(os.path.getsize(os.path.join(directory, name))
+                   for directory, _, names in os.walk(self.root) for name in names)
+
+
+CONTENT_TYPES = {".jpg": "image/jpeg", ".png": "image/png"}
+
+
+def render_variant(path, width):
+    """이미지를 width 너비 이하로 줄여 (bytes, 확장자). 투명도가 있으면 PNG, 아니면 JPEG"""
+    with Image.open(path) as image:
+        if image.width > width:
+            # JPEG는 디코딩할 때부터 1/2, 1/4 ... 크기로 읽어서 큰 원본의 디코딩 시간을 줄임
+            image.draft("RGB", (width, max(1, image.height * width // image.width)))
+        image = ImageOps.exif_transpose(image)
+        alpha = image.mode in ("RGBA", "LA", "PA") or (image.mode == "P" and "transparency" in image.info)
+        image = image.convert("RGBA" if alpha else "RGB")
+        if image.width > width:
+            image = image.resize((width, max(1, round(image.height * width / image.width))), Image.Resampling.LANCZOS)
+        buffer = BytesIO()
+        if alpha:
+            image.save(buffer, "PNG", optimize=True)
+            return buffer.getvalue(), ".png"
+        image.save(buffer, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+        return buffer.getvalue(), ".jpg"
@@ -0,0 +1,116 @@
+import gzip
+import zlib
+
+try:
+    import brotli  # 선택 의존성 (설치되어 있으면 br을 gzip보다 먼저 고름)
+except ImportError:
+    brotli = None
+
+# ─────────────────────────────────────────────
+# 📌 응답 압축 (Accept-Encoding에 맞춰 br / gzip, JSON / NDJSON / HTML / CSV 응답만)
+# ─────────────────────────────────────────────
+# 이미 인코딩된 응답(미리 압축한 전체 목록 등), 파일 응답, min_bytes보다 작은 응답은 그대로 보낸다.
+# 스트리밍 응답(홈 화면, ?stream=, 내보내기)은 청크마다 flush하면서 압축해서 먼저 만든 부분이 바로 전송되게 한다.
+# 압축하면 바이트가 달라지므로 강한 ETag는 약한 ETag로 바꾼다.
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/html", "text/csv")
+SKIPPED_STATUSES = (204, 206, 304)
+
+
+def encodings():
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(accept):
+    """werkzeug Accept(request.accept_encodings 등)에서 고른 인코딩, 압축하지 않으면 None"""
+    encoding = accept.best_match(encodings() + ("identity",), default="identity")
+    return None if encoding == "identity" else encoding
+
+
+def compress(body, encoding, gzip_level=6, brotli_quality=4):
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+def chunk_compressor(encoding, gzip_level=6, brotli_quality=4):
+    """(청크를 압축해서 지금까지의 출력을 돌려주는 함수, 끝부분을 돌려주는 함수)"""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=brotli_quality)
+        return (lambda chunk: compressor.process(chunk) + compressor.flush()), compressor.finish
+    compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)  # wbits 31 = gzip 헤더
+    return (lambda chunk: compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)), compressor.flush
+
+
+def compress_chunks(chunks, encoding, gzip_level=6, brotli_quality=4):
+    compress_chunk, finish = chunk_compressor(encoding, gzip_level, brotli_quality)
+    try:
+        for chunk in chunks:
+            if chunk:
+                yield compress_chunk(chunk.encode() if isinstance(chunk, str) else chunk)
+        yield finish()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+async def compress_async_chunks(chunks, encoding, gzip_level=6, brotli_quality=4):
+    compress_chunk, finish = chunk_compressor(encoding, gzip_level, brotli_quality)
+    async for chunk in chunks:
+        if chunk:
+            yield compress_chunk(chunk.encode() if isinstance(chunk, str) else chunk)
+    yield finish()
+
+
+def compressible(status, mimetype, headers):
+    return (200 <= status < 300 and status not in SKIPPED_STATUSES
+            and mimetype in COMPRESSIBLE_TYPES and "Content-Encoding" not in headers)
+
+
+def cached_body(entry, accept, min_bytes=1024, gzip_level=6, brotli_quality=4):
+    """응답 캐시 항목(CachedResponse)의 (본문, 인코딩, Vary 필요 여부)
+
+    압축본은 항목에 저장해 두고 다시 쓴다 (캐시 적중마다 다시 압축하지 않음).
+    """
+    if (gzip_level <= 0 or len(entry.body) < min_bytes
+            or not compressible(entry.status, entry.mimetype, dict(entry.headers))):
+        return entry.body, None, False
+    encoding = negotiate(accept)
+    if encoding is None:
+        return entry.body, None, True
+    body = entry.encoded.get(encoding)
+    if body is None:
+        body = entry.encoded[encoding] = compress(entry.body, encoding, gzip_level, brotli_quality)
+    return body, encoding, True
+
+
+def init_flask(app, min_bytes=1024, gzip_level=6, brotli_quality=4):
+    """Flask 응답 압축 훅 등록"""
+    from flask import request
+
+    @app.after_request
+    def compress_response(response):
+        if response.direct_passthrough or not compressible(response.status_code, response.mimetype, response.headers):
+            return response
+        if response.is_streamed:
+            response.vary.add("Accept-Encoding")
+            encoding = negotiate(request.accept_encodings)
+            if encoding is not None:
+                response.response = compress_chunks(response.response, encoding, gzip_level, brotli_quality)
+                response.headers["Content-Encoding"] = encoding
+                response.headers.pop("Content-Length", None)
+            return response
+        body = response.get_data()
+        if len(body) < min_bytes:
+            return response
+        response.vary.add("Accept-Encoding")
+        encoding = negotiate(request.accept_encodings)
+        if encoding is None:
+            return response
+        response.set_data(compress(body, encoding, gzip_level, brotli_quality))
+        response.headers["Content-Encoding"] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
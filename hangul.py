@@ -0,0 +1,53 @@
+import unicodedata
+
+# ─────────────────────────────────────────────
+# 📌 한글 처리 유틸리티 (정규화, 초성 추출)
+# ─────────────────────────────────────────────
+
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+JUNGSEONG_COUNT = 21
+JONGSEONG_COUNT = 28
+
+# 초성 19자 (호환용 자모, 사용자가 키보드로 입력하는 문자)
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+CHOSEONG_SET = frozenset(CHOSEONG)
+# 완성형 음절 11,172자 -> 초성 (str.translate 용)
+SYLLABLE_CHOSEONG = {code: CHOSEONG[(code - HANGUL_BASE) // (JUNGSEONG_COUNT * JONGSEONG_COUNT)]
+                     for code in range(HANGUL_BASE, HANGUL_LAST + 1)}
+
+
+def is_syllable(char):
+    return HANGUL_BASE <= ord(char) <= HANGUL_LAST
+
+
+def choseong_of(char):
+    # 완성형 음절이면 초성, 아니면 그대로 반환
+    if is_syllable(char):
+        return CHOSEONG[(ord(char) - HANGUL_BASE) // (JUNGSEONG_COUNT * JONGSEONG_COUNT)]
+    return char
+
+
+def normalize(text):
+    # NFKC는 호환용 자모(ㄱ)를 조합용 자모로 바꾸므로 NFC + casefold만 적용
+    return unicodedata.normalize("NFC", text or "").casefold().strip()
+
+
+def to_choseong(text):
+    """'스타벅스 강남점' -> 'ㅅㅌㅂㅅ ㄱㄴㅈ' (한글 이외 문자는 그대로 유지)"""
+    return normalize(text).translate(SYLLABLE_CHOSEONG)
+
+
+def is_choseong_query(text):
+    # 초성만 입력했거나 마지막 음절 대신 자음을 입력한 경우 ('강ㄴ')
+    text = normalize(text)
+    return bool(text) and any(char in CHOSEONG_SET for char in text) and all(
+        char in CHOSEONG_SET or is_syllable(char) for char in text if not char.isspace()
+    )
+
+
+def matches_prefix(text, query):
+    """정규화된 text가 query로 시작하는지 (query의 초성 자리는 text 음절의 초성과 비교, '스ㅌ' -> '스타벅스')"""
+    if len(query) > len(text):
+        return False
+    return all(t == q or (q in CHOSEONG_SET and choseong_of(t) == q) for t, q in zip(text, query))
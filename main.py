@@ -1,15 +1,41 @@
-import random
 import os
+import json
+import math
+import atexit
+import mimetypes
+import base64
+from types import SimpleNamespace
+from functools import wraps
 from dotenv import load_dotenv
 
-from flask import Flask, jsonify, request, render_template, abort, redirect, url_for, Response
+from flask import Flask, g, jsonify, request, render_template, stream_template, abort, redirect, url_for, Response, send_file, stream_with_context, after_this_request
+from markupsafe import Markup
+from werkzeug.security import safe_join
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy import Integer, String, Boolean
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, validates
+from sqlalchemy import Integer, String, Boolean, Float, select, update, bindparam, union_all, literal, func, and_, or_, inspect as sa_inspect
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from datetime import datetime
-from flask_migrate import Migrate
-from flasgger import Swagger
-from flasgger.utils import swag_from
+import click
+
+from cafe_index import AMENITIES, CafeIdIndex, bits_from_ids, ids_from_bits
+from cafe_suggest import SuggestIndex
+from update_queue import GroupCommitWriter, QueueFull, QUEUED, STORED
+from admission import AdmissionControl, Rule, TokenBucketStore, RATE_LIMITED
+from cafe_thumbs import ThumbnailCache, ThumbnailError
+import search_index
+from response_cache import CACHED_HEADERS, ResponseCache
+from cafe_serializer import FragmentStore, ListBodyCache, join_fragments
+from cafe_parsing import parse_price, parse_seats
+import cafe_bulk
+import cafe_geo
+import cafe_duplicates
+import cafe_rows
+import sqlite_profile
+import metrics
+import compression
+import static_assets
+from api_docs import LazyDocs, swag_from
 
 # ─────────────────────────────────────────────
 # 📌 1. 환경 변수 설정 및 초기화
@@ -30,27 +56,124 @@ if not ADMIN_DOCS_PASSWORD:
     print("⚠️ WARNING: SWAGGER 관리자 비번이 설정되지 않았습니다! 기본값이 사용됩니다.")
     ADMIN_DOCS_PASSWORD = "password"
 
+# DB 엔진 프로파일 (development: 쿼리 로그 출력 / production: WAL, 읽기·쓰기 풀 분리)
+DB_PROFILE = os.getenv("DB_PROFILE", "development")
+
+# 목록 API 페이지네이션 / 스트리밍 설정
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 500
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", 500))
+
+# 대량 가져오기 배치 크기 (배치마다 한 트랜잭션)
+BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", 500))
+
+# 수정 요청 일괄 처리 최대 개수
+MAX_BATCH_ACTIONS = 1000
+
+# 주변 카페 검색 반경(m) / 개수 기본값과 최대값
+DEFAULT_NEARBY_RADIUS_M = 1000
+MAX_NEARBY_RADIUS_M = 50000
+DEFAULT_NEARBY_K = 10
+MAX_NEARBY_K = 100
+
+# 자동 완성 결과 개수 기본값과 최대값 / 다른 워커의 변경을 읽어 오는 간격(초)
+DEFAULT_SUGGEST_LIMIT = 10
+MAX_SUGGEST_LIMIT = 50
+SUGGEST_REFRESH_SECONDS = float(os.getenv("SUGGEST_REFRESH_SECONDS", 5))
+
+# 유사 중복 카페 결과 개수 기본값과 최대값 / 이 점수(0~1) 이상만 중복 후보로 반환
+DEFAULT_DUPLICATE_LIMIT = 10
+MAX_DUPLICATE_LIMIT = 50
+DUPLICATE_MIN_SCORE = float(os.getenv("DUPLICATE_MIN_SCORE", 0.6))
+
+# 카페 썸네일 (만드는 너비 / 기본 너비, 디스크 캐시 위치와 최대 크기(MB), 원본 가져오기 제한 시간(초) / 최대 크기(MB),
+# 원본을 다시 가져오는 주기(초), 브라우저 캐시 시간(초, ?v=가 현재 카페 버전과 같으면 immutable로 1년))
+THUMB_WIDTHS = (160, 320, 640)
+DEFAULT_THUMB_WIDTH = 320
+THUMB_CACHE_DIR = os.getenv("THUMB_CACHE_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "instance", "thumbs")
+THUMB_CACHE_MAX_MB = int(os.getenv("THUMB_CACHE_MAX_MB", 256))
+THUMB_FETCH_TIMEOUT = float(os.getenv("THUMB_FETCH_TIMEOUT", 5))
+THUMB_MAX_SOURCE_MB = int(os.getenv("THUMB_MAX_SOURCE_MB", 10))
+THUMB_REFRESH_SECONDS = int(os.getenv("THUMB_REFRESH_SECONDS", 7 * 86400))
+THUMB_MAX_AGE = 3600
+THUMB_IMMUTABLE_MAX_AGE = 365 * 86400
+
+# 랜덤 카페 추천 최대 개수
+MAX_RANDOM_SAMPLES = 50
+
+# 공개 수정 요청 그룹 커밋 큐 (UPDATE_QUEUE_SIZE가 0이면 끄고 요청마다 바로 커밋)
+# 배치 크기 / 첫 요청 후 기다리는 시간(ms) / 큐가 가득 찼을 때 자리를 기다리는 시간(ms) / 종료 시 남은 요청을 넣는 최대 시간(초)
+UPDATE_QUEUE_SIZE = int(os.getenv("UPDATE_QUEUE_SIZE", 0))
+UPDATE_BATCH_SIZE = int(os.getenv("UPDATE_BATCH_SIZE", 100))
+UPDATE_FLUSH_MS = float(os.getenv("UPDATE_FLUSH_MS", 20))
+UPDATE_QUEUE_WAIT_MS = float(os.getenv("UPDATE_QUEUE_WAIT_MS", 100))
+UPDATE_DRAIN_SECONDS = float(os.getenv("UPDATE_DRAIN_SECONDS", 30))
+
+# 요청 허용 제어 (클라이언트 + 엔드포인트별 토큰 버킷, 비싼 엔드포인트의 워커당 동시 실행 상한)
+# RATE_LIMIT_RPS가 0이면 토큰 버킷을 끄고, EXPENSIVE_* 가 0이면 일반 값을 그대로 씀 / 동시 실행 상한은 0이면 끔
+# 버킷은 RATE_LIMIT_DB_PATH의 SQLite 파일로 같은 머신의 워커끼리 공유 / 프록시 뒤라면 RATE_LIMIT_CLIENT_HEADER=X-Forwarded-For
+RATE_LIMIT_RPS = float(os.getenv("RATE_LIMIT_RPS", 0))
+RATE_LIMIT_BURST = max(1, int(os.getenv("RATE_LIMIT_BURST", 20)))
+EXPENSIVE_RATE_LIMIT_RPS = float(os.getenv("EXPENSIVE_RATE_LIMIT_RPS", 0))
+EXPENSIVE_RATE_LIMIT_BURST = max(1, int(os.getenv("EXPENSIVE_RATE_LIMIT_BURST", RATE_LIMIT_BURST)))
+EXPENSIVE_MAX_CONCURRENCY = int(os.getenv("EXPENSIVE_MAX_CONCURRENCY", 0))
+RATE_LIMIT_DB_PATH = os.getenv("RATE_LIMIT_DB_PATH") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "instance", "ratelimit.db")
+RATE_LIMIT_CLIENT_HEADER = os.getenv("RATE_LIMIT_CLIENT_HEADER")
+
+# 전체 / 큰 범위를 읽는 엔드포인트 (따로 정한 토큰 버킷과 동시 실행 상한 적용)
+EXPENSIVE_ENDPOINTS = ("get_all_cafes", "get_random_cafe", "get_cafe_facets", "get_nearby_cafes",
+                       "search_cafes_by_location", "search_cafes", "find_duplicate_cafes", "export_cafes")
+# 허용 제어를 하지 않는 엔드포인트 (정적 파일, 카드마다 요청하는 썸네일, API 문서, 메트릭 수집)
+ADMISSION_EXEMPT = ("static", "get_built_asset", "get_cafe_thumbnail", "apidocs", "apispec", "get_metrics")
+
+# 응답 압축 (JSON / HTML 응답이 COMPRESS_MIN_BYTES 이상이면 Accept-Encoding에 맞춰 br / gzip, COMPRESS_LEVEL이 0이면 끔)
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", 1024))
+COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", 6))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", 4))
+
+# 지문이 붙은 정적 파일(flask build-assets)의 브라우저 캐시 시간(초)
+ASSET_MAX_AGE = 365 * 86400
+
+# 읽기 API 응답 캐시 설정
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 256))
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", 300))
+# 워커마다 메모리에 둘 카페 JSON 조각 / 카드 HTML 조각의 최대 개수 (넘으면 오래 쓰지 않은 것부터 지움)
+FRAGMENT_CACHE_MAX_ENTRIES = int(os.getenv("FRAGMENT_CACHE_MAX_ENTRIES", 20000))
+# 전체 목록(GET /cafes)을 메모리에 미리 만들어 둘 최대 카페 수 (넘으면 스트리밍, 0이면 항상 스트리밍)
+LIST_BODY_MAX_ROWS = int(os.getenv("LIST_BODY_MAX_ROWS", 5000))
+
 # ─────────────────────────────────────────────
 # 📌 2. Flask 애플리케이션 및 데이터베이스 설정
 # ─────────────────────────────────────────────
 
 
 app = Flask(__name__)
-print("Database file path:", os.path.abspath("cafes.db"))
 
 # DB 생성하기
 class Base(DeclarativeBase):
     pass
 
-# DB 연결하기
-db_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "instance", "cafes.db")
-app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{db_path}"
-app.config['SQLALCHEMY_ECHO'] = True  # SQLAlchemy 쿼리 로그 활성화
-db = SQLAlchemy(model_class=Base)
+# DB 연결하기 (DB_PROFILE=production 이면 WAL + 읽기 / 쓰기 커넥션 풀 분리)
+db_path = os.getenv("CAFE_DB_PATH") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "instance", "cafes.db")
+sqlite_profile.configure(app, f"sqlite:///{db_path}", DB_PROFILE)
+db = SQLAlchemy(model_class=Base, session_options={"class_": sqlite_profile.RoutingSession})
 db.init_app(app)
+with app.app_context():
+    sqlite_profile.install(db, DB_PROFILE)
+    # 읽기 / 쓰기 엔진 모두 SQL 실행 횟수 / 시간 계측
+    for engine in db.engines.values():
+        metrics.instrument_engine(engine)
+
+# Flask-Migrate 설정 (FTS5 등 가상 테이블 / 중복 검사 색인 테이블은 autogenerate 대상에서 제외)
+# alembic import가 무거워서 flask 명령(flask db ...)으로 실행될 때만 create_app()에서 등록
+VIRTUAL_TABLE_PREFIXES = (search_index.SEARCH_TABLE, cafe_geo.GEO_TABLE, cafe_duplicates.DEDUPE_TABLE)
+
+def include_object(object, name, type_, reflected, compare_to):
+    return not (type_ == "table" and name.startswith(VIRTUAL_TABLE_PREFIXES))
 
-# Flask-Migrate 설정 추가
-migrate = Migrate(app, db)
+def init_migrate(app):
+    from flask_migrate import Migrate
+    Migrate(app, db, include_object=include_object)
 
 # API SWAGGER 초기화
 app.config["SWAGGER"] = {
@@ -78,7 +201,11 @@ swagger_template = {
                         "can_take_calls": {"type": "boolean", "example": True}
                     }
                 },
-                "coffee_price": {"type": "string", "example": "₩4,500"}
+                "coffee_price": {"type": "string", "example": "₩4,500"},
+                "lat": {"type": "number", "example": 37.5563},
+                "lng": {"type": "number", "example": 126.9220},
+                "version": {"type": "integer", "example": 42, "description": "변경 피드 순번 (바뀔 때마다 커짐)"},
+                "updated_at": {"type": "string", "example": "2025-03-01T09:30:00.000000"}
             }
         },
         "UpdateRequest": {
@@ -95,7 +222,16 @@ swagger_template = {
     }
 }
 
-swagger = Swagger(app, template=swagger_template)
+# 스펙은 /apidocs, /apispec_1.json 첫 요청 때 만든다 (APISPEC_FILE이 있으면 그 파일 사용)
+api_docs = LazyDocs(swagger_template, os.getenv("APISPEC_FILE"))
+
+# 지문이 붙은 정적 파일 manifest (flask build-assets로 생성)
+asset_manifest = static_assets.AssetManifest(app.static_folder)
+
+# 템플릿의 정적 파일 주소 (빌드된 파일이 있으면 지문이 붙은 주소, 없으면 원래 파일)
+@app.template_global()
+def asset_url(filename):
+    return url_for("static", filename=asset_manifest.get(filename) or filename)
 
 # ─────────────────────────────────────────────
 # 📌 3. 데이터 모델 정의 (Cafe, UpdateRequest)
@@ -114,11 +250,40 @@ class Cafe(db.Model):
     has_sockets: Mapped[bool] = mapped_column(Boolean, default=False)
     can_take_calls: Mapped[bool] = mapped_column(Boolean, default=False)
     coffee_price: Mapped[str] = mapped_column(String(250), nullable=True)
+    # 정렬 / 범위 검색용 숫자 컬럼 (coffee_price, seats 가 바뀔 때 자동으로 채워짐, 가격은 원화 표기일 때만)
+    coffee_price_value: Mapped[float] = mapped_column(Float, nullable=True, index=True)
+    seats_min: Mapped[int] = mapped_column(Integer, nullable=True, index=True)
+    # 좌표 (map_url이 바뀔 때 URL에서 찾을 수 있으면 자동으로 채워지고 없으면 비워짐, 직접 지정도 가능)
+    lat: Mapped[float] = mapped_column(Float, nullable=True)
+    lng: Mapped[float] = mapped_column(Float, nullable=True)
+    # 변경 피드 순번 (추가 / 수정될 때마다 change_sequence에서 새 번호를 받음) / 마지막 변경 시각
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, index=True)
+    updated_at: Mapped[str] = mapped_column(String(250), nullable=True)
+
+    @validates("map_url")
+    def _parse_map_url(self, key, value):
+        # 새 URL에 좌표가 없으면 이전 URL의 좌표를 지움 (직접 지정한 좌표는 호출자가 URL 다음에 설정)
+        coordinates = cafe_geo.parse_coordinates(value)
+        if coordinates:
+            self.lat, self.lng = coordinates
+        elif value != self.map_url:
+            self.lat = self.lng = None
+        return value
+
+    @validates("coffee_price")
+    def _parse_coffee_price(self, key, value):
+        self.coffee_price_value = parse_price(value)
+        return value
+
+    @validates("seats")
+    def _parse_seats(self, key, value):
+        self.seats_min = parse_seats(value)
+        return value
 
 # 카페 수정 요청 테이블 정의하기
 class UpdateRequest(db.Model):
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    cafe_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    cafe_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
     proposed_name: Mapped[str] = mapped_column(String(250), nullable=True)
     proposed_location: Mapped[str] = mapped_column(String(250), nullable=True)
     proposed_coffee_price: Mapped[str] = mapped_column(String(250), nullable=True)
@@ -129,12 +294,42 @@ class UpdateRequest(db.Model):
     proposed_has_wifi: Mapped[bool] = mapped_column(Boolean, nullable=True)
     proposed_has_sockets: Mapped[bool] = mapped_column(Boolean, nullable=True)
     proposed_can_take_calls: Mapped[bool] = mapped_column(Boolean, nullable=True)
-    status: Mapped[str] = mapped_column(String(50), default="pending")  # pending, approved, rejected
-    created_at: Mapped[str] = mapped_column(String(250), nullable=False, default=datetime.utcnow().isoformat)
+    proposed_lat: Mapped[float] = mapped_column(Float, nullable=True)
+    proposed_lng: Mapped[float] = mapped_column(Float, nullable=True)
+    # pending, approved, rejected (처리된 요청도 삭제하지 않고 상태만 바꿔 둠 -> 접수 번호로 결과 조회)
+    status: Mapped[str] = mapped_column(String(50), default="pending", index=True)
+    created_at: Mapped[str] = mapped_column(String(250), nullable=False, default=lambda: datetime.utcnow().isoformat())
+    # 그룹 커밋 큐로 접수된 요청의 접수 번호 (상태 조회 URL에 사용, 바로 커밋된 요청은 없음)
+    ticket: Mapped[str] = mapped_column(String(32), nullable=True, unique=True, index=True)
+
+# 삭제된 카페 기록 (변경 피드가 삭제를 알려주기 위해 남겨 둠)
+class CafeTombstone(db.Model):
+    __tablename__ = "cafe_tombstone"
+    cafe_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    deleted_at: Mapped[str] = mapped_column(String(250), nullable=False)
+
+# 변경 피드 순번 카운터 (id=1 한 행, 쓰기 트랜잭션 안에서 증가시키므로 커밋 순서대로 번호가 커짐)
+class ChangeSequence(db.Model):
+    __tablename__ = "change_sequence"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    value: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
 
-# 테이블 시작시
-with app.app_context():
+# 변경 피드 카운터 행 만들기 (없을 때만, 이미 있는 가장 큰 버전에서 시작)
+def ensure_change_sequence():
+    latest = max(db.session.scalar(select(func.max(Cafe.version))) or 0,
+                 db.session.scalar(select(func.max(CafeTombstone.version))) or 0)
+    db.session.execute(sqlite_insert(ChangeSequence.__table__).values(id=1, value=latest).on_conflict_do_nothing())
+
+# 테이블 생성 (검색 / 좌표 / 중복 검사 인덱스 포함, 인덱스가 어긋나 있으면 다시 색인)
+# 워커 시작마다 하지 않고 flask init-db 또는 flask db upgrade로 한 번 실행한다.
+def init_db():
     db.create_all()
+    ensure_change_sequence()
+    search_index.ensure_search_table(db.session)
+    cafe_geo.ensure_geo_table(db.session)
+    cafe_duplicates.ensure_dedupe_table(db.session)
+    db.session.commit()
 
 ## 디버깅용
 # with app.app_context():
@@ -175,14 +370,273 @@ def cafe_to_dict(cafe):
             "has_sockets": cafe.has_sockets,
             "can_take_calls": cafe.can_take_calls
         },
-        "coffee_price": cafe.coffee_price
+        "coffee_price": cafe.coffee_price,
+        "lat": cafe.lat,
+        "lng": cafe.lng,
+        "version": cafe.version,
+        "updated_at": cafe.updated_at
     }
 
+# 홈 화면 카페 카드 HTML (static/js/script.js의 generateCafeCards와 같은 마크업)
+def render_cafe_card(data):
+    return Markup(render_template("partials/cafe_card.html", cafe=data))
+
+# 조회 라우트용 카페 행 select (ORM 인스턴스 대신 cafe_rows.CafeRow로 받음, 문장은 한 번만 만들어 둠)
+CAFE_ROWS = select(*cafe_rows.columns(Cafe.__table__))
+CAFE_ROWS_BY_IDS = CAFE_ROWS.where(Cafe.id.in_(bindparam("ids", expanding=True)))
+CAFE_ROWS_AFTER = CAFE_ROWS.where(Cafe.id > bindparam("after")).order_by(Cafe.id)
+CAFE_ROWS_PAGE = CAFE_ROWS_AFTER.limit(bindparam("limit"))
+CAFE_ROWS_STREAM = CAFE_ROWS_AFTER.execution_options(yield_per=STREAM_BATCH_SIZE)
+
+# 세션의 트랜잭션 안에서 Core로 실행 (ORM 실행 단계 / identity map을 거치지 않음)
+def execute_cafe_rows(stmt, params):
+    return cafe_rows.from_result(db.session.connection().execute(stmt, params))
+
+# id 순서로 카페를 서버 측 커서에서 배치 단위로 꺼내기 (전체 테이블을 메모리에 올리지 않음)
+def iter_cafes(after=0):
+    yield from execute_cafe_rows(CAFE_ROWS_STREAM, {"after": after})
+
+# id 목록에 해당하는 카페를 한 번의 IN 쿼리로 조회 (순서 보장 없음)
+def load_cafes_by_ids(ids):
+    return list(execute_cafe_rows(CAFE_ROWS_BY_IDS, {"ids": list(ids)}))
+
+# 미리 인코딩된 카페 조각을 이어 붙인 JSON 응답
+def json_body_response(body, status=200):
+    return Response(body, status=status, mimetype="application/json")
+
+def cafes_response(cafes):
+    return json_body_response(join_fragments([fragment_store.fragment(cafe) for cafe in cafes]))
+
+def cafes_response_for_ids(ids):
+    return json_body_response(join_fragments(fragment_store.fragments_for_ids(ids, load_cafes_by_ids)))
+
+# id 목록의 카페 조각을 배치 단위로 꺼내기
+def iter_fragments_for_ids(ids):
+    for start in range(0, len(ids), STREAM_BATCH_SIZE):
+        yield from fragment_store.fragments_for_ids(ids[start:start + STREAM_BATCH_SIZE], load_cafes_by_ids)
+
+# 카페 조각 이터레이터를 JSON 배열 / NDJSON 청크로 변환
+def generate_cafe_chunks(fragments, fmt="json"):
+    separator = b"\n" if fmt == "ndjson" else b","
+    if fmt == "json":
+        yield b"["
+    buffer = []
+    first = True
+    for fragment in fragments:
+        if fmt == "ndjson":
+            buffer.append(fragment + separator)
+        else:
+            buffer.append(fragment if first else separator + fragment)
+            first = False
+        if len(buffer) >= STREAM_BATCH_SIZE:
+            yield b"".join(buffer)
+            buffer = []
+    if buffer:
+        yield b"".join(buffer)
+    if fmt == "json":
+        yield b"]"
+
+# 전체 목록 본문 생성 (id만 조회하고 카페 조각은 캐시에서 가져옴), LIST_BODY_MAX_ROWS보다 많으면 None
+def build_cafe_list_body():
+    ids = db.session.scalars(select(Cafe.id).order_by(Cafe.id).limit(LIST_BODY_MAX_ROWS + 1)).all()
+    if len(ids) > LIST_BODY_MAX_ROWS:
+        return None
+    return join_fragments(list(iter_fragments_for_ids(ids)))
+
+# 전체 목록 응답: 작은 카탈로그는 미리 만든 본문 / 압축본, 크면 서버 측 커서에서 읽으면서 스트리밍
+def cafe_list_response(version):
+    bodies = list_body_cache.get(version, build_cafe_list_body)
+    if not bodies:
+        return stream_cafes(fragment_store.fragment(cafe) for cafe in iter_cafes())
+    if bodies["identity"] == b"[]":
+        return jsonify({"error": "No cafes found"}), 404
+    return precompressed_list_response(bodies), 200
+
+# Accept-Encoding에 맞는 미리 압축된 전체 목록 응답
+def precompressed_list_response(bodies):
+    encoding = request.accept_encodings.best_match(list_body_cache.encodings + ("identity",), default="identity")
+    response = json_body_response(bodies.get(encoding, bodies["identity"]))
+    if encoding in bodies and encoding != "identity":
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    return response
+
+# 스트리밍 응답 생성 (요청 컨텍스트를 유지한 채로 청크 전송)
+def stream_cafes(fragments, fmt="json"):
+    mimetype = "application/x-ndjson" if fmt == "ndjson" else "application/json"
+    return Response(stream_with_context(generate_cafe_chunks(fragments, fmt)), mimetype=mimetype)
+
+# limit 파라미터 검증 (없으면 None, 범위를 벗어나면 최대값으로 제한)
+# args를 넘기지 않으면 현재 Flask 요청의 쿼리 파라미터 사용 (ASGI 읽기 API와 공유)
+def parse_page_limit(args=None):
+    args = request.args if args is None else args
+    limit = args.get("limit", type=int)
+    if limit is None:
+        return DEFAULT_PAGE_LIMIT if "after" in args else None
+    return max(1, min(limit, MAX_PAGE_LIMIT))
+
+# after 파라미터 (이 id 다음부터), 없거나 음수면 0 (id는 1부터 시작)
+def parse_after(args=None):
+    args = request.args if args is None else args
+    return max(0, args.get("after", default=0, type=int))
+
+# after(id 키셋)는 정렬 / 범위 모드와 함께 쓸 수 없음 (그 모드의 다음 페이지는 Link 헤더의 cursor), 함께 오면 ValueError
+def check_after_mode(args, ranges, sort, cursor):
+    if "after" in args and (ranges or sort or cursor):
+        raise ValueError("after cannot be combined with sort, cursor or min_price/max_price/min_seats "
+                         "(follow the cursor in the Link header)")
+
+# 다음 페이지 링크를 Link 헤더로 추가 (RFC 8288)
+def add_next_link(response, endpoint, **params):
+    next_url = url_for(endpoint, **{**request.view_args, **request.args.to_dict(), **params})
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
+    return response
+
+# 편의시설 + 위치 조건에 맞는 카페 id 비트셋 (인메모리 비트셋 AND, 위치는 검색 인덱스 사용)
+def filtered_cafe_bits(filters, location=None):
+    sync_cafe_index()
+    restrict = None
+    if location:
+        matches = search_index.match_subquery(location, columns=("location",))
+        restrict = bits_from_ids(db.session.scalars(select(Cafe.id).where(Cafe.id.in_(matches)))) if matches is not None else 0
+    return cafe_index.filter_bits(filters, restrict)
+
+# 정렬 기준 (sort 파라미터 -> 컬럼), 앞에 '-'를 붙이면 내림차순
+SORT_COLUMNS = {"id": Cafe.id, "name": Cafe.name, "price": Cafe.coffee_price_value, "seats": Cafe.seats_min}
+
+# 가격 / 좌석 범위 조건 파싱 (?min_price=3000&max_price=5000&min_seats=30), 숫자가 아니면 ValueError
+def parse_range_filters(args=None):
+    args = request.args if args is None else args
+    ranges = {}
+    for name, cast in (("min_price", float), ("max_price", float), ("min_seats", int)):
+        value = args.get(name)
+        if not value:
+            continue
+        try:
+            ranges[name] = cast(value)
+        except ValueError:
+            raise ValueError(f"{name} must be a number")
+    return ranges
+
+# sort 파라미터 검증, 잘못된 값이면 ValueError
+def parse_sort(args=None):
+    sort = (request.args if args is None else args).get("sort")
+    if sort is not None and sort.lstrip("-") not in SORT_COLUMNS:
+        raise ValueError(f"sort must be one of {', '.join(SORT_COLUMNS)} (prefix '-' for descending)")
+    return sort
+
+# 정렬 키셋 커서 ([정렬 값, id]를 URL-safe base64로 인코딩)
+def encode_cursor(value, cafe_id):
+    return base64.urlsafe_b64encode(json.dumps([value, cafe_id]).encode()).decode().rstrip("=")
+
+def decode_cursor(token):
+    try:
+        value, cafe_id = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        return value, int(cafe_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+# 범위 조건 / 정렬을 SQL로 처리 (숫자 컬럼 인덱스 사용). (id, 정렬 값) 행을 반환
+def query_sorted_cafe_rows(filters, location, ranges, sort, cursor=None, limit=None):
+    stmt = sorted_cafe_rows_stmt(filters, location, ranges, sort, cursor, limit)
+    return [] if stmt is None else db.session.execute(stmt).all()
+
+# query_sorted_cafe_rows의 SELECT 문 (위치 검색어에 맞는 카페가 없으면 None)
+def sorted_cafe_rows_stmt(filters, location, ranges, sort, cursor=None, limit=None):
+    descending = sort.startswith("-")
+    column = SORT_COLUMNS[sort.lstrip("-")]
+    stmt = select(Cafe.id, column)
+
+    for name, value in filters.items():
+        stmt = stmt.where(getattr(Cafe, name) == value)
+    if location:
+        matches = search_index.match_subquery(location, columns=("location",))
+        if matches is None:
+            return None
+        stmt = stmt.where(Cafe.id.in_(matches))
+    if "min_price" in ranges:
+        stmt = stmt.where(Cafe.coffee_price_value >= ranges["min_price"])
+    if "max_price" in ranges:
+        stmt = stmt.where(Cafe.coffee_price_value <= ranges["max_price"])
+    if "min_seats" in ranges:
+        stmt = stmt.where(Cafe.seats_min >= ranges["min_seats"])
+
+    # 키셋: 값을 알 수 없는(NULL) 카페는 항상 마지막, 같은 값이면 id 오름차순
+    if column is Cafe.id:
+        if cursor is not None:
+            stmt = stmt.where(Cafe.id < cursor[1] if descending else Cafe.id > cursor[1])
+        stmt = stmt.order_by(Cafe.id.desc() if descending else Cafe.id)
+    else:
+        if cursor is not None:
+            value, last_id = cursor
+            if value is None:
+                stmt = stmt.where(column.is_(None), Cafe.id > last_id)
+            else:
+                beyond = column < value if descending else column > value
+                stmt = stmt.where(or_(beyond, and_(column == value, Cafe.id > last_id), column.is_(None)))
+        stmt = stmt.order_by((column.desc() if descending else column.asc()).nulls_last(), Cafe.id)
+
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+# 편의시설 필터 파싱 (?has_wifi=1&has_sockets=0), 잘못된 값이면 ValueError
+def parse_amenity_filters(args=None):
+    args = request.args if args is None else args
+    filters = {}
+    for name in AMENITIES:
+        value = args.get(name)
+        if value is None:
+            continue
+        if value.lower() in ("1", "true"):
+            filters[name] = True
+        elif value.lower() in ("0", "false"):
+            filters[name] = False
+        else:
+            raise ValueError(f"{name} must be 1/0 or true/false")
+    return filters
+
+# 읽기 API 캐시 데코레이터 (If-None-Match가 현재 ETag와 같으면 변경 피드 순번 한 행만 읽고 304)
+# ETag는 DB의 순번으로 만들고 워커끼리 같은 값을 쓴다. 순번이 앞서 있으면 sync_catalog가 바뀐 카페의 조각을 먼저 지운다.
+# 압축본마다 본문이 다르므로 약한(weak) ETag 사용
+def cached_read(view):
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        version = sync_catalog()
+        etag = response_cache.etag(version)
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+            response.set_etag(etag, weak=True)
+            return response
+
+        key = (request.endpoint, request.path, tuple(sorted(request.args.items(multi=True))))
+        entry = response_cache.get(key)
+        if entry is not None:
+            body, encoding, vary = compression.cached_body(entry, request.accept_encodings, COMPRESS_MIN_BYTES,
+                                                           COMPRESS_LEVEL, BROTLI_QUALITY)
+            response = Response(body, status=entry.status, mimetype=entry.mimetype, headers=entry.headers)
+            if encoding is not None:
+                response.headers["Content-Encoding"] = encoding
+            if vary:
+                response.vary.add("Accept-Encoding")
+        else:
+            response = app.make_response(view(*args, **kwargs))
+            # 스트리밍 응답과 헤더에 따라 달라지는(Vary) 응답은 저장하지 않음 (ETag / 304만 적용)
+            if response.status_code in (200, 404) and not response.is_streamed and "Vary" not in response.headers:
+                response_cache.put(key, version, response.status_code, response.get_data(), response.mimetype,
+                                   [(name, response.headers[name]) for name in CACHED_HEADERS if name in response.headers])
+
+        if response.status_code == 200:
+            response.set_etag(etag, weak=True)
+        return response
+    return wrapper
+
 #  관리자 페이지 접근 권한 확인 함수
 def is_admin():
-    auth_header = request.headers.get('Authorization')
-    cookie_token = request.cookies.get('admin_token')
+    return is_admin_token(request.headers.get('Authorization'), request.cookies.get('admin_token'))
 
+# Authorization 헤더 / admin_token 쿠키 값으로 관리자 확인 (ASGI 핸들러에서도 사용)
+def is_admin_token(auth_header, cookie_token):
     if auth_header and auth_header.startswith("Bearer "):
         token = auth_header.split(" ")[1].strip()
         if token == ADMIN_TOKEN:
@@ -200,14 +654,350 @@ def require_admin():
             abort(403, description="관리자 권한이 없습니다.")
         return redirect(url_for("login_page"))
 
+# ─────────────────────────────────────────────
+# 📌 4-1. 인메모리 인덱스 (쓰기 라우트에서 갱신)
+# ─────────────────────────────────────────────
+
+cafe_index = CafeIdIndex()
+response_cache = ResponseCache(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS)
+fragment_store = FragmentStore(cafe_to_dict, ttl=CACHE_TTL_SECONDS, max_entries=FRAGMENT_CACHE_MAX_ENTRIES)
+card_store = FragmentStore(cafe_to_dict, ttl=CACHE_TTL_SECONDS, max_entries=FRAGMENT_CACHE_MAX_ENTRIES,
+                           encode=render_cafe_card)
+list_body_cache = ListBodyCache(ttl=CACHE_TTL_SECONDS)
+suggest_index = SuggestIndex(refresh_seconds=SUGGEST_REFRESH_SECONDS)
+# 카드 썸네일 디스크 캐시 (img_url마다 원본을 한 번만 가져옴, 같은 머신의 워커끼리 공유)
+thumbnails = ThumbnailCache(THUMB_CACHE_DIR, max_bytes=THUMB_CACHE_MAX_MB << 20, fetch_timeout=THUMB_FETCH_TIMEOUT,
+                            max_source_bytes=THUMB_MAX_SOURCE_MB << 20, refresh_seconds=THUMB_REFRESH_SECONDS)
+
+def cafe_index_rows_stmt():
+    return select(Cafe.id, *(getattr(Cafe, name) for name in AMENITIES))
+
+def load_cafe_index_rows():
+    return db.session.execute(cafe_index_rows_stmt())
+
+# 자동 완성 인덱스 로더 (처음 한 번 카페 전체 / 이후 변경 피드에서 since 이후의 추가 / 수정 / 삭제)
+def load_suggest_index_rows():
+    # 전체를 한 번에 버퍼링하지 않고 나눠 읽음 (임시 행 객체가 남는 이름 문자열 사이에 흩어지지 않게)
+    stmt = select(Cafe.id, Cafe.name, Cafe.location).order_by(Cafe.id).execution_options(yield_per=MAX_PAGE_LIMIT)
+    return db.session.execute(stmt)
+
+def change_version_stmt():
+    return select(ChangeSequence.value).where(ChangeSequence.id == 1)
+
+def load_change_version():
+    return db.session.scalar(change_version_stmt())
+
+# 변경 피드에서 since 이후에 바뀐 카페의 [(id, columns 값 tuple)]과 마지막 순번
+# 삭제된 카페(조회 사이에 삭제된 카페 포함)는 None -> 조회 사이의 삭제는 뒤 순번의 삭제 기록으로도 다시 전달됨
+def load_changed_cafes(since, *columns):
+    rows = db.session.execute(cafe_changes_stmt(since)).all()
+    ids = [row.cafe_id for row in rows if not row.deleted]
+    current = {}
+    for start in range(0, len(ids), MAX_PAGE_LIMIT):
+        stmt = select(Cafe.id, *columns).where(Cafe.id.in_(ids[start:start + MAX_PAGE_LIMIT]))
+        current.update((row[0], tuple(row[1:])) for row in db.session.execute(stmt))
+    return [(row.cafe_id, current.get(row.cafe_id)) for row in rows], rows[-1].seq if rows else since
+
+def load_suggest_changes(since):
+    changes, version = load_changed_cafes(since, Cafe.name, Cafe.location)
+    return [(cafe_id, *(values or (None, None))) for cafe_id, values in changes], version
+
+def load_cafe_index_changes(since):
+    changes, _ = load_changed_cafes(since, *(getattr(Cafe, name) for name in AMENITIES))
+    return cafe_index_changes(changes)
+
+# (id, 편의시설 값 tuple 또는 None) -> (id, 편의시설 dict 또는 None) (ASGI 쪽과 공유)
+def cafe_index_changes(changes):
+    return [(cafe_id, None if values is None else dict(zip(AMENITIES, values))) for cafe_id, values in changes]
+
+# 인메모리 id 인덱스 준비 (처음 한 번 전체를 읽고, 이후에는 다른 워커의 변경을 변경 피드에서 반영)
+def sync_cafe_index():
+    cafe_index.ensure_loaded(load_cafe_index_rows, load_change_version)
+    cafe_index.refresh(load_change_version, load_cafe_index_changes)
+
+# 변경 피드 행(다른 워커에서 바뀐 카페 포함)의 JSON / 카드 조각과 이전 순번의 전체 목록 본문을 지움 (ASGI 쪽과 공유)
+def drop_changed_fragments(rows):
+    for row in rows:
+        fragment_store.invalidate(row.cafe_id, row.seq)
+        card_store.invalidate(row.cafe_id, row.seq)
+    list_body_cache.clear()
+
+# 조각을 지우려면 변경 피드를 읽어야 하는지 (처음 순번을 반영하기 전에 저장된 조각이 없으면 읽지 않음)
+def fragments_may_be_stale(since):
+    return bool(since or len(fragment_store) or len(card_store))
+
+# 현재 변경 피드 순번을 읽어 응답 캐시에 반영하고 돌려줌 (카페 조각을 읽는 라우트가 먼저 호출)
+# 순번이 앞서 있으면 response_cache.sync가 그 사이에 바뀐 카페의 조각을 먼저 지운 뒤 새 순번을 반영한다
+def sync_catalog():
+    def drop_changed(since):
+        rows = db.session.execute(cafe_changes_stmt(since)) if fragments_may_be_stale(since) else ()
+        drop_changed_fragments(rows)
+
+    return response_cache.sync(load_change_version() or 0, drop_changed)
+
+# 변경 피드 순번 count개 예약 (쓰기 트랜잭션 안에서 호출), 예약한 첫 번호 반환
+def reserve_change_versions(count=1):
+    table = ChangeSequence.__table__
+    last = db.session.execute(
+        update(table).where(table.c.id == 1).values(value=table.c.value + count).returning(table.c.value)
+    ).scalar_one()
+    return last - count + 1
+
+# 카페 추가 / 수정 시 같은 트랜잭션 안에서 변경 버전 / DB 인덱스 갱신 (커밋 전 호출)
+def stage_cafe_indexes(cafe):
+    cafe.version = reserve_change_versions()
+    cafe.updated_at = datetime.utcnow().isoformat()
+    db.session.flush()  # 새 카페의 id 확보
+    search_index.index_cafe(db.session, cafe.id, cafe.name, cafe.location)
+    cafe_geo.index_point(db.session, cafe.id, cafe.lat, cafe.lng)
+    cafe_duplicates.index_cafe(db.session, cafe.id, cafe.name)
+
+# 카페 삭제 시 같은 트랜잭션 안에서 삭제 기록(tombstone) 추가 / DB 인덱스 정리 (커밋 전 호출)
+def unstage_cafe_indexes(cafe_id):
+    tombstone = {"version": reserve_change_versions(), "deleted_at": datetime.utcnow().isoformat()}
+    db.session.execute(
+        sqlite_insert(CafeTombstone.__table__).values(cafe_id=cafe_id, **tombstone)
+        .on_conflict_do_update(index_elements=["cafe_id"], set_=tombstone)
+    )
+    search_index.unindex_cafe(db.session, cafe_id)
+    cafe_geo.unindex_point(db.session, cafe_id)
+    cafe_duplicates.unindex_cafe(db.session, cafe_id)
+
+# 카페 추가 / 수정 커밋 후 인덱스 갱신 및 카탈로그 버전 증가
+def sync_cafe_indexes(cafe):
+    cafe_index.upsert(cafe.id, {name: getattr(cafe, name) for name in AMENITIES})
+    suggest_index.upsert(cafe.id, cafe.name, cafe.location)
+    fragment_store.invalidate(cafe.id, getattr(cafe, "version", None))
+    card_store.invalidate(cafe.id, getattr(cafe, "version", None))
+    response_cache.bump()
+
+# 수정 요청으로 이미지 주소가 바뀐 뒤 이전 주소의 썸네일 원본 정보를 지움 (같은 주소로 다시 승인하면 새로 가져옴)
+def forget_thumbnails(img_urls):
+    for img_url in img_urls:
+        thumbnails.forget(img_url)
+
+# 카페 삭제 커밋 후 인덱스에서 제거 및 카탈로그 버전 증가
+def drop_cafe_from_indexes(cafe_id):
+    cafe_index.remove(cafe_id)
+    suggest_index.remove(cafe_id)
+    fragment_store.invalidate(cafe_id)
+    card_store.invalidate(cafe_id)
+    response_cache.bump()
+
+# 변경 피드: 카페(추가 / 수정)와 삭제 기록을 순번 순서로 (한 문장이라 같은 스냅샷에서 읽음)
+def cafe_changes_stmt(since, limit=None):
+    upserts = select(Cafe.version.label("seq"), Cafe.id.label("cafe_id"), literal(False).label("deleted"))
+    deletes = select(CafeTombstone.version, CafeTombstone.cafe_id, literal(True))
+    stmt = union_all(upserts.where(Cafe.version > since), deletes.where(CafeTombstone.version > since)).order_by("seq")
+    return stmt if limit is None else stmt.limit(limit)
+
+# 변경 피드 응답 본문 (upsert는 캐시된 카페 조각을 그대로 이어 붙임, 버전이 다른 조각은 다시 인코딩)
+def build_changes_body(rows, next_seq, has_more):
+    versions = {row.cafe_id: row.seq for row in rows if not row.deleted}
+    fragments, missing = fragment_store.cached(list(versions), versions)
+    if missing:
+        for cafe in load_cafes_by_ids(missing):
+            fragments[cafe.id] = fragment_store.fragment(cafe)
+    changes = []
+    for row in rows:
+        if row.deleted:
+            changes.append(b'{"id":%d,"op":"delete","seq":%d}' % (row.cafe_id, row.seq))
+        elif row.cafe_id in fragments:  # 조회 사이에 삭제된 카페는 뒤 순번의 delete로 전달됨
+            changes.append(b'{"cafe":%s,"id":%d,"op":"upsert","seq":%d}' % (fragments[row.cafe_id], row.cafe_id, row.seq))
+    return b'{"changes":%s,"has_more":%s,"next":%d}' % (
+        join_fragments(changes), b"true" if has_more else b"false", next_seq
+    )
+
+# 일괄 처리 본문의 request_id 검증 (JSON 정수만, true / false는 제외)
+def is_request_id(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+# 승인된 수정 요청의 제안 값을 카페에 반영 (값이 있는 필드만)
+def apply_update_request(cafe, update_request):
+    if update_request.proposed_name:
+        cafe.name = update_request.proposed_name
+    if update_request.proposed_location:
+        cafe.location = update_request.proposed_location
+    if update_request.proposed_coffee_price:
+        cafe.coffee_price = update_request.proposed_coffee_price
+    if update_request.proposed_seats:
+        cafe.seats = update_request.proposed_seats
+    if update_request.proposed_map_url:
+        cafe.map_url = update_request.proposed_map_url
+    if update_request.proposed_img_url:
+        cafe.img_url = update_request.proposed_img_url
+    if update_request.proposed_has_toilet is not None:
+        cafe.has_toilet = update_request.proposed_has_toilet
+    if update_request.proposed_has_wifi is not None:
+        cafe.has_wifi = update_request.proposed_has_wifi
+    if update_request.proposed_has_sockets is not None:
+        cafe.has_sockets = update_request.proposed_has_sockets
+    if update_request.proposed_can_take_calls is not None:
+        cafe.can_take_calls = update_request.proposed_can_take_calls
+    # 직접 지정한 좌표는 map_url에서 찾은 좌표보다 우선
+    if update_request.proposed_lat is not None and update_request.proposed_lng is not None:
+        cafe.lat, cafe.lng = update_request.proposed_lat, update_request.proposed_lng
+
+# 대량 가져오기 배치 INSERT (이름 중복은 UNIQUE 제약의 ON CONFLICT로 건너뜀), 줄별 결과 반환
+def insert_cafe_batch(batch):
+    table = Cafe.__table__
+    first_by_name = {}  # 배치 안에서 이름이 겹치면 먼저 나온 줄이 들어감
+    for _, values in batch:
+        first_by_name.setdefault(values["name"], values)
+    try:
+        # 줄마다 변경 버전 예약 (이름이 겹쳐 건너뛴 줄의 번호는 비어 있는 채로 남음)
+        first_version = reserve_change_versions(len(batch))
+        updated_at = datetime.utcnow().isoformat()
+        for offset, (_, values) in enumerate(batch):
+            values["version"], values["updated_at"] = first_version + offset, updated_at
+        inserted = dict(db.session.execute(
+            sqlite_insert(table).on_conflict_do_nothing(index_elements=["name"]).returning(table.c.name, table.c.id),
+            [values for _, values in batch],
+        ).all())
+        search_index.index_new_cafes(
+            db.session, [(cafe_id, name, first_by_name[name]["location"]) for name, cafe_id in inserted.items()]
+        )
+        cafe_geo.index_new_points(
+            db.session, [(cafe_id, first_by_name[name]["lat"], first_by_name[name]["lng"])
+                         for name, cafe_id in inserted.items()]
+        )
+        cafe_duplicates.index_new_cafes(db.session, [(cafe_id, name) for name, cafe_id in inserted.items()])
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return [{"line": line_no, "status": "error", "error": str(e)} for line_no, _ in batch]
+
+    results = []
+    for line_no, values in batch:
+        cafe_id = inserted.pop(values["name"], None)
+        if cafe_id is None:
+            results.append({"line": line_no, "status": "duplicate", "name": values["name"]})
+        else:
+            sync_cafe_indexes(SimpleNamespace(id=cafe_id, **values))
+            results.append({"line": line_no, "status": "inserted", "id": cafe_id})
+    return results
+
+# 그룹 커밋 큐의 수정 요청 묶음을 한 트랜잭션으로 INSERT (쓰기 스레드에서 호출), 같은 순서의 요청 id 반환
+def write_update_request_batch(entries):
+    table = UpdateRequest.__table__
+    with app.app_context():
+        ids = db.session.scalars(
+            table.insert().returning(table.c.id, sort_by_parameter_order=True),
+            [dict(item, ticket=ticket) for ticket, item in entries],
+        ).all()
+        db.session.commit()
+        return ids
+
+# 큐 깊이 / 처리 결과 (/metrics에 추가되는 줄)
+def update_queue_metrics():
+    lines = ["# HELP cafe_update_queue_depth Update requests waiting for the group-commit writer",
+             "# TYPE cafe_update_queue_depth gauge",
+             f"cafe_update_queue_depth {update_writer.depth}"]
+    for name, value, help_text in (("batches", update_writer.batches, "Group-commit transactions"),
+                                   ("stored", update_writer.stored, "Queued update requests stored"),
+                                   ("failed", update_writer.failed, "Queued update requests that could not be stored"),
+                                   ("rejected", update_writer.rejected, "Update requests rejected because the queue was full")):
+        lines += [f"# HELP cafe_update_queue_{name}_total {help_text}",
+                  f"# TYPE cafe_update_queue_{name}_total counter",
+                  f"cafe_update_queue_{name}_total {value}"]
+    return lines
+
+update_writer = None
+if UPDATE_QUEUE_SIZE > 0:
+    update_writer = GroupCommitWriter(write_update_request_batch, max_queue=UPDATE_QUEUE_SIZE,
+                                      batch_size=UPDATE_BATCH_SIZE, flush_seconds=UPDATE_FLUSH_MS / 1000)
+
+# ─────────────────────────────────────────────
+# 📌 4-2. 요청 허용 제어 (토큰 버킷 429 / 동시 실행 상한 503)
+# ─────────────────────────────────────────────
+
+admission = None
+if RATE_LIMIT_RPS > 0 or EXPENSIVE_RATE_LIMIT_RPS > 0 or EXPENSIVE_MAX_CONCURRENCY > 0:
+    default_rule = Rule(RATE_LIMIT_RPS, RATE_LIMIT_BURST) if RATE_LIMIT_RPS > 0 else None
+    expensive_rule = Rule(EXPENSIVE_RATE_LIMIT_RPS, EXPENSIVE_RATE_LIMIT_BURST) if EXPENSIVE_RATE_LIMIT_RPS > 0 else default_rule
+    admission = AdmissionControl(
+        TokenBucketStore(RATE_LIMIT_DB_PATH) if default_rule or expensive_rule else None,
+        rules={endpoint: expensive_rule for endpoint in EXPENSIVE_ENDPOINTS},
+        default_rule=default_rule,
+        concurrency={endpoint: EXPENSIVE_MAX_CONCURRENCY for endpoint in EXPENSIVE_ENDPOINTS},
+    )
+
+# 버킷을 나누는 클라이언트 키 (헤더는 마지막 값 = 바로 앞 프록시가 붙인 주소, 앞쪽 값은 클라이언트가 위조할 수 있음)
+def admission_client(remote_addr, headers):
+    if RATE_LIMIT_CLIENT_HEADER:
+        forwarded = headers.get(RATE_LIMIT_CLIENT_HEADER)
+        if forwarded:
+            return forwarded.split(",")[-1].strip()
+    return remote_addr or "-"
+
+def shed_message(decision):
+    if decision.reason == RATE_LIMITED:
+        return "Too many requests. Please retry shortly."
+    return "Server is busy. Please retry shortly."
+
+# before_request 훅 (관리자 / 제외 엔드포인트 / 매칭되지 않은 경로는 통과)
+def admit_request():
+    endpoint = request.endpoint
+    if admission is None or endpoint is None or endpoint in ADMISSION_EXEMPT or is_admin():
+        return None
+    decision = admission.admit(endpoint, admission_client(request.remote_addr, request.headers))
+    if decision is not None:
+        response = jsonify({"error": shed_message(decision)})
+        response.headers["Retry-After"] = str(decision.retry_after)
+        return response, decision.status
+    g.admitted_endpoint = endpoint
+
+# teardown_request 훅 (스트리밍 응답은 본문을 다 보낸 뒤에 호출됨)
+def release_request(exc=None):
+    endpoint = g.pop("admitted_endpoint", None)
+    if endpoint is not None:
+        admission.release(endpoint)
+
+# 썸네일 요청 / 원본 가져오기 / 변형 생성 / 정리 횟수 (/metrics에 추가되는 줄)
+def thumbnail_metrics():
+    lines = []
+    for name, value, help_text in (("requests", thumbnails.requests, "Thumbnail requests"),
+                                   ("fetches", thumbnails.fetches, "Source images fetched from img_url"),
+                                   ("fetch_errors", thumbnails.fetch_errors, "Source image fetches that failed"),
+                                   ("resized", thumbnails.resized, "Resized variants written to the disk cache"),
+                                   ("evicted", thumbnails.evicted, "Files removed from the disk cache")):
+        lines += [f"# HELP cafe_thumb_{name}_total {help_text}",
+                  f"# TYPE cafe_thumb_{name}_total counter",
+                  f"cafe_thumb_{name}_total {value}"]
+    return lines
+
+# 허용 / 거절 횟수 (/metrics에 추가되는 줄)
+def admission_metrics():
+    return admission.metrics_lines(metrics.labels)
+
 # ─────────────────────────────────────────────
 # 📌 5. 페이지 렌더링 관련 라우트
 # ─────────────────────────────────────────────
 
-# [GET] 홈페이지(index.html) 제공
+# 홈 화면 첫 페이지 카드 (템플릿이 목록 위치까지 보낸 뒤에 조회하도록 제너레이터로 전달)
+def iter_home_cards(limit=DEFAULT_PAGE_LIMIT):
+    sync_catalog()
+    ids = db.session.scalars(select(Cafe.id).order_by(Cafe.id).limit(limit)).all()
+    yield from card_store.fragments_for_ids(ids, load_cafes_by_ids)
+
+# [GET] 홈페이지(index.html) 제공 (첫 페이지 카드는 서버에서 렌더링, 스트리밍 응답)
 @app.route("/")
 def home():
-    return render_template("index.html")
+    return stream_template("index.html", cards=iter_home_cards())
+# [GET] 지문이 붙은 정적 파일 (이름이 내용으로 정해지므로 immutable 캐시, 미리 압축한 .br / .gz 파일이 있으면 그대로 전송)
+@app.route("/static/build/<path:filename>")
+def get_built_asset(filename):
+    path = safe_join(app.static_folder, static_assets.BUILD_DIR, filename)
+    if path is None or filename == static_assets.MANIFEST_NAME or not os.path.isfile(path):
+        abort(404)
+    path, encoding = static_assets.select_precompressed(path, request.accept_encodings)
+    response = send_file(path, mimetype=mimetypes.guess_type(filename)[0], conditional=True, max_age=ASSET_MAX_AGE)
+    if encoding is not None:
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    response.cache_control.immutable = True
+    return response
+
 # [GET] 카페 추가 페이지
 @app.route("/add")
 def add_cafe_page():
@@ -253,12 +1043,94 @@ def cafe_detail_page(cafe_id):
 # 📌 6. 카페 API (조회, 추가, 검색, 삭제)
 # ─────────────────────────────────────────────
 
-# [GET] 모든 카페 조회 API
+# [GET] 모든 카페 조회 API (limit/after 키셋 페이지네이션, stream=ndjson|json 스트리밍 지원)
 @app.route("/cafes", methods=["GET"])
 @swag_from({
     "tags": ["Cafes"],
     "summary": "모든 카페 조회",
-    "description": "데이터베이스에서 모든 카페 정보를 가져옵니다.",
+    "description": "데이터베이스에서 모든 카페 정보를 가져옵니다. "
+                   "`limit`/`after`를 지정하면 id 기준 키셋 페이지네이션으로 동작하며, "
+                   "다음 페이지 주소는 `Link: <...>; rel=\"next\"` 헤더로 전달됩니다. "
+                   "`stream=ndjson` 또는 `stream=json`을 지정하면 서버 측 커서에서 읽은 행을 바로 스트리밍합니다. "
+                   "`has_wifi=1&has_sockets=1` 같은 편의시설 조건과 `location` 조건으로 필터링할 수 있습니다.",
+    "parameters": [
+        {
+            "name": "limit",
+            "in": "query",
+            "type": "integer",
+            "required": False,
+            "description": f"페이지 크기 (최대 {MAX_PAGE_LIMIT})"
+        },
+        {
+            "name": "after",
+            "in": "query",
+            "type": "integer",
+            "required": False,
+            "description": "이 id 다음부터 조회 (이전 페이지의 마지막 카페 id, sort / cursor / 범위 조건과 함께 쓰면 400)"
+        },
+        {
+            "name": "stream",
+            "in": "query",
+            "type": "string",
+            "enum": ["ndjson", "json"],
+            "required": False,
+            "description": "스트리밍 형식 (NDJSON 또는 청크 단위 JSON 배열)"
+        },
+        {
+            "name": "location",
+            "in": "query",
+            "type": "string",
+            "required": False,
+            "description": "위치 조건 (편의시설 조건과 함께 사용 가능)"
+        },
+        {
+            "name": "min_price",
+            "in": "query",
+            "type": "number",
+            "required": False,
+            "description": "최소 커피 가격, 원 (예: 3000, 원화가 아닌 가격의 카페는 제외)"
+        },
+        {
+            "name": "max_price",
+            "in": "query",
+            "type": "number",
+            "required": False,
+            "description": "최대 커피 가격, 원 (예: 5000, 원화가 아닌 가격의 카페는 제외)"
+        },
+        {
+            "name": "min_seats",
+            "in": "query",
+            "type": "integer",
+            "required": False,
+            "description": "최소 좌석 수 (좌석 수가 범위인 경우 최소값 기준)"
+        },
+        {
+            "name": "sort",
+            "in": "query",
+            "type": "string",
+            "enum": ["id", "-id", "name", "-name", "price", "-price", "seats", "-seats"],
+            "required": False,
+            "description": "정렬 기준 ('-'는 내림차순, 값을 알 수 없는 카페는 마지막)"
+        },
+        {
+            "name": "cursor",
+            "in": "query",
+            "type": "string",
+            "required": False,
+            "description": "정렬 / 범위 조회의 다음 페이지 커서 (Link 헤더에서 전달)"
+        },
+        *[
+            {
+                "name": name,
+                "in": "query",
+                "type": "string",
+                "enum": ["1", "0"],
+                "required": False,
+                "description": f"{name} 조건 (인메모리 비트셋으로 필터링)"
+            }
+            for name in AMENITIES
+        ]
+    ],
     "responses": {
         200: {
             "description": "카페 리스트 반환",
@@ -269,6 +1141,12 @@ def cafe_detail_page(cafe_id):
                 }
             }
         },
+        400: {
+            "description": "잘못된 스트리밍 형식 / 조건, 또는 after를 정렬 / 범위 조건과 함께 사용",
+            "examples": {
+                "application/json": {"error": "stream must be 'ndjson' or 'json'"}
+            }
+        },
         404: {
             "description": "카페가 없음",
             "examples": {
@@ -277,18 +1155,145 @@ def cafe_detail_page(cafe_id):
         }
     }
 })
+@cached_read
 def get_all_cafes():
-    cafes = Cafe.query.all()
-    if cafes:
-        return jsonify([cafe_to_dict(cafe) for cafe in cafes]), 200
-    return jsonify({"error": "No cafes found"}), 404
+    after = parse_after()
+    stream = request.args.get("stream")
+    if stream and stream not in ("ndjson", "json"):
+        return jsonify({"error": "stream must be 'ndjson' or 'json'"}), 400
+    try:
+        filters = parse_amenity_filters()
+        ranges = parse_range_filters()
+        sort = parse_sort()
+        cursor = decode_cursor(request.args["cursor"]) if request.args.get("cursor") else None
+        check_after_mode(request.args, ranges, sort, cursor)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    location = request.args.get("location", "").strip()
+    limit = parse_page_limit()
+
+    # 범위 / 정렬 모드: 모든 조건을 SQL로 처리하고 cursor로 다음 페이지 연결
+    if ranges or sort or cursor:
+        rows = query_sorted_cafe_rows(filters, location, ranges, sort or "id", cursor,
+                                      None if limit is None else limit + 1)
+        ids = [row[0] for row in rows]
+        if stream:
+            return stream_cafes(iter_fragments_for_ids(ids), stream)
+        response = cafes_response_for_ids(ids[:limit])
+        if limit is not None and len(rows) > limit:
+            last_id, last_value = rows[limit - 1]
+            add_next_link(response, "get_all_cafes", limit=limit, cursor=encode_cursor(last_value, last_id))
+        return response, 200
+
+    # 필터 모드: 인메모리 비트셋에서 조건에 맞는 id를 구한 뒤 카페 조각을 이어 붙임
+    if filters or location:
+        bits = filtered_cafe_bits(filters, location)
+        if stream:
+            return stream_cafes(iter_fragments_for_ids(ids_from_bits(bits, after)), stream)
+        ids = ids_from_bits(bits, after, None if limit is None else limit + 1)
+        response = cafes_response_for_ids(ids[:limit])
+        if limit is not None and len(ids) > limit:
+            add_next_link(response, "get_all_cafes", limit=limit, after=ids[limit - 1])
+        return response, 200
+
+    # 스트리밍 모드: 서버 측 커서에서 읽으면서 바로 전송
+    if stream:
+        return stream_cafes((fragment_store.fragment(cafe) for cafe in iter_cafes(after)), stream)
+
+    # 페이지네이션 모드: limit + 1개를 읽어서 다음 페이지 존재 여부 확인
+    if limit is not None:
+        cafes = list(execute_cafe_rows(CAFE_ROWS_PAGE, {"after": after, "limit": limit + 1}))
+        response = cafes_response(cafes[:limit])
+        if len(cafes) > limit:
+            add_next_link(response, "get_all_cafes", limit=limit, after=cafes[limit - 1].id)
+        return response, 200
+
+    # 기본 모드: LIST_BODY_MAX_ROWS 이하면 카탈로그 버전별로 미리 만들어 둔 전체 목록 (gzip / br 압축본 포함),
+    # 그보다 크면 스트리밍 모드와 같이 메모리를 일정하게 유지하며 전송
+    return cafe_list_response(response_cache.version)
+
+# [GET] 편의시설 조합별 카페 수 조회 API
+@app.route("/cafes/facets", methods=["GET"])
+@swag_from({
+    "tags": ["Cafes"],
+    "summary": "편의시설 조합별 카페 수",
+    "description": "조건(편의시설, 위치)에 맞는 카페 수와 편의시설별 개수, "
+                   "편의시설 4가지의 모든 조합(16개)별 개수를 반환합니다.",
+    "parameters": [
+        {
+            "name": "location",
+            "in": "query",
+            "type": "string",
+            "required": False,
+            "description": "위치 조건"
+        },
+        *[
+            {
+                "name": name,
+                "in": "query",
+                "type": "string",
+                "enum": ["1", "0"],
+                "required": False,
+                "description": f"{name} 조건"
+            }
+            for name in AMENITIES
+        ]
+    ],
+    "responses": {
+        200: {
+            "description": "조합별 카페 수",
+            "examples": {
+                "application/json": {
+                    "total": 22,
+                    "amenities": {"has_toilet": 20, "has_wifi": 18, "has_sockets": 15, "can_take_calls": 9},
+                    "combinations": [
+                        {"has_toilet": True, "has_wifi": True, "has_sockets": True, "can_take_calls": True, "count": 5}
+                    ]
+                }
+            }
+        },
+        400: {
+            "description": "잘못된 파라미터"
+        }
+    }
+})
+@cached_read
+def get_cafe_facets():
+    try:
+        filters = parse_amenity_filters()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    bits = filtered_cafe_bits(filters, request.args.get("location", "").strip())
+    return jsonify(cafe_index.facets(bits)), 200
 
 # [GET] 랜덤 카페 조회 API
 @app.route("/cafes/random", methods=["GET"])
 @swag_from({
     "tags": ["Cafes"],
     "summary": "랜덤 카페 조회",
-    "description": "데이터베이스에서 무작위로 하나의 카페 정보를 반환합니다.",
+    "description": "데이터베이스에서 무작위로 하나의 카페 정보를 반환합니다. "
+                   "`n`을 지정하면 서로 다른 카페 n개를 배열로 반환하고, "
+                   "편의시설 조건(`has_wifi=1` 등)으로 후보를 제한할 수 있습니다.",
+    "parameters": [
+        {
+            "name": "n",
+            "in": "query",
+            "type": "integer",
+            "required": False,
+            "description": f"뽑을 카페 수 (최대 {MAX_RANDOM_SAMPLES}, 지정 시 배열 반환)"
+        },
+        *[
+            {
+                "name": name,
+                "in": "query",
+                "type": "string",
+                "enum": ["1", "0"],
+                "required": False,
+                "description": f"{name} 조건"
+            }
+            for name in AMENITIES
+        ]
+    ],
     "responses": {
         200: {
             "description": "랜덤 카페 정보 반환",
@@ -311,6 +1316,12 @@ def get_all_cafes():
                 }
             }
         },
+        400: {
+            "description": "잘못된 파라미터",
+            "examples": {
+                "application/json": {"error": "has_wifi must be 1/0 or true/false"}
+            }
+        },
         404: {
             "description": "카페 없음",
             "examples": {
@@ -320,12 +1331,111 @@ def get_all_cafes():
     }
 })
 def get_random_cafe():
-    cafes = Cafe.query.all()
-    if not cafes:  # 빈 리스트일 경우 바로 404 반환
+    n = request.args.get("n", type=int)
+    try:
+        filters = parse_amenity_filters()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    k = 1 if n is None else max(1, min(n, MAX_RANDOM_SAMPLES))
+
+    # 전체 테이블 대신 인메모리 id 인덱스에서 추출한 id만 조회 (다른 워커의 변경은 변경 피드에서 먼저 반영)
+    sync_cafe_index()
+    sync_catalog()
+    ids = cafe_index.sample(k, filters)
+    found_ids = set()
+
+    def load_existing(missing_ids):
+        cafes = load_cafes_by_ids(missing_ids)
+        found_ids.update(cafe.id for cafe in cafes)
+        # 변경 피드를 읽은 뒤에 삭제된 id는 인덱스에서 제거
+        for cafe_id in set(missing_ids) - found_ids:
+            drop_cafe_from_indexes(cafe_id)
+        return cafes
+
+    fragments = fragment_store.fragments_for_ids(ids, load_existing)
+    if not fragments:  # 조건에 맞는 카페가 없을 경우 404 반환
+        return jsonify({"error": "No cafes found"}), 404
+
+    if n is None:
+        return json_body_response(fragments[0]), 200
+    return json_body_response(join_fragments(fragments)), 200
+
+
+# [GET] 주변 카페 검색 API (R*Tree 좌표 인덱스)
+@app.route("/cafes/nearby", methods=["GET"])
+@swag_from({
+    "tags": ["Cafes"],
+    "summary": "주변 카페 검색",
+    "description": "기준 좌표에서 반경(radius, m) 안에 있는 카페를 가까운 순으로 최대 k개 반환합니다. "
+                   "각 카페에는 거리(distance_m)가 포함됩니다. 좌표가 없는 카페는 제외됩니다. "
+                   "편의시설 필터(has_wifi 등)를 함께 사용할 수 있습니다.",
+    "parameters": [
+        {"name": "lat", "in": "query", "type": "number", "required": True, "description": "기준 위도"},
+        {"name": "lng", "in": "query", "type": "number", "required": True, "description": "기준 경도"},
+        {"name": "radius", "in": "query", "type": "integer", "required": False,
+         "description": f"검색 반경 m (기본 {DEFAULT_NEARBY_RADIUS_M}, 최대 {MAX_NEARBY_RADIUS_M})"},
+        {"name": "k", "in": "query", "type": "integer", "required": False,
+         "description": f"최대 개수 (기본 {DEFAULT_NEARBY_K}, 최대 {MAX_NEARBY_K})"},
+        {"name": "has_wifi", "in": "query", "type": "string", "required": False, "description": "1/0 또는 true/false"},
+        {"name": "has_sockets", "in": "query", "type": "string", "required": False, "description": "1/0 또는 true/false"},
+        {"name": "has_toilet", "in": "query", "type": "string", "required": False, "description": "1/0 또는 true/false"},
+        {"name": "can_take_calls", "in": "query", "type": "string", "required": False, "description": "1/0 또는 true/false"}
+    ],
+    "responses": {
+        200: {
+            "description": "가까운 순 카페 목록",
+            "schema": {
+                "type": "array",
+                "items": {"$ref": "#/definitions/Cafe"}
+            }
+        },
+        400: {
+            "description": "잘못된 좌표 / 파라미터"
+        },
+        404: {
+            "description": "반경 안에 카페가 없음",
+            "examples": {
+                "application/json": {"error": "No cafes found"}
+            }
+        }
+    }
+})
+def get_nearby_cafes():
+    try:
+        coordinates = cafe_geo.coordinates_from(request.args.get("lat"), request.args.get("lng"))
+        filters = parse_amenity_filters()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if not coordinates:
+        return jsonify({"error": "lat and lng are required"}), 400
+    radius = request.args.get("radius", default=DEFAULT_NEARBY_RADIUS_M, type=float)
+    if not math.isfinite(radius):  # nan / inf는 범위 비교를 모두 통과하지 못해 검색 반경이 정해지지 않음
+        return jsonify({"error": "radius must be a finite number"}), 400
+    radius = max(1.0, min(radius, MAX_NEARBY_RADIUS_M))
+    k = max(1, min(request.args.get("k", default=DEFAULT_NEARBY_K, type=int), MAX_NEARBY_K))
+
+    # 편의시설 조건은 인메모리 비트셋으로 확인 (후보마다 카페 행을 읽지 않음)
+    accept = None
+    if filters:
+        sync_cafe_index()
+        bits = cafe_index.filter_bits(filters)
+        accept = lambda cafe_id: bits >> cafe_id & 1
+
+    sync_catalog()
+    results = cafe_geo.nearby(db.session, *coordinates, radius, k, accept)
+    found, missing = fragment_store.cached([cafe_id for cafe_id, _ in results])
+    if missing:
+        for cafe in load_cafes_by_ids(missing):
+            found[cafe.id] = fragment_store.fragment(cafe)
+    if not found:
         return jsonify({"error": "No cafes found"}), 404
 
-    random_cafe = random.choice(cafes)
-    return jsonify(cafe_to_dict(random_cafe)), 200
+    # 미리 인코딩된 카페 조각 끝에 거리(m)를 덧붙임
+    body = join_fragments([
+        found[cafe_id][:-1] + b',"distance_m":' + str(round(distance, 1)).encode() + b"}"
+        for cafe_id, distance in results if cafe_id in found
+    ])
+    return json_body_response(body), 200
 
 
 # [GET] 개별 카페 정보 조회 API
@@ -356,11 +1466,91 @@ def get_random_cafe():
         }
     }
 })
+@cached_read
 def get_cafe_by_id(cafe_id):
-    cafe = Cafe.query.get(cafe_id)
-    if not cafe:
+    fragments = fragment_store.fragments_for_ids([cafe_id], load_cafes_by_ids)
+    if not fragments:
         return jsonify({"error": "Cafe not found"}), 404
-    return jsonify(cafe_to_dict(cafe)), 200
+    return json_body_response(fragments[0]), 200
+
+# [GET] 카페 썸네일 API (원본 이미지를 한 번만 가져와서 너비별로 줄인 뒤 디스크에 캐시)
+@app.route("/cafes/<int:cafe_id>/thumb", methods=["GET"])
+@swag_from({
+    "tags": ["Cafes"],
+    "summary": "카페 썸네일 조회",
+    "description": "카페 이미지(img_url)를 서버가 한 번만 가져와 w 너비(160 / 320 / 640 중 요청값 이상인 가장 작은 값)로 "
+                   "줄여서 반환합니다. Pillow가 설치되어 있지 않으면 원본을 캐시해서 그대로 반환합니다. "
+                   "v가 카페의 현재 version과 같으면 1년 동안 바뀌지 않는(immutable) 응답으로 캐시할 수 있습니다. "
+                   "JPEG / PNG / WebP / GIF만 제공하며, 원본 서버에서 이미지를 가져올 수 없거나 "
+                   "지원하지 않는 형식이면 img_url로 리디렉트합니다.",
+    "produces": ["image/jpeg", "image/png", "image/webp", "image/gif"],
+    "parameters": [
+        {"name": "cafe_id", "in": "path", "type": "integer", "required": True, "description": "카페 ID"},
+        {"name": "w", "in": "query", "type": "integer", "required": False, "description": "너비(px), 기본 320"},
+        {"name": "v", "in": "query", "type": "integer", "required": False, "description": "카페 version (캐시 구분용)"}
+    ],
+    "responses": {
+        200: {
+            "description": "썸네일 이미지 (강한 ETag, If-None-Match가 같으면 304)"
+        },
+        302: {
+            "description": "이미지를 가져올 수 없어 원본 주소로 리디렉트"
+        },
+        400: {
+            "description": "잘못된 너비",
+            "examples": {
+                "application/json": {"error": "w must be a positive integer"}
+            }
+        },
+        404: {
+            "description": "카페를 찾을 수 없음",
+            "examples": {
+                "application/json": {"error": "Cafe not found"}
+            }
+        }
+    }
+})
+def get_cafe_thumbnail(cafe_id):
+    @after_this_request
+    def protect_thumbnail(response):
+        # 이미지가 아닌 내용이 섞여도 이 출처의 문서로 해석 / 실행되지 않게 함
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["Content-Security-Policy"] = "sandbox"
+        return response
+
+    try:
+        width = int(request.args.get("w", DEFAULT_THUMB_WIDTH))
+        if width <= 0:
+            raise ValueError
+    except ValueError:
+        return jsonify({"error": "w must be a positive integer"}), 400
+    # 너비를 몇 가지로 맞춰서 변형 수가 늘어나지 않게 함
+    width = next((size for size in THUMB_WIDTHS if size >= width), THUMB_WIDTHS[-1])
+
+    row = db.session.execute(select(Cafe.img_url, Cafe.version).where(Cafe.id == cafe_id)).first()
+    if row is None:
+        return jsonify({"error": "Cafe not found"}), 404
+
+    immutable = request.args.get("v") == str(row.version)
+    for _ in range(2):  # 캐시 정리로 파일이 방금 지워졌으면 한 번 더 만듦
+        try:
+            thumb = thumbnails.get(row.img_url, width)
+            response = send_file(thumb.path, mimetype=thumb.content_type, etag=thumb.etag, conditional=True,
+                                 max_age=THUMB_IMMUTABLE_MAX_AGE if immutable else THUMB_MAX_AGE)
+        except FileNotFoundError:
+            continue
+        except ThumbnailError:
+            break
+        if immutable:
+            response.cache_control.immutable = True
+        return response
+
+    # 원본 서버에서 가져올 수 없으면 원본 주소로 보냄 (브라우저가 직접 시도, 캐시하지 않음)
+    if not row.img_url.lower().startswith(("http://", "https://")):
+        return jsonify({"error": "Image not available"}), 404
+    response = redirect(row.img_url)
+    response.headers["Cache-Control"] = "no-store"
+    return response
 
 # [GET] 위치 기반 카페 검색 API
 @app.route("/cafes/location/<string:location>", methods=["GET"])
@@ -375,6 +1565,35 @@ def get_cafe_by_id(cafe_id):
             "type": "string",
             "required": True,
             "description": "검색할 위치(지역명)"
+        },
+        {
+            "name": "min_price",
+            "in": "query",
+            "type": "number",
+            "required": False,
+            "description": "최소 커피 가격, 원 (원화가 아닌 가격의 카페는 제외)"
+        },
+        {
+            "name": "max_price",
+            "in": "query",
+            "type": "number",
+            "required": False,
+            "description": "최대 커피 가격, 원 (원화가 아닌 가격의 카페는 제외)"
+        },
+        {
+            "name": "min_seats",
+            "in": "query",
+            "type": "integer",
+            "required": False,
+            "description": "최소 좌석 수"
+        },
+        {
+            "name": "sort",
+            "in": "query",
+            "type": "string",
+            "enum": ["id", "-id", "name", "-name", "price", "-price", "seats", "-seats"],
+            "required": False,
+            "description": "정렬 기준 ('-'는 내림차순)"
         }
     ],
     "responses": {
@@ -429,12 +1648,170 @@ def get_cafe_by_id(cafe_id):
         }
     }
 })
+@cached_read
 def search_cafes_by_location(location):
-    cafes = Cafe.query.filter(Cafe.location.ilike(f"%{location}%")).all()
-    if cafes:
-        return jsonify([cafe_to_dict(cafe) for cafe in cafes]), 200
+    try:
+        ranges = parse_range_filters()
+        sort = parse_sort()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # 위치 컬럼의 전문 검색 인덱스 사용 (단어 접두어 / 초성 검색), 범위 / 정렬은 SQL로 처리
+    ids = [row[0] for row in query_sorted_cafe_rows({}, location, ranges, sort or "id")]
+    if ids:
+        return cafes_response_for_ids(ids), 200
     return jsonify({"error": f"No cafes found at location '{location}'"}), 404
 
+# [GET] 카페 이름 / 위치 전문 검색 API (순위순)
+@app.route("/cafes/search", methods=["GET"])
+@swag_from({
+    "tags": ["Cafes"],
+    "summary": "카페 검색",
+    "description": "카페 이름과 위치를 전문 검색 인덱스에서 찾아 관련도 순으로 반환합니다. "
+                   "각 단어는 접두어로 검색되며(`강남` → `강남구`, `강남점`), "
+                   "초성만 입력해도 검색됩니다(`ㅅㅌㅂㅅ` → `스타벅스`).",
+    "parameters": [
+        {
+            "name": "q",
+            "in": "query",
+            "type": "string",
+            "required": True,
+            "description": "검색어"
+        },
+        {
+            "name": "limit",
+            "in": "query",
+            "type": "integer",
+            "required": False,
+            "description": f"최대 결과 수 (기본 {DEFAULT_PAGE_LIMIT}, 최대 {MAX_PAGE_LIMIT})"
+        }
+    ],
+    "responses": {
+        200: {
+            "description": "검색 결과 (관련도 순)",
+            "schema": {
+                "type": "array",
+                "items": {
+                    "$ref": "#/definitions/Cafe"
+                }
+            }
+        },
+        400: {
+            "description": "검색어 없음",
+            "examples": {
+                "application/json": {"error": "Query parameter 'q' is required"}
+            }
+        }
+    }
+})
+@cached_read
+def search_cafes():
+    query = request.args.get("q", "").strip()
+    if not query:
+        return jsonify({"error": "Query parameter 'q' is required"}), 400
+    limit = parse_page_limit() or DEFAULT_PAGE_LIMIT
+
+    ids = search_index.search_cafe_ids(db.session, query, limit)
+    return cafes_response_for_ids(ids), 200
+
+# [GET] 카페 자동 완성 API (이름 / 위치 접두어, 인메모리 접두어 인덱스)
+@app.route("/cafes/suggest", methods=["GET"])
+@swag_from({
+    "tags": ["Cafes"],
+    "summary": "카페 자동 완성",
+    "description": "이름 또는 위치(단어 단위)가 `q`로 시작하는 카페의 `id`, `name`, `location`만 반환합니다. "
+                   "이름 일치가 먼저, 그다음 위치 일치가 나옵니다. "
+                   "한글 음절 접두어(`스타` → `스타벅스`)와 초성 접두어(`ㅅㅌ`, `스ㅌ` → `스타벅스`)를 지원하며, "
+                   "프로세스 메모리의 정렬된 접두어 인덱스에서 찾으므로 입력할 때마다 호출해도 됩니다.",
+    "parameters": [
+        {
+            "name": "q",
+            "in": "query",
+            "type": "string",
+            "required": True,
+            "description": "입력 중인 검색어 (비어 있으면 빈 목록)"
+        },
+        {
+            "name": "limit",
+            "in": "query",
+            "type": "integer",
+            "required": False,
+            "description": f"최대 결과 수 (기본 {DEFAULT_SUGGEST_LIMIT}, 최대 {MAX_SUGGEST_LIMIT})"
+        }
+    ],
+    "responses": {
+        200: {
+            "description": "자동 완성 후보",
+            "examples": {
+                "application/json": [{"id": 1, "name": "스타벅스 강남점", "location": "서울 강남구"}]
+            }
+        }
+    }
+})
+def suggest_cafes():
+    limit = max(1, min(request.args.get("limit", DEFAULT_SUGGEST_LIMIT, type=int), MAX_SUGGEST_LIMIT))
+    suggest_index.ensure_loaded(load_suggest_index_rows, load_change_version)
+    suggest_index.refresh(load_suggest_changes)
+    rows = suggest_index.suggest(request.args.get("q", ""), limit)
+    return jsonify([{"id": cafe_id, "name": name, "location": location} for cafe_id, name, location in rows]), 200
+
+# [GET] 유사 중복 카페 검사 API (이름 2-gram MinHash 후보 인덱스)
+@app.route("/cafes/duplicates", methods=["GET"])
+@swag_from({
+    "tags": ["Cafes"],
+    "summary": "유사 중복 카페 검사",
+    "description": "이름(과 위치)이 비슷한 카페를 점수가 높은 순으로 반환합니다. "
+                   "이름은 공백 / 기호 / 대소문자를 무시한 글자 2-gram의 Jaccard 유사도(name_score), "
+                   "위치는 2-gram 포함 비율(location_score)로 비교하며 score = name_score * 0.7 + location_score * 0.3 "
+                   "(위치를 주지 않으면 name_score)입니다. 지점 번호가 다른 카페('1호점' / '2호점')는 제외됩니다. "
+                   "exact는 정규화한 이름과 위치가 모두 같은 카페입니다. "
+                   "`id`를 주면 그 카페의 이름 / 위치로 찾고 자기 자신은 제외합니다.",
+    "parameters": [
+        {"name": "name", "in": "query", "type": "string", "required": False, "description": "검사할 카페 이름 (id가 없으면 필수)"},
+        {"name": "location", "in": "query", "type": "string", "required": False, "description": "검사할 카페 위치"},
+        {"name": "id", "in": "query", "type": "integer", "required": False, "description": "이미 등록된 카페 id"},
+        {"name": "min_score", "in": "query", "type": "number", "required": False,
+         "description": f"최소 점수 0~1 (기본 {DUPLICATE_MIN_SCORE})"},
+        {"name": "limit", "in": "query", "type": "integer", "required": False,
+         "description": f"최대 결과 수 (기본 {DEFAULT_DUPLICATE_LIMIT}, 최대 {MAX_DUPLICATE_LIMIT})"}
+    ],
+    "responses": {
+        200: {
+            "description": "중복 후보 (점수 순)",
+            "examples": {
+                "application/json": [{"id": 1, "name": "스타벅스 강남점", "location": "서울 강남구", "score": 1.0,
+                                      "name_score": 1.0, "location_score": 1.0, "exact": True}]
+            }
+        },
+        400: {
+            "description": "name / id가 없음",
+            "examples": {
+                "application/json": {"error": "name or id is required"}
+            }
+        },
+        404: {
+            "description": "id에 해당하는 카페가 없음",
+            "examples": {
+                "application/json": {"error": "Cafe not found"}
+            }
+        }
+    }
+})
+def find_duplicate_cafes():
+    limit = max(1, min(request.args.get("limit", DEFAULT_DUPLICATE_LIMIT, type=int), MAX_DUPLICATE_LIMIT))
+    min_score = request.args.get("min_score", DUPLICATE_MIN_SCORE, type=float)
+    cafe_id = request.args.get("id", type=int)
+    name, location = request.args.get("name"), request.args.get("location")
+    if cafe_id is not None:
+        row = db.session.execute(select(Cafe.name, Cafe.location).where(Cafe.id == cafe_id)).first()
+        if row is None:
+            return jsonify({"error": "Cafe not found"}), 404
+        name, location = row
+    if not name:
+        return jsonify({"error": "name or id is required"}), 400
+    matches = cafe_duplicates.find_duplicates(db.session, name, location, limit, min_score, exclude=cafe_id)
+    return jsonify([match._asdict() for match in matches]), 200
+
 # [POST] 새로운 카페 추가 API
 @app.route("/cafes", methods=["POST"])
 @swag_from({
@@ -458,20 +1835,28 @@ def search_cafes_by_location(location):
                     "has_wifi": {"type": "boolean", "example": True},
                     "has_sockets": {"type": "boolean", "example": False},
                     "can_take_calls": {"type": "boolean", "example": True},
-                    "coffee_price": {"type": "string", "example": "₩4,500"}
+                    "coffee_price": {"type": "string", "example": "₩4,500"},
+                    "lat": {"type": "number", "example": 37.5563, "description": "생략하면 map_url에서 추출"},
+                    "lng": {"type": "number", "example": 126.9220, "description": "생략하면 map_url에서 추출"}
                 }
             }
         }
     ],
     "responses": {
         201: {
-            "description": "카페 추가 성공",
+            "description": "카페 추가 성공 (비슷한 이름 / 위치의 카페가 있으면 possible_duplicates에 점수와 함께 포함)",
             "examples": {
-                "application/json": {"success": "Successfully added new cafe"}
+                "application/json": {
+                    "success": "Successfully added new cafe",
+                    "id": 42,
+                    "possible_duplicates": [{"id": 7, "name": "스타벅스 강남역점", "location": "서울 강남구",
+                                             "score": 0.738, "name_score": 0.625, "location_score": 1.0,
+                                             "exact": False}]
+                }
             }
         },
         400: {
-            "description": "카페 중복 오류",
+            "description": "카페 중복 오류 (공백 / 기호 / 대소문자만 다른 이름 포함) 또는 잘못된 좌표",
             "examples": {
                 "application/json": {"error": "A cafe with this name already exists at this location"}
             }
@@ -487,10 +1872,20 @@ def search_cafes_by_location(location):
 def add_cafe():
     try:
         data = request.get_json()  # JSON 데이터 받기
+        try:
+            coordinates = cafe_geo.coordinates_from(data.get("lat"), data.get("lng"))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         # 같은 이름의 카페가 같은 위치에 있는지 확인
         existing_cafe = Cafe.query.filter_by(name=data["name"], location=data["location"]).first()
         if existing_cafe:
             return jsonify({"error": "A cafe with this name already exists at this location"}), 400
+        # 공백 / 기호 / 대소문자만 다른 이름이 같은 위치에 있어도 중복 ('스타벅스 강남점' == '스타벅스 강남 점')
+        duplicates = cafe_duplicates.find_duplicates(db.session, data["name"], data["location"],
+                                                     min_score=DUPLICATE_MIN_SCORE)
+        if duplicates and duplicates[0].exact:
+            return jsonify({"error": "A cafe with this name already exists at this location",
+                            "duplicates": [match._asdict() for match in duplicates]}), 400
 
         new_cafe = Cafe(
             name=data["name"],
@@ -504,13 +1899,200 @@ def add_cafe():
             seats=data.get("seats", "Unknown"),
             coffee_price=data.get("coffee_price", "Unknown")
         )
+        if coordinates:
+            new_cafe.lat, new_cafe.lng = coordinates
         db.session.add(new_cafe)
+        stage_cafe_indexes(new_cafe)
         db.session.commit()
-        return jsonify({"success": "Successfully added new cafe"}), 201
+        sync_cafe_indexes(new_cafe)
+        # 비슷한 카페가 있으면 추가는 하되 점수와 함께 알려줌 (관리자가 확인 후 삭제)
+        return jsonify({"success": "Successfully added new cafe", "id": new_cafe.id,
+                        "possible_duplicates": [match._asdict() for match in duplicates]}), 201
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
+# [POST] 카페 대량 가져오기 API (관리자 전용, NDJSON / CSV 스트리밍 본문)
+@app.route("/cafes/bulk", methods=["POST"])
+@swag_from({
+    "tags": ["Admin"],
+    "summary": "카페 대량 가져오기 (관리자 전용)",
+    "description": "NDJSON(한 줄에 카페 하나) 또는 CSV(헤더 포함) 본문을 스트리밍으로 읽어 "
+                   f"{BULK_BATCH_SIZE}개씩 한 트랜잭션으로 추가합니다. 필드는 `POST /cafes`와 같습니다. "
+                   "이름이 이미 있는 카페는 UNIQUE 제약으로 건너뛰고 줄별 결과에 `duplicate`로 표시합니다.",
+    "security": [{"BearerAuth": []}],
+    "consumes": ["application/x-ndjson", "text/csv"],
+    "parameters": [
+        {
+            "name": "format",
+            "in": "query",
+            "type": "string",
+            "enum": list(cafe_bulk.FORMATS),
+            "required": False,
+            "description": "본문 형식 (없으면 Content-Type으로 판단, 기본 ndjson)"
+        },
+        {
+            "name": "body",
+            "in": "body",
+            "required": True,
+            "schema": {"type": "string", "example": '{"name": "새로운 카페", "map_url": "https://maps.example.com/a", "img_url": "https://images.example.com/a.jpg", "location": "서울 마포구", "has_wifi": true}'}
+        }
+    ],
+    "responses": {
+        200: {
+            "description": "가져오기 결과 (줄별 결과 포함)",
+            "examples": {
+                "application/json": {
+                    "inserted": 2, "duplicates": 1, "errors": 1,
+                    "results": [
+                        {"line": 1, "status": "inserted", "id": 23},
+                        {"line": 2, "status": "duplicate", "name": "카페 A"},
+                        {"line": 3, "status": "error", "error": "Missing required fields: map_url"},
+                        {"line": 4, "status": "inserted", "id": 24}
+                    ]
+                }
+            }
+        },
+        400: {
+            "description": "잘못된 형식"
+        },
+        403: {
+            "description": "관리자 권한 없음"
+        }
+    }
+})
+def bulk_import_cafes():
+    if not is_admin():
+        abort(403, description="관리자 권한이 없습니다.")
+    try:
+        fmt = cafe_bulk.detect_format(request.content_type, request.args.get("format"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    results = []
+    batch = []
+    try:
+        for line_no, record in cafe_bulk.iter_records(request.stream, fmt):
+            if isinstance(record, str):  # 줄 단위 파싱 오류
+                results.append({"line": line_no, "status": "error", "error": record})
+                continue
+            try:
+                batch.append((line_no, cafe_bulk.cafe_values(record)))
+            except ValueError as e:
+                results.append({"line": line_no, "status": "error", "error": str(e)})
+                continue
+            if len(batch) >= BULK_BATCH_SIZE:
+                results.extend(insert_cafe_batch(batch))
+                batch = []
+    except (UnicodeDecodeError, cafe_bulk.csv.Error) as e:
+        # 본문을 더 읽을 수 없으면 이미 읽은 줄까지만 처리
+        results.append({"line": None, "status": "error", "error": f"Unreadable body: {e}"})
+    if batch:
+        results.extend(insert_cafe_batch(batch))
+
+    results.sort(key=lambda result: result["line"] or 0)
+    return jsonify({
+        "inserted": sum(result["status"] == "inserted" for result in results),
+        "duplicates": sum(result["status"] == "duplicate" for result in results),
+        "errors": sum(result["status"] == "error" for result in results),
+        "results": results
+    }), 200
+
+# [GET] 카페 내보내기 API (NDJSON / CSV 스트리밍)
+@app.route("/cafes/export", methods=["GET"])
+@swag_from({
+    "tags": ["Cafes"],
+    "summary": "카페 내보내기",
+    "description": "전체 카페를 `POST /cafes/bulk`와 같은 형식(NDJSON 또는 CSV)으로 스트리밍합니다. "
+                   "서버 측 커서에서 배치 단위로 읽으므로 카탈로그 크기와 관계없이 메모리 사용량이 일정합니다.",
+    "produces": ["application/x-ndjson", "text/csv"],
+    "parameters": [
+        {
+            "name": "format",
+            "in": "query",
+            "type": "string",
+            "enum": list(cafe_bulk.FORMATS),
+            "required": False,
+            "description": "내보내기 형식 (기본 ndjson)"
+        }
+    ],
+    "responses": {
+        200: {
+            "description": "카페 목록 스트림"
+        },
+        400: {
+            "description": "잘못된 형식"
+        }
+    }
+})
+def export_cafes():
+    try:
+        fmt = cafe_bulk.detect_format(None, request.args.get("format", "ndjson"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    def rows():
+        columns = [Cafe.__table__.c[field] for field in cafe_bulk.EXPORT_FIELDS]
+        stmt = select(*columns).order_by(Cafe.id).execution_options(yield_per=STREAM_BATCH_SIZE)
+        yield from db.session.execute(stmt)
+
+    response = Response(
+        stream_with_context(cafe_bulk.export_chunks(rows(), fmt, STREAM_BATCH_SIZE)),
+        mimetype=cafe_bulk.MIMETYPES[fmt]
+    )
+    response.headers["Content-Disposition"] = f"attachment; filename=cafes.{fmt}"
+    return response
+
+# [GET] 카페 변경 피드 API (since 이후에 추가 / 수정 / 삭제된 카페만 순번 순서로 반환)
+@app.route("/cafes/changes", methods=["GET"])
+@swag_from({
+    "tags": ["Cafes"],
+    "summary": "카페 변경 피드",
+    "description": "`since` 순번 이후에 추가 / 수정(`op: upsert`, 카페 전체 정보 포함)되거나 "
+                   "삭제(`op: delete`)된 카페를 순번(`seq`) 순서로 반환합니다. "
+                   "클라이언트는 목록을 한 번 받아 둔 뒤 응답의 `next`를 다음 요청의 `since`로 넘겨 "
+                   "바뀐 부분만 받아 순서대로 적용하면 됩니다. `has_more`가 true이면 바로 다음 페이지를 요청합니다. "
+                   "`since=0`이면 현재 카탈로그 전체가 upsert로 내려옵니다.",
+    "parameters": [
+        {
+            "name": "since",
+            "in": "query",
+            "type": "integer",
+            "required": False,
+            "description": "이전 응답의 next 값 (기본 0 = 처음부터)"
+        },
+        {
+            "name": "limit",
+            "in": "query",
+            "type": "integer",
+            "required": False,
+            "description": f"한 번에 받을 변경 수 (기본 / 최대 {MAX_PAGE_LIMIT})"
+        }
+    ],
+    "responses": {
+        200: {
+            "description": "변경 목록",
+            "examples": {
+                "application/json": {
+                    "changes": [
+                        {"cafe": {"id": 3, "name": "카페 A", "version": 41}, "id": 3, "op": "upsert", "seq": 41},
+                        {"id": 7, "op": "delete", "seq": 42}
+                    ],
+                    "has_more": False,
+                    "next": 42
+                }
+            }
+        }
+    }
+})
+def get_cafe_changes():
+    since = max(0, request.args.get("since", 0, type=int))
+    limit = max(1, min(request.args.get("limit", MAX_PAGE_LIMIT, type=int), MAX_PAGE_LIMIT))
+    rows = db.session.execute(cafe_changes_stmt(since, limit + 1)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return json_body_response(build_changes_body(rows, rows[-1].seq if rows else since, has_more)), 200
+
 # [PATCH] 카페 업데이트 API
 @app.route("/cafes/<int:cafe_id>/update-request", methods=["POST"])
 @swag_from({
@@ -541,49 +2123,134 @@ def add_cafe():
                     "has_toilet": {"type": "boolean", "example": True},
                     "has_wifi": {"type": "boolean", "example": True},
                     "has_sockets": {"type": "boolean", "example": False},
-                    "can_take_calls": {"type": "boolean", "example": True}
+                    "can_take_calls": {"type": "boolean", "example": True},
+                    "lat": {"type": "number", "example": 37.5700},
+                    "lng": {"type": "number", "example": 126.9910}
                 }
             }
         }
     ],
     "responses": {
         201: {
-            "description": "수정 요청 성공",
+            "description": "수정 요청 성공 (그룹 커밋 큐를 쓰지 않을 때)",
             "examples": {
                 "application/json": {"success": "Cafe update request submitted. Awaiting approval."}
             }
         },
+        202: {
+            "description": "수정 요청 접수 (UPDATE_QUEUE_SIZE > 0, 쓰기 스레드가 묶어서 저장). `status_url`로 상태 조회",
+            "examples": {
+                "application/json": {"ticket": "3f2b9c0e8d6a4b1f9e7c5a3d1b0f8e6c", "status": "queued",
+                                     "status_url": "/cafes/update-requests/3f2b9c0e8d6a4b1f9e7c5a3d1b0f8e6c"}
+            }
+        },
+        400: {
+            "description": "잘못된 좌표",
+            "examples": {
+                "application/json": {"error": "lat and lng must both be numbers"}
+            }
+        },
         404: {
             "description": "카페 없음",
             "examples": {
                 "application/json": {"error": "Cafe not found"}
             }
+        },
+        503: {
+            "description": "수정 요청 큐가 가득 참 (Retry-After 초 후 다시 시도)",
+            "examples": {
+                "application/json": {"error": "Too many update requests. Please retry shortly."}
+            }
         }
     }
 })
 def request_cafe_update(cafe_id):
-    cafe = Cafe.query.get(cafe_id)
-    if not cafe:
+    if db.session.scalar(select(Cafe.id).where(Cafe.id == cafe_id)) is None:
         return jsonify({"error": "Cafe not found"}), 404
 
     data = request.get_json()
-    new_request = UpdateRequest(
-        cafe_id=cafe_id,
-        proposed_name=data.get("name"),
-        proposed_location=data.get("location"),
-        proposed_coffee_price=data.get("coffee_price"),
-        proposed_seats=data.get("seats"),
-        proposed_map_url=data.get("map_url"),
-        proposed_img_url=data.get("img_url"),
-        proposed_has_toilet=data.get("has_toilet"),
-        proposed_has_wifi=data.get("has_wifi"),
-        proposed_has_sockets=data.get("has_sockets"),
-        proposed_can_take_calls=data.get("can_take_calls"),
-    )
-    db.session.add(new_request)
-    db.session.commit()
+    try:
+        coordinates = cafe_geo.coordinates_from(data.get("lat"), data.get("lng")) or (None, None)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    proposal = {
+        "cafe_id": cafe_id,
+        "proposed_name": data.get("name"),
+        "proposed_location": data.get("location"),
+        "proposed_coffee_price": data.get("coffee_price"),
+        "proposed_seats": data.get("seats"),
+        "proposed_map_url": data.get("map_url"),
+        "proposed_img_url": data.get("img_url"),
+        "proposed_has_toilet": data.get("has_toilet"),
+        "proposed_has_wifi": data.get("has_wifi"),
+        "proposed_has_sockets": data.get("has_sockets"),
+        "proposed_can_take_calls": data.get("can_take_calls"),
+        "proposed_lat": coordinates[0],
+        "proposed_lng": coordinates[1],
+    }
 
-    return jsonify({"success": "Cafe update request submitted. Awaiting approval."}), 201
+    # 큐를 쓰지 않으면 바로 커밋
+    if update_writer is None:
+        db.session.add(UpdateRequest(**proposal))
+        db.session.commit()
+        return jsonify({"success": "Cafe update request submitted. Awaiting approval."}), 201
+
+    # 쓰기 스레드가 묶어서 커밋하므로 접수 번호와 상태 조회 URL만 돌려줌 (큐가 가득 차면 잠시 후 다시 시도하도록 503)
+    try:
+        ticket = update_writer.submit(proposal, timeout=UPDATE_QUEUE_WAIT_MS / 1000)
+    except QueueFull:
+        response = jsonify({"error": "Too many update requests. Please retry shortly."})
+        response.headers["Retry-After"] = "1"
+        return response, 503
+    status_url = url_for("get_update_request_status", ticket=ticket)
+    response = jsonify({"ticket": ticket, "status": QUEUED, "status_url": status_url})
+    response.headers["Location"] = status_url
+    return response, 202
+
+# [GET] 수정 요청 접수 상태 조회 API (그룹 커밋 큐의 접수 번호)
+@app.route("/cafes/update-requests/<ticket>", methods=["GET"])
+@swag_from({
+    "tags": ["Cafes"],
+    "summary": "수정 요청 접수 상태 조회",
+    "description": "수정 요청이 202로 접수되었을 때 받은 `ticket`의 상태를 반환합니다. "
+                   "`queued`(아직 저장 전), `failed`(저장 실패) 또는 저장된 요청의 처리 상태"
+                   "(`pending`, `approved`, `rejected`)와 `request_id`가 나옵니다.",
+    "parameters": [
+        {
+            "name": "ticket",
+            "in": "path",
+            "type": "string",
+            "required": True,
+            "description": "수정 요청 접수 번호"
+        }
+    ],
+    "responses": {
+        200: {
+            "description": "접수 상태",
+            "examples": {
+                "application/json": {"ticket": "3f2b9c0e8d6a4b1f9e7c5a3d1b0f8e6c", "status": "pending", "request_id": 12}
+            }
+        },
+        404: {
+            "description": "알 수 없는 접수 번호",
+            "examples": {
+                "application/json": {"error": "Unknown ticket"}
+            }
+        }
+    }
+})
+def get_update_request_status(ticket):
+    local = update_writer.status(ticket) if update_writer is not None else None
+    if local is not None and local[0] != STORED:
+        return jsonify({"ticket": ticket, "status": local[0], "request_id": None}), 200
+
+    # 저장된 요청 (다른 워커에서 접수된 요청 포함)은 DB의 처리 상태를 돌려줌
+    row = db.session.execute(
+        select(UpdateRequest.id, UpdateRequest.status).where(UpdateRequest.ticket == ticket)
+    ).first()
+    if row is None:
+        return jsonify({"error": "Unknown ticket"}), 404
+    return jsonify({"ticket": ticket, "status": row.status, "request_id": row.id}), 200
 
 # ─────────────────────────────────────────────
 # 📌 7. 관리자 API (카페 수정 요청 관리, 승인, 거부, 삭제)
@@ -615,8 +2282,7 @@ def get_cafe_list():
     if not is_admin():
         abort(403, description="관리자 권한이 없습니다.")
 
-    cafes = Cafe.query.all()
-    return jsonify([cafe_to_dict(cafe) for cafe in cafes]), 200
+    return cafe_list_response(sync_catalog())
 
 # [DELETE] 카페 삭제 API (관련된 수정 요청도 삭제 /실제 배포시 공개할 필요가 없음)
 @app.route("/cafes/<int:cafe_id>", methods=["DELETE"])
@@ -667,7 +2333,9 @@ def remove_cafe(cafe_id):
     UpdateRequest.query.filter_by(cafe_id=cafe_id).delete()
 
     db.session.delete(cafe)
+    unstage_cafe_indexes(cafe_id)
     db.session.commit()
+    drop_cafe_from_indexes(cafe_id)
 
     return jsonify({"success": "Successfully removed cafe and related update requests."}), 200
 
@@ -676,7 +2344,8 @@ def remove_cafe(cafe_id):
 @swag_from({
     "tags": ["Admin"],
     "summary": "카페 수정 요청 승인/거부",
-    "description": "관리자가 카페 수정 요청을 승인하거나 거부할 수 있습니다.",
+    "description": "관리자가 카페 수정 요청을 승인하거나 거부할 수 있습니다. "
+                   "처리된 요청은 삭제되지 않고 상태(`approved`, `rejected`)만 바뀝니다.",
     "security": [{"BearerAuth": []}],
     "parameters": [
         {
@@ -711,6 +2380,12 @@ def remove_cafe(cafe_id):
         },
         404: {
             "description": "수정 요청을 찾을 수 없음"
+        },
+        409: {
+            "description": "이미 승인 / 거부된 요청",
+            "examples": {
+                "application/json": {"error": "Request already approved"}
+            }
         }
     }
 })
@@ -727,52 +2402,226 @@ def process_update_request(request_id):
 
     if action not in ["approve", "reject"]:
         return jsonify({"error": "Invalid action"}), 400
+    if update_request.status != "pending":
+        return jsonify({"error": f"Request already {update_request.status}"}), 409
 
     updated_cafe = None  # 승인된 경우 반환할 카페 데이터
+    replaced_img_urls = []  # 커밋 후 썸네일 캐시에서 지울 이전 이미지 주소
 
     if action == "approve":
-        cafe = Cafe.query.get(update_request.cafe_id)
+        cafe = db.session.get(Cafe, update_request.cafe_id)
         if cafe:
-            if update_request.proposed_name:
-                cafe.name = update_request.proposed_name
-            if update_request.proposed_location:
-                cafe.location = update_request.proposed_location
-            if update_request.proposed_coffee_price:
-                cafe.coffee_price = update_request.proposed_coffee_price
-            if update_request.proposed_seats:
-                cafe.seats = update_request.proposed_seats
-            if update_request.proposed_map_url:
-                cafe.map_url = update_request.proposed_map_url
             if update_request.proposed_img_url:
-                cafe.img_url = update_request.proposed_img_url
-            if update_request.proposed_has_toilet is not None:
-                cafe.has_toilet = update_request.proposed_has_toilet
-            if update_request.proposed_has_wifi is not None:
-                cafe.has_wifi = update_request.proposed_has_wifi
-            if update_request.proposed_has_sockets is not None:
-                cafe.has_sockets = update_request.proposed_has_sockets
-            if update_request.proposed_can_take_calls is not None:
-                cafe.can_take_calls = update_request.proposed_can_take_calls
-            db.session.commit()
+                replaced_img_urls.append(cafe.img_url)
+            apply_update_request(cafe, update_request)
+            stage_cafe_indexes(cafe)
             updated_cafe = cafe_to_dict(cafe)
 
+    # 카페 변경과 요청 상태 변경을 한 번에 커밋 (요청은 남겨 두어 접수 번호로 처리 결과를 조회할 수 있게)
     update_request.status = "approved" if action == "approve" else "rejected"
-    db.session.delete(update_request)
     db.session.commit()
+    if updated_cafe:
+        sync_cafe_indexes(SimpleNamespace(id=updated_cafe["id"], name=updated_cafe["name"], location=updated_cafe["location"],
+                                          version=updated_cafe["version"], **updated_cafe["amenities"]))
+    forget_thumbnails(replaced_img_urls)
 
     if action == "approve":
         return jsonify({"success": "Cafe update approved", "updated_cafe": updated_cafe}), 200
     else:
         return jsonify({"success": "Cafe update request rejected"}), 200
 
+# 관리자 수정 요청 일괄 승인 / 거부 API (한 트랜잭션으로 처리)
+@app.route("/admin/update-requests", methods=["PATCH"])
+@swag_from({
+    "tags": ["Admin"],
+    "summary": "카페 수정 요청 일괄 승인/거부",
+    "description": "여러 수정 요청을 한 번에 승인하거나 거부합니다. 요청과 카페를 각각 한 번의 IN 쿼리로 읽고 "
+                   "모든 변경을 한 트랜잭션으로 커밋합니다. 결과는 요청별로 반환됩니다. "
+                   "(이름 중복 등으로 실패한 요청은 대기 상태로 남고, 이미 처리된 요청은 오류로 표시됩니다.)",
+    "security": [{"BearerAuth": []}],
+    "parameters": [
+        {
+            "name": "body",
+            "in": "body",
+            "required": True,
+            "schema": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "request_id": {"type": "integer", "example": 5},
+                        "action": {"type": "string", "enum": ["approve", "reject"]}
+                    }
+                }
+            }
+        }
+    ],
+    "responses": {
+        200: {
+            "description": "처리 결과",
+            "examples": {
+                "application/json": {
+                    "approved": 1, "rejected": 1, "failed": 1,
+                    "results": [
+                        {"request_id": 5, "status": "approved", "updated_cafe": {"id": 1, "name": "새로운 카페 이름"}},
+                        {"request_id": 6, "status": "rejected"},
+                        {"request_id": 7, "status": "error", "error": "Request not found"}
+                    ]
+                }
+            }
+        },
+        400: {
+            "description": "잘못된 요청 본문"
+        },
+        403: {
+            "description": "관리자 권한 없음"
+        }
+    }
+})
+def process_update_requests_batch():
+    if not is_admin():
+        abort(403, description="관리자 권한이 없습니다.")
+
+    data = request.get_json(silent=True)
+    items = data.get("requests") if isinstance(data, dict) else data
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "Body must be a non-empty list of {request_id, action}"}), 400
+    if len(items) > MAX_BATCH_ACTIONS:
+        return jsonify({"error": f"At most {MAX_BATCH_ACTIONS} requests per batch"}), 400
+
+    # 요청 / 카페 / 이름 중복 확인용 이름을 각각 한 번의 IN 쿼리로 조회 (정수가 아닌 request_id는 항목별 오류로 처리)
+    request_ids = [item.get("request_id") for item in items if isinstance(item, dict)]
+    request_ids = [request_id for request_id in request_ids if is_request_id(request_id)]
+    requests_by_id = {req.id: req for req in db.session.scalars(
+        select(UpdateRequest).where(UpdateRequest.id.in_(request_ids)))}
+    cafes_by_id = {cafe.id: cafe for cafe in db.session.scalars(
+        select(Cafe).where(Cafe.id.in_({req.cafe_id for req in requests_by_id.values()})))}
+    proposed_names = {req.proposed_name for req in requests_by_id.values() if req.proposed_name}
+    name_owners = dict(db.session.execute(select(Cafe.name, Cafe.id).where(Cafe.name.in_(proposed_names))).all())
+
+    results = []
+    updated_cafes = {}
+    replaced_img_urls = []  # 커밋 후 썸네일 캐시에서 지울 이전 이미지 주소
+    for item in items:
+        request_id = item.get("request_id") if isinstance(item, dict) else None
+        action = item.get("action") if isinstance(item, dict) else None
+        if not is_request_id(request_id):
+            results.append({"request_id": request_id, "status": "error", "error": "request_id must be an integer"})
+            continue
+        if action not in ["approve", "reject"]:
+            results.append({"request_id": request_id, "status": "error", "error": "Invalid action"})
+            continue
+        update_request = requests_by_id.pop(request_id, None)
+        if not update_request:
+            results.append({"request_id": request_id, "status": "error", "error": "Request not found"})
+            continue
+        if update_request.status != "pending":
+            results.append({"request_id": request_id, "status": "error",
+                            "error": f"Request already {update_request.status}"})
+            continue
+
+        result = {"request_id": request_id, "status": "approved" if action == "approve" else "rejected"}
+        if action == "approve":
+            cafe = cafes_by_id.get(update_request.cafe_id)
+            if cafe:
+                new_name = update_request.proposed_name
+                if new_name and name_owners.get(new_name, cafe.id) != cafe.id:
+                    results.append({"request_id": request_id, "status": "error",
+                                    "error": f"A cafe named '{new_name}' already exists"})
+                    continue
+                if new_name:
+                    name_owners.pop(cafe.name, None)
+                    name_owners[new_name] = cafe.id
+                if update_request.proposed_img_url:
+                    replaced_img_urls.append(cafe.img_url)
+                apply_update_request(cafe, update_request)
+                updated_cafes[cafe.id] = cafe
+            result["cafe_id"] = update_request.cafe_id
+
+        update_request.status = result["status"]
+        results.append(result)
+
+    # 모든 변경을 한 트랜잭션으로 커밋 (커밋 후 만료되는 속성을 다시 읽지 않도록 미리 직렬화)
+    for cafe in updated_cafes.values():
+        stage_cafe_indexes(cafe)
+    updated = {cafe_id: cafe_to_dict(cafe) for cafe_id, cafe in updated_cafes.items()}
+    try:
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+    for data in updated.values():
+        sync_cafe_indexes(SimpleNamespace(id=data["id"], name=data["name"], location=data["location"],
+                                          version=data["version"], **data["amenities"]))
+    forget_thumbnails(replaced_img_urls)
+    for result in results:
+        if result["status"] == "approved":
+            result["updated_cafe"] = updated.get(result.pop("cafe_id"))
+
+    return jsonify({
+        "approved": sum(result["status"] == "approved" for result in results),
+        "rejected": sum(result["status"] == "rejected" for result in results),
+        "failed": sum(result["status"] == "error" for result in results),
+        "results": results
+    }), 200
+
 
 # 관리자 수정 요청 목록 조회 API (변경된 요청 목록 반환)
 @app.route("/admin/update-requests", methods=["GET"])
 @swag_from({
     "tags": ["Admin"],
     "summary": "카페 수정 요청 목록 조회",
-    "description": "관리자가 현재 대기 중인 카페 수정 요청을 확인할 수 있습니다.",
+    "description": "관리자가 카페 수정 요청을 확인할 수 있습니다 (대기 중인 요청만 보려면 `status=pending`). "
+                   "요청과 원본 카페를 한 번의 JOIN 쿼리로 조회하며, "
+                   f"요청 id 기준 키셋 페이지네이션으로 한 번에 최대 `limit`개(기본 {DEFAULT_PAGE_LIMIT})를 반환합니다 "
+                   "(다음 페이지는 `Link: <...>; rel=\"next\"` 헤더).",
     "security": [{"BearerAuth": []}],
+    "parameters": [
+        {
+            "name": "status",
+            "in": "query",
+            "type": "string",
+            "enum": ["pending", "approved", "rejected"],
+            "required": False,
+            "description": "요청 상태"
+        },
+        {
+            "name": "cafe_id",
+            "in": "query",
+            "type": "integer",
+            "required": False,
+            "description": "특정 카페의 요청만 조회"
+        },
+        {
+            "name": "created_after",
+            "in": "query",
+            "type": "string",
+            "required": False,
+            "description": "이 시각 이후 생성된 요청 (ISO 8601, 예: 2025-02-01T00:00:00)"
+        },
+        {
+            "name": "created_before",
+            "in": "query",
+            "type": "string",
+            "required": False,
+            "description": "이 시각 이전 생성된 요청 (ISO 8601)"
+        },
+        {
+            "name": "limit",
+            "in": "query",
+            "type": "integer",
+            "required": False,
+            "description": f"페이지 크기 (기본 {DEFAULT_PAGE_LIMIT}, 최대 {MAX_PAGE_LIMIT})"
+        },
+        {
+            "name": "after",
+            "in": "query",
+            "type": "integer",
+            "required": False,
+            "description": "이 요청 id 다음부터 조회"
+        }
+    ],
     "responses": {
         200: {
             "description": "수정 요청 목록 반환",
@@ -791,6 +2640,12 @@ def process_update_request(request_id):
                 }
             }
         },
+        400: {
+            "description": "잘못된 날짜 형식",
+            "examples": {
+                "application/json": {"error": "created_after must be an ISO 8601 datetime"}
+            }
+        },
         403: {
             "description": "관리자 권한 없음"
         }
@@ -800,17 +2655,36 @@ def get_update_requests():
     if not is_admin():
         abort(403, description="관리자 권한이 없습니다.")
 
-    requests = UpdateRequest.query.all()
-
-    if not requests:
-        return jsonify([]), 200
+    # 요청과 원본 카페를 한 번에 조회 (카페가 삭제된 요청은 INNER JOIN으로 제외, ORM 인스턴스 없이 행으로 받음)
+    request_fields = UpdateRequest.__table__.c.keys()
+    stmt = select(UpdateRequest.__table__, *cafe_rows.columns(Cafe.__table__)).join(Cafe, Cafe.id == UpdateRequest.cafe_id)
+
+    status = request.args.get("status")
+    if status:
+        stmt = stmt.where(UpdateRequest.status == status)
+    cafe_id = request.args.get("cafe_id", type=int)
+    if cafe_id is not None:
+        stmt = stmt.where(UpdateRequest.cafe_id == cafe_id)
+    # created_at은 ISO 8601 문자열이므로 문자열 비교로 범위 검색
+    for param, compare in (("created_after", UpdateRequest.created_at.__ge__),
+                           ("created_before", UpdateRequest.created_at.__lt__)):
+        value = request.args.get(param)
+        if value:
+            try:
+                stmt = stmt.where(compare(datetime.fromisoformat(value).isoformat()))
+            except ValueError:
+                return jsonify({"error": f"{param} must be an ISO 8601 datetime"}), 400
+
+    after = parse_after()
+    stmt = stmt.where(UpdateRequest.id > after).order_by(UpdateRequest.id)
+    # limit이 없어도 전체를 한 번에 읽지 않고 기본 페이지 크기로 나눔
+    limit = parse_page_limit() or DEFAULT_PAGE_LIMIT
+    rows = db.session.connection().execute(stmt.limit(limit + 1)).all()
 
     results = []
-    for req in requests:
-        cafe = Cafe.query.get(req.cafe_id)
-        if not cafe:
-            continue
-
+    for row in rows[:limit]:
+        req = SimpleNamespace(**dict(zip(request_fields, row[:len(request_fields)])))
+        cafe = cafe_rows.CafeRow(*row[len(request_fields):])
         results.append({
             "request_id": req.id,
             "cafe_id": req.cafe_id,
@@ -834,11 +2708,18 @@ def get_update_requests():
             "proposed_has_sockets": req.proposed_has_sockets,
             "original_can_take_calls": cafe.can_take_calls,
             "proposed_can_take_calls": req.proposed_can_take_calls,
+            "original_lat": cafe.lat,
+            "proposed_lat": req.proposed_lat,
+            "original_lng": cafe.lng,
+            "proposed_lng": req.proposed_lng,
             "status": req.status,
             "created_at": req.created_at
         })
 
-    return jsonify(results), 200
+    response = jsonify(results)
+    if len(rows) > limit:
+        add_next_link(response, "get_update_requests", limit=limit, after=rows[limit - 1][0])  # 첫 컬럼이 요청 id
+    return response, 200
 
 # 관리자 수정 요청 삭제 기능 추가 API
 @app.route("/admin/update-requests/<int:request_id>", methods=["DELETE"])
@@ -884,5 +2765,114 @@ def delete_update_request(request_id):
 
     return jsonify({"success": "수정 요청이 삭제되었습니다."}), 200
 
+# [GET] 응답 캐시 통계 조회 API (관리자 전용, 캐시 크기 / TTL 튜닝용)
+@app.route("/admin/cache-stats", methods=["GET"])
+@swag_from({
+    "tags": ["Admin"],
+    "summary": "응답 캐시 통계 조회",
+    "description": "읽기 API 응답 캐시의 카탈로그 버전, 항목 수, 적중 / 실패 / 제거 횟수를 반환합니다.",
+    "security": [{"BearerAuth": []}],
+    "responses": {
+        200: {
+            "description": "캐시 통계",
+            "examples": {
+                "application/json": {
+                    "version": 3, "entries": 12, "max_entries": 256, "ttl_seconds": 300,
+                    "hits": 840, "misses": 60, "hit_ratio": 0.9333,
+                    "evictions": 0, "expirations": 4, "invalidations": 27
+                }
+            }
+        },
+        403: {
+            "description": "관리자 권한 없음"
+        }
+    }
+})
+def get_cache_stats():
+    if not is_admin():
+        abort(403, description="관리자 권한이 없습니다.")
+    return jsonify(response_cache.stats()), 200
+
+# [GET] Prometheus 메트릭 API (관리자 전용, 엔드포인트별 지연 시간 / SQL 쿼리 수)
+@app.route("/metrics", methods=["GET"])
+@swag_from({
+    "tags": ["Admin"],
+    "summary": "Prometheus 메트릭 조회",
+    "description": "엔드포인트별 지연 시간 히스토그램, 요청당 SQL 쿼리 수, DB 시간, 느린 요청 / 쿼리 수를 "
+                   "Prometheus 텍스트 형식으로 반환합니다. 값은 프로세스(워커)마다 따로 집계됩니다.",
+    "security": [{"BearerAuth": []}],
+    "produces": ["text/plain"],
+    "responses": {
+        200: {
+            "description": "Prometheus 텍스트 형식 메트릭",
+            "examples": {
+                "text/plain": 'cafe_http_request_duration_seconds_bucket{endpoint="get_cafe",method="GET",le="0.005"} 42'
+            }
+        },
+        403: {
+            "description": "관리자 권한 없음"
+        }
+    }
+})
+def get_metrics():
+    if not is_admin():
+        abort(403, description="관리자 권한이 없습니다.")
+    return Response(metrics.registry.render(), mimetype=metrics.CONTENT_TYPE)
+
+# ─────────────────────────────────────────────
+# 📌 8. 앱 팩토리 / CLI 명령
+# ─────────────────────────────────────────────
+
+def create_app():
+    """앱 팩토리 (flask --app main, gunicorn "main:create_app()")
+
+    라우트는 모듈의 app에 등록되어 있으므로 같은 앱에 요청 훅 / 확장만 한 번 등록해서 돌려준다.
+    무거운 작업은 미룬다: 스키마는 flask init-db / flask db upgrade, Swagger 스펙은 첫 문서 요청,
+    Flask-Migrate(alembic)는 flask 명령으로 실행될 때만 불러온다.
+    """
+    if "cafe_wifi" in app.extensions:
+        return app
+    app.extensions["cafe_wifi"] = True
+    # 엔드포인트별 지연 시간 / 요청당 쿼리 수 기록 (/metrics)
+    metrics.init_flask(app)
+    if COMPRESS_LEVEL > 0:
+        compression.init_flask(app, COMPRESS_MIN_BYTES, COMPRESS_LEVEL, BROTLI_QUALITY)
+    api_docs.init_app(app)
+    if update_writer is not None:
+        # 종료 시 큐에 남은 수정 요청을 모두 넣고 끝냄 (gunicorn 워커의 정상 종료 포함)
+        atexit.register(update_writer.close, UPDATE_DRAIN_SECONDS)
+        metrics.registry.add_collector(update_queue_metrics)
+    metrics.registry.add_collector(thumbnail_metrics)
+    if admission is not None:
+        # 요청마다 토큰 버킷 / 동시 실행 상한 확인 (metrics 훅 뒤에 등록해서 거절한 요청도 기록됨)
+        app.before_request(admit_request)
+        app.teardown_request(release_request)
+        metrics.registry.add_collector(admission_metrics)
+    if click.get_current_context(silent=True) is not None:
+        init_migrate(app)
+    return app
+
+# [CLI] flask init-db
+@app.cli.command("init-db")
+def init_db_command():
+    """테이블과 검색 / 좌표 인덱스를 만든다 (새 DB는 최신 마이그레이션으로 표시)"""
+    fresh = not sa_inspect(db.engine).has_table("cafe")
+    init_db()
+    if fresh:
+        # 마이그레이션은 기존 cafe 테이블을 고치는 것부터 시작하므로 새로 만든 스키마는 head로 stamp
+        from flask_migrate import stamp
+        stamp()
+    click.echo("Database initialized.")
+
+# [CLI] flask build-assets
+@app.cli.command("build-assets")
+def build_assets_command():
+    """정적 CSS / JS에 내용 해시를 붙여 static/build에 복사하고 압축본(.gz / .br)과 manifest를 만든다"""
+    for source, built in sorted(static_assets.build(app.static_folder).items()):
+        click.echo(f"{source} -> {built}")
+    asset_manifest.reload()
+
+create_app()
+
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,196 @@
+import bisect
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+# ─────────────────────────────────────────────
+# 📌 요청 / SQL 계측 (엔드포인트별 지연 시간 히스토그램, 요청당 쿼리 수, 느린 요청 / 쿼리 로그)
+# ─────────────────────────────────────────────
+# 요청별 쿼리 수 / DB 시간은 ContextVar에 모으므로 Flask 스레드와 ASGI 태스크 모두에서 동작한다.
+# 값은 프로세스마다 따로 유지된다 (Prometheus가 워커별로 수집).
+
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", 500))
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", 100))
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+logger = logging.getLogger("cafe_wifi.slow")
+
+_current = ContextVar("request_stats", default=None)
+
+
+class RequestStats:
+    __slots__ = ("started", "endpoint", "queries", "db_seconds")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.endpoint = None  # 라우팅이 끝난 뒤 set_endpoint()로 지정
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.total += value
+        self.count += 1
+
+    def lines(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{bound:g}"}} {cumulative}'
+        yield f'{name}_bucket{{{labels},le="+Inf"}} {self.count}'
+        yield f"{name}_sum{{{labels}}} {self.total:.6f}"
+        yield f"{name}_count{{{labels}}} {self.count}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency = {}        # (endpoint, method) -> Histogram
+        self.query_counts = {}   # (endpoint, method) -> Histogram
+        self.requests = {}       # (endpoint, method, status) -> int
+        self.db_queries = {}     # endpoint -> int
+        self.db_seconds = {}     # endpoint -> float
+        self.slow_requests = 0
+        self.slow_queries = 0
+        self.collectors = []     # 렌더링할 때 호출해서 추가 줄을 받는 함수 (큐 깊이 등 다른 모듈의 값)
+
+    def add_collector(self, collect):
+        """collect()는 Prometheus 텍스트 줄들을 돌려줘야 한다."""
+        self.collectors.append(collect)
+
+    def start_request(self):
+        return _current.set(RequestStats())
+
+    def finish_request(self, token, endpoint, method, status):
+        """요청 하나를 기록하고 (지연 시간 초, 쿼리 수, DB 시간 초)를 돌려준다."""
+        stats = _current.get()
+        _current.reset(token)
+        if stats is None:
+            return None
+        elapsed = time.perf_counter() - stats.started
+        key = (endpoint, method)
+        with self._lock:
+            self.latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(elapsed)
+            self.query_counts.setdefault(key, Histogram(QUERY_COUNT_BUCKETS)).observe(stats.queries)
+            status_key = (endpoint, method, str(status))
+            self.requests[status_key] = self.requests.get(status_key, 0) + 1
+            if elapsed * 1000 >= SLOW_REQUEST_MS:
+                self.slow_requests += 1
+        if elapsed * 1000 >= SLOW_REQUEST_MS:
+            logger.warning("slow request: %s %s -> %s %.1fms (queries=%d, db=%.1fms)",
+                           method, endpoint, status, elapsed * 1000, stats.queries, stats.db_seconds * 1000)
+        return elapsed, stats.queries, stats.db_seconds
+
+    def record_query(self, statement, seconds):
+        stats = _current.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += seconds
+        endpoint = getattr(stats, "endpoint", None) or "-"
+        with self._lock:
+            self.db_queries[endpoint] = self.db_queries.get(endpoint, 0) + 1
+            self.db_seconds[endpoint] = self.db_seconds.get(endpoint, 0.0) + seconds
+            if seconds * 1000 >= SLOW_QUERY_MS:
+                self.slow_queries += 1
+        if seconds * 1000 >= SLOW_QUERY_MS:
+            logger.warning("slow query: %.1fms %s", seconds * 1000, " ".join(statement.split())[:500])
+
+    def render(self):
+        """Prometheus 텍스트 형식"""
+        lines = []
+        with self._lock:
+            lines += ["# HELP cafe_http_request_duration_seconds Request latency by endpoint",
+                      "# TYPE cafe_http_request_duration_seconds histogram"]
+            for (endpoint, method), histogram in sorted(self.latency.items()):
+                lines += histogram.lines("cafe_http_request_duration_seconds", labels(endpoint=endpoint, method=method))
+            lines += ["# HELP cafe_http_requests_total Requests by endpoint and status",
+                      "# TYPE cafe_http_requests_total counter"]
+            for (endpoint, method, status), count in sorted(self.requests.items()):
+                lines.append(f"cafe_http_requests_total{{{labels(endpoint=endpoint, method=method, status=status)}}} {count}")
+            lines += ["# HELP cafe_db_queries_per_request SQL statements executed per request",
+                      "# TYPE cafe_db_queries_per_request histogram"]
+            for (endpoint, method), histogram in sorted(self.query_counts.items()):
+                lines += histogram.lines("cafe_db_queries_per_request", labels(endpoint=endpoint, method=method))
+            lines += ["# HELP cafe_db_queries_total SQL statements executed (endpoint '-' = outside a request)",
+                      "# TYPE cafe_db_queries_total counter"]
+            for endpoint, count in sorted(self.db_queries.items()):
+                lines.append(f"cafe_db_queries_total{{{labels(endpoint=endpoint)}}} {count}")
+            lines += ["# HELP cafe_db_query_seconds_total Time spent executing SQL statements",
+                      "# TYPE cafe_db_query_seconds_total counter"]
+            for endpoint, seconds in sorted(self.db_seconds.items()):
+                lines.append(f"cafe_db_query_seconds_total{{{labels(endpoint=endpoint)}}} {seconds:.6f}")
+            lines += ["# HELP cafe_slow_requests_total Requests slower than SLOW_REQUEST_MS",
+                      "# TYPE cafe_slow_requests_total counter",
+                      f"cafe_slow_requests_total {self.slow_requests}",
+                      "# HELP cafe_slow_queries_total SQL statements slower than SLOW_QUERY_MS",
+                      "# TYPE cafe_slow_queries_total counter",
+                      f"cafe_slow_queries_total {self.slow_queries}"]
+        for collect in self.collectors:
+            lines += collect()
+        return "\n".join(lines) + "\n"
+
+
+def labels(**values):
+    return ",".join(f'{name}="{escape(value)}"' for name, value in values.items())
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+registry = MetricsRegistry()
+
+
+def set_endpoint(endpoint):
+    """현재 요청의 쿼리를 어느 엔드포인트로 집계할지 지정 (라우팅이 끝난 뒤 호출)"""
+    stats = _current.get()
+    if stats is not None:
+        stats.endpoint = endpoint
+
+
+def instrument_engine(engine):
+    """엔진의 모든 SQL 실행 시간을 잰다. 비동기 엔진은 engine.sync_engine을 넘긴다."""
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        registry.record_query(statement, time.perf_counter() - started)
+
+
+def init_flask(app):
+    """Flask 요청 훅 등록 (엔드포인트 이름 = 뷰 함수 이름, 매칭되지 않은 경로는 'unmatched')"""
+    from flask import g, request
+
+    @app.before_request
+    def start_request_metrics():
+        g.metrics_token = registry.start_request()
+        set_endpoint(request.endpoint or "unmatched")
+
+    @app.after_request
+    def finish_request_metrics(response):
+        token = g.pop("metrics_token", None)
+        if token is not None:
+            registry.finish_request(token, request.endpoint or "unmatched", request.method, response.status_code)
+        return response
@@ -0,0 +1,27 @@
+"""Add cafe_search FTS5 table
+
+Revision ID: 5c2f8e1a9b34
+Revises: 40d0409a2575
+Create Date: 2026-10-18 10:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from search_index import SEARCH_TABLE, ensure_search_table
+
+
+# revision identifiers, used by Alembic.
+revision = '5c2f8e1a9b34'
+down_revision = '40d0409a2575'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FTS5 가상 테이블 생성 후 기존 카페 전체 색인
+    ensure_search_table(op.get_bind())
+
+
+def downgrade():
+    op.execute(sa.text(f"DROP TABLE IF EXISTS {SEARCH_TABLE}"))
@@ -0,0 +1,27 @@
+"""Add cafe_dedupe near-duplicate index table
+
+Revision ID: c3a9f0d4e812
+Revises: b7d41c2e9a53
+Create Date: 2026-10-18 11:52:07.402913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from cafe_duplicates import DEDUPE_TABLE, ensure_dedupe_table
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3a9f0d4e812'
+down_revision = 'b7d41c2e9a53'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 밴드 테이블 / 인덱스 생성 후 기존 카페 전체 색인
+    ensure_dedupe_table(op.get_bind())
+
+
+def downgrade():
+    op.execute(sa.text(f"DROP TABLE IF EXISTS {DEDUPE_TABLE}"))
@@ -0,0 +1,51 @@
+"""Recompute coffee_price_value from won prices only
+
+Revision ID: e5b81c3f2a07
+Revises: c3a9f0d4e812
+Create Date: 2026-10-18 14:05:41.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from cafe_parsing import parse_price
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b81c3f2a07'
+down_revision = 'c3a9f0d4e812'
+branch_labels = None
+depends_on = None
+
+# 백필 배치 크기 (배치마다 커밋해서 쓰기 잠금을 짧게 유지)
+BATCH_SIZE = 500
+
+
+def upgrade():
+    # 원화가 아닌 가격('£2.40' 등)은 None으로 바뀌므로 기존 행을 다시 계산 (배치별 커밋)
+    with op.get_context().autocommit_block():
+        backfill_price_values(op.get_bind())
+
+
+def backfill_price_values(conn):
+    last_id = 0
+    while True:
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        rows = conn.execute(
+            sa.text("SELECT id, coffee_price FROM cafe WHERE id > :last_id ORDER BY id LIMIT :limit"),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).all()
+        if rows:
+            conn.execute(
+                sa.text("UPDATE cafe SET coffee_price_value = :price WHERE id = :id"),
+                [{"id": row.id, "price": parse_price(row.coffee_price)} for row in rows],
+            )
+        conn.exec_driver_sql("COMMIT")
+        if len(rows) < BATCH_SIZE:
+            return
+        last_id = rows[-1].id
+
+
+def downgrade():
+    # 스키마 변경이 없고 이전 해석(통화 무시)은 되돌릴 필요가 없으므로 값은 그대로 둠
+    pass
@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import OrderedDict
+
+# ─────────────────────────────────────────────
+# 📌 읽기 API 응답 캐시 (LRU + TTL, 카탈로그 버전으로 무효화)
+# ─────────────────────────────────────────────
+
+# 본문과 함께 저장하는 응답 헤더
+CACHED_HEADERS = ("Link",)
+
+
+class CachedResponse:
+    __slots__ = ("version", "expires_at", "status", "body", "mimetype", "headers", "encoded")
+
+    def __init__(self, version, expires_at, status, body, mimetype, headers=()):
+        self.version = version
+        self.expires_at = expires_at
+        self.status = status
+        self.body = body
+        self.mimetype = mimetype
+        self.headers = headers  # 함께 돌려줄 헤더 (예: 다음 페이지 Link)
+        self.encoded = {}       # 인코딩 -> 압축본 (처음 요청될 때 만듦)
+
+
+class ResponseCache:
+    """카탈로그 버전은 DB의 변경 피드 순번(change_sequence)이고, 모든 워커가 같은 순번으로 ETag를 만든다.
+
+    요청마다 sync(현재 순번, drop_changed)를 먼저 호출한다. 순번이 앞서 있으면 drop_changed(since)가
+    응답을 만드는 다른 계층(카페 조각, 전체 목록 본문)에서 그 사이에 바뀐 내용을 지운 뒤에 새 순번을 반영하므로,
+    새 ETag가 붙은 응답은 오래된 계층에서 만들어지지 않는다. 쓰기 라우트의 bump()는 커밋 직후 항목을 바로 비운다.
+    TTL은 메모리를 붙잡아 두는 시간의 상한이다.
+    """
+
+    def __init__(self, max_entries=256, ttl=300, max_entry_bytes=1024 * 1024, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_entry_bytes = max_entry_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def etag(self, version=None):
+        return f"catalog-{self.version if version is None else version}"
+
+    def sync(self, version, drop_changed=None):
+        """DB에서 읽은 현재 순번을 반영하고 그대로 돌려준다.
+
+        앞선 순번이면 drop_changed(이전 순번)를 먼저 호출한 뒤 모든 항목을 무효화한다
+        (잠금 밖에서 호출하므로 동시에 호출되면 둘 다 지울 수 있음, 지우기는 여러 번 해도 같은 결과여야 함).
+        """
+        if version > self.version and drop_changed is not None:
+            drop_changed(self.version)
+        with self._lock:
+            if version > self.version:
+                self.version = version
+                self.invalidations += len(self._entries)
+                self._entries.clear()
+        return version
+
+    def bump(self):
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.version != self.version or entry.expires_at <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, version, status, body, mimetype, headers=()):
+        # 응답을 만드는 동안 다른 요청이 더 새로운 순번을 반영했다면 이미 오래된 결과이므로 저장하지 않음
+        if len(body) > self.max_entry_bytes:
+            return
+        with self._lock:
+            if version != self.version:
+                return
+            self._entries[key] = CachedResponse(version, self._clock() + self.ttl, status, body, mimetype, tuple(headers))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "version": self.version,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,117 @@
+from sqlalchemy import column, text
+
+from hangul import is_choseong_query, normalize, to_choseong
+
+# ─────────────────────────────────────────────
+# 📌 카페 이름 / 위치 전문 검색 인덱스 (SQLite FTS5)
+# ─────────────────────────────────────────────
+# rowid = cafe.id, 초성 컬럼은 'ㅅㅌㅂㅅ' 같은 초성 검색용
+# 모든 함수는 Session 또는 Connection을 받아서 호출한 쪽의 트랜잭션 안에서 실행된다.
+
+SEARCH_TABLE = "cafe_search"
+
+CREATE_SEARCH_TABLE = text(
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+    "name, location, name_choseong, location_choseong, "
+    "tokenize = 'unicode61', prefix = '1 2 3')"
+)
+
+# bm25 컬럼 가중치 (이름 > 위치 > 초성)
+RANK_WEIGHTS = "10.0, 5.0, 2.0, 1.0"
+
+INSERT_ROW = text(
+    f"INSERT INTO {SEARCH_TABLE} (rowid, name, location, name_choseong, location_choseong) "
+    "VALUES (:id, :name, :location, :name_choseong, :location_choseong)"
+)
+DELETE_ROW = text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :id")
+
+
+def search_row(cafe_id, name, location):
+    return {
+        "id": cafe_id,
+        "name": normalize(name),
+        "location": normalize(location),
+        "name_choseong": to_choseong(name),
+        "location_choseong": to_choseong(location),
+    }
+
+
+def ensure_search_table(conn):
+    """검색 테이블을 만들고, 카페 수와 맞지 않으면 전체를 다시 색인한다."""
+    conn.execute(CREATE_SEARCH_TABLE)
+    indexed = conn.execute(text(f"SELECT count(*) FROM {SEARCH_TABLE}")).scalar()
+    total = conn.execute(text("SELECT count(*) FROM cafe")).scalar()
+    if indexed != total:
+        rebuild_search_index(conn)
+
+
+def rebuild_search_index(conn, batch_size=1000):
+    conn.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            text("SELECT id, name, location FROM cafe WHERE id > :last_id ORDER BY id LIMIT :limit"),
+            {"last_id": last_id, "limit": batch_size},
+        ).all()
+        if not rows:
+            return
+        conn.execute(INSERT_ROW, [search_row(*row) for row in rows])
+        last_id = rows[-1][0]
+
+
+def index_cafe(conn, cafe_id, name, location):
+    conn.execute(DELETE_ROW, {"id": cafe_id})
+    conn.execute(INSERT_ROW, search_row(cafe_id, name, location))
+
+
+def index_new_cafes(conn, rows):
+    """새로 추가된 카페 (id, name, location) 여러 개를 한 번에 색인"""
+    if rows:
+        conn.execute(INSERT_ROW, [search_row(*row) for row in rows])
+
+
+def unindex_cafe(conn, cafe_id):
+    conn.execute(DELETE_ROW, {"id": cafe_id})
+
+
+def build_match_query(query, columns=("name", "location")):
+    """사용자 입력을 FTS5 MATCH 식으로 변환 (각 단어는 접두어 검색, 단어끼리는 AND).
+
+    초성이 섞인 단어('ㄱㄴ', '강ㄴ')는 초성 컬럼에서 찾는다.
+    """
+    terms = []
+    for token in normalize(query).split():
+        if is_choseong_query(token):
+            token, target = to_choseong(token), [f"{name}_choseong" for name in columns]
+        else:
+            target = list(columns)
+        phrase = '"' + token.replace('"', '""') + '"'
+        terms.append(f"{{{' '.join(target)}}} : {phrase}*")
+    return " AND ".join(terms) or None
+
+
+def search_cafe_ids(conn, query, limit=None, columns=("name", "location")):
+    """검색어와 일치하는 카페 id 목록 (bm25 순위 순)"""
+    match = build_match_query(query, columns)
+    if match is None:
+        return []
+    rows = conn.execute(
+        text(
+            f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :match "
+            f"ORDER BY bm25({SEARCH_TABLE}, {RANK_WEIGHTS}), rowid LIMIT :limit"
+        ),
+        {"match": match, "limit": -1 if limit is None else limit},
+    )
+    return [row[0] for row in rows]
+
+
+def match_subquery(query, columns=("name", "location")):
+    """Cafe.id.in_(...)에 넣을 수 있는 서브쿼리 (검색어가 비어 있으면 None)"""
+    match = build_match_query(query, columns)
+    if match is None:
+        return None
+    return (
+        text(f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :match")
+        .bindparams(match=match)
+        .columns(column("rowid"))
+    )
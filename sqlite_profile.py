@@ -0,0 +1,113 @@
+import os
+
+from flask import has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+# ─────────────────────────────────────────────
+# 📌 SQLite 엔진 프로파일 (PRAGMA 설정 + 읽기 / 쓰기 커넥션 풀 분리)
+# ─────────────────────────────────────────────
+# development: 기존 동작 그대로 (엔진 하나, 쿼리 로그 출력, 기본 PRAGMA)
+# production : WAL 저널 + synchronous=NORMAL, 쿼리 로그 끔,
+#              GET/HEAD 요청은 읽기 전용 커넥션 풀, 나머지는 커넥션 1개짜리 쓰기 풀 사용
+
+PROFILES = ("development", "production")
+READER_BIND = "reader"
+READ_METHODS = ("GET", "HEAD")
+
+
+def production_pragmas():
+    """모든 커넥션에 연결 직후 적용할 PRAGMA (환경 변수로 조정 가능)"""
+    return {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)),
+        "cache_size": -int(os.getenv("SQLITE_CACHE_SIZE_KB", 64 * 1024)),  # 음수 = KiB 단위
+        "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000)),
+        "temp_store": "MEMORY",
+    }
+
+
+def configure(app, database_uri, profile):
+    """Flask 설정에 프로파일을 반영한다. SQLAlchemy(db).init_app(app) 전에 호출해야 한다."""
+    if profile not in PROFILES:
+        raise ValueError(f"DB_PROFILE must be one of {', '.join(PROFILES)}")
+    app.config["SQLALCHEMY_DATABASE_URI"] = database_uri
+    if profile == "development":
+        app.config["SQLALCHEMY_ECHO"] = True  # SQLAlchemy 쿼리 로그 활성화
+        return
+    app.config["SQLALCHEMY_ECHO"] = False
+    # 쓰기는 프로세스당 커넥션 하나로 직렬화 (SQLite는 어차피 쓰기 잠금이 하나뿐)
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        "pool_size": 1,
+        "max_overflow": 0,
+        "pool_timeout": int(os.getenv("DB_WRITE_POOL_TIMEOUT", 30)),
+    }
+    app.config["SQLALCHEMY_BINDS"] = {
+        READER_BIND: {
+            "url": database_uri,
+            "pool_size": int(os.getenv("DB_READ_POOL_SIZE", 8)),
+            "max_overflow": int(os.getenv("DB_READ_POOL_OVERFLOW", 8)),
+        }
+    }
+
+
+def install(db, profile):
+    """엔진이 만들어진 뒤 (init_app 이후, 앱 컨텍스트 안에서) 커넥션 이벤트를 등록한다."""
+    if profile != "production":
+        return
+    pragmas = production_pragmas()
+    writer = db.engines[None]
+    reader = db.engines[READER_BIND]
+
+    @event.listens_for(writer, "connect")
+    def on_writer_connect(dbapi_connection, connection_record):
+        # pysqlite의 암묵적 BEGIN을 끄고 아래 begin 이벤트에서 직접 시작
+        dbapi_connection.isolation_level = None
+        apply_pragmas(dbapi_connection, pragmas)
+
+    @event.listens_for(writer, "begin")
+    def on_writer_begin(connection):
+        # 처음부터 쓰기 잠금을 잡아서 busy_timeout 안에서 기다리게 함
+        # (지연 BEGIN은 읽기 -> 쓰기로 올라갈 때 기다리지 않고 SQLITE_BUSY로 실패할 수 있음)
+        if connection.get_execution_options().get("isolation_level") != "AUTOCOMMIT":
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+    install_reader(reader, profile)
+
+
+def install_reader(engine, profile):
+    """읽기 전용 엔진에 PRAGMA를 등록한다 (ASGI 읽기 API의 aiosqlite 엔진은 engine.sync_engine을 넘김)"""
+    if profile != "production":
+        return
+    # journal_mode는 데이터베이스 파일에 저장되므로 쓰기 커넥션에서만 바꿈
+    pragmas = {name: value for name, value in production_pragmas().items() if name != "journal_mode"}
+
+    @event.listens_for(engine, "connect")
+    def on_reader_connect(dbapi_connection, connection_record):
+        apply_pragmas(dbapi_connection, pragmas)
+        apply_pragmas(dbapi_connection, {"query_only": "ON"})
+
+
+def apply_pragmas(dbapi_connection, pragmas):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+
+
+def is_read_request():
+    return has_request_context() and request.method in READ_METHODS
+
+
+class RoutingSession(Session):
+    """GET/HEAD 요청 안의 쿼리는 읽기 전용 풀로, 나머지(쓰기 요청, CLI, 시작 시 작업)는 쓰기 풀로 보낸다."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and is_read_request():
+            reader = self._db.engines.get(READER_BIND)
+            if reader is not None:
+                return reader
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
@@ -0,0 +1,39 @@
+// 📌 카페 목록 로컬 사본 (localStorage) + 변경 피드로 바뀐 부분만 받아오기
+// 처음에는 /cafes/changes?since=0 으로 전체를 받고, 이후에는 마지막으로 받은 순번(since) 뒤의 변경만 받는다.
+const CAFE_SYNC_KEY = "cafe-sync-v1";
+
+function loadCafeSnapshot() {
+    try {
+        const saved = JSON.parse(localStorage.getItem(CAFE_SYNC_KEY));
+        if (saved && typeof saved.since === "number" && saved.cafes) return saved;
+    } catch (error) {
+        // 손상된 사본은 버리고 처음부터 다시 받음
+    }
+    return { since: 0, cafes: {} };
+}
+
+// ✅ 로컬 사본을 최신으로 맞춘 뒤 id 순서의 카페 배열 반환
+async function syncCafes() {
+    const snapshot = loadCafeSnapshot();
+    let hasMore = true;
+    while (hasMore) {
+        const response = await fetch(`/cafes/changes?since=${snapshot.since}`);
+        if (!response.ok) throw new Error("카페 목록을 불러오는 중 오류 발생");
+
+        const page = await response.json();
+        // 변경은 순번 순서대로 적용 (삭제 후 같은 id로 다시 추가된 경우도 순서대로 반영됨)
+        page.changes.forEach(change => {
+            if (change.op === "delete") delete snapshot.cafes[change.id];
+            else snapshot.cafes[change.id] = change.cafe;
+        });
+        snapshot.since = page.next;
+        hasMore = page.has_more;
+    }
+
+    try {
+        localStorage.setItem(CAFE_SYNC_KEY, JSON.stringify(snapshot));
+    } catch (error) {
+        // 저장 공간이 부족하면 다음 방문 때 다시 전체를 받음
+    }
+    return Object.values(snapshot.cafes).sort((a, b) => a.id - b.id);
+}
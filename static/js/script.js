@@ -1,22 +1,29 @@
 document.addEventListener("DOMContentLoaded", function () {
-    fetchCafes(); // ✅ 초기 페이지 로드 시 전체 목록 가져오기
+    fetchCafes(); // ✅ 서버가 렌더링한 첫 페이지 뒤에 나머지 목록 추가 (로컬 사본 + 변경분만 요청)
     document.getElementById("random-cafe-btn").addEventListener("click", fetchRandomCafe);
     document.getElementById("search-form").addEventListener("submit", searchCafes);
 });
 
-// 📌 [GET] 모든 카페 목록 가져오기 (초기 로딩용)
+let showingSearchResults = false; // 검색 결과를 보여 주는 중이면 나머지 목록을 덧붙이지 않음
+
+// 📌 [GET] 모든 카페 목록 가져오기 (첫 페이지는 이미 HTML에 있으므로 마지막 카드 뒤의 카페만 추가)
 async function fetchCafes() {
+    const cafeList = document.getElementById("cafe-list");
     try {
-        const response = await fetch("/cafes");
-        if (!response.ok) throw new Error("카페 목록을 불러오는 중 오류 발생");
-
-        const cafes = await response.json();
-        const cafeList = document.getElementById("cafe-list");
-
-        // ✅ 기존 리스트 초기화 후 새로운 데이터 추가
-        cafeList.innerHTML = generateCafeCards(cafes);
+        const cafes = await syncCafes();
+        if (showingSearchResults) return;
+        const cards = cafeList.querySelectorAll(".cafe-card");
+        const lastId = cards.length ? Number(cards[cards.length - 1].dataset.id) : 0;
+        const rest = cafes.filter(cafe => cafe.id > lastId);
+
+        if (!cards.length) {
+            // 첫 페이지가 비어 있었으면 (빈 목록 안내 문구) 목록 전체를 새로 그림
+            if (rest.length) cafeList.innerHTML = generateCafeCards(rest);
+            return;
+        }
+        cafeList.insertAdjacentHTML("beforeend", generateCafeCards(rest));
     } catch (error) {
-        document.getElementById("cafe-list").innerHTML = `<p style="color: red;">${error.message}</p>`;
+        cafeList.insertAdjacentHTML("beforeend", `<p style="color: red;">${error.message}</p>`);
     }
 }
 
@@ -29,6 +36,7 @@ async function searchCafes(event) {
         alert("검색할 지역을 입력하세요!");
         return;
     }
+    showingSearchResults = true;
 
     try {
         const response = await fetch(`/cafes/location/${encodeURIComponent(location.toLowerCase())}`);
@@ -75,9 +83,9 @@ async function fetchRandomCafe() {
 // ✅ 🔧 공통 UI 생성 함수 (검색 & 전체 리스트에 동일한 카드 적용)
 function generateCafeCards(cafes) {
     return cafes.map(cafe => `
-        <div class="cafe-card">
+        <div class="cafe-card" data-id="${cafe.id}">
             <h3><a href="/cafe/${cafe.id}">${cafe.name}</a></h3>
-            <a href="/cafe/${cafe.id}"><img src="${cafe.img_url}" alt="${cafe.name}" width="100%"></a>
+            <a href="/cafe/${cafe.id}"><img src="/cafes/${cafe.id}/thumb?w=320&v=${cafe.version}" alt="${cafe.name}" width="100%" loading="lazy"></a>
             <p>📍 위치: ${cafe.location}</p>
             <p>💰 커피 가격: ${cafe.coffee_price ? cafe.coffee_price : "정보 없음"}</p>
             <a href="${cafe.map_url}" target="_blank">📍 지도 보기</a>
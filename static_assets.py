@@ -0,0 +1,97 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+try:
+    import brotli  # 선택 의존성 (설치되어 있으면 .br 압축본도 생성)
+except ImportError:
+    brotli = None
+
+# ─────────────────────────────────────────────
+# 📌 정적 파일 지문(fingerprint) 빌드 (flask build-assets)
+# ─────────────────────────────────────────────
+# static/의 CSS / JS를 내용 해시가 들어간 이름으로 static/build/에 복사하고 (css/style.css -> build/css/style.<해시>.css)
+# 최고 압축률의 .gz / .br 파일을 함께 만든다. 템플릿은 asset_url('css/style.css')로 manifest의 주소를 쓴다.
+# 이름이 내용으로 정해지므로 1년 immutable 캐시가 가능하고, 예전 빌드 파일은 지우지 않아서
+# 배포 중에 이전 HTML을 받은 브라우저도 예전 주소로 파일을 받을 수 있다.
+
+BUILD_DIR = "build"
+MANIFEST_NAME = "manifest.json"
+EXTENSIONS = (".css", ".js")
+HASH_LENGTH = 12
+# (인코딩, 파일 확장자) - 앞쪽을 먼저 고름
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+def write_file(path, data):
+    # 다른 워커가 쓰는 중인 파일을 보내지 않도록 임시 파일에 쓴 뒤 바꿈
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    with os.fdopen(fd, "wb") as file:
+        file.write(data)
+    os.replace(temp_path, path)
+
+
+def build(static_dir):
+    """static_dir의 CSS / JS에 지문을 붙여 복사하고 manifest를 쓴다. {원래 경로: 빌드 경로} 반환"""
+    build_dir = os.path.join(static_dir, BUILD_DIR)
+    manifest = {}
+    for directory, subdirectories, names in os.walk(static_dir):
+        subdirectories[:] = sorted(name for name in subdirectories if os.path.join(directory, name) != build_dir)
+        for name in sorted(names):
+            if not name.endswith(EXTENSIONS):
+                continue
+            source = os.path.join(directory, name)
+            relative = os.path.relpath(source, static_dir).replace(os.sep, "/")
+            with open(source, "rb") as file:
+                data = file.read()
+            stem, extension = os.path.splitext(relative)
+            built = f"{BUILD_DIR}/{stem}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}{extension}"
+            target = os.path.join(static_dir, *built.split("/"))
+            if not os.path.exists(target):  # 같은 이름이면 내용도 같음
+                write_file(target + ".gz", gzip.compress(data, compresslevel=9, mtime=0))
+                if brotli is not None:
+                    write_file(target + ".br", brotli.compress(data, quality=11))
+                write_file(target, data)
+            manifest[relative] = built
+    write_file(os.path.join(build_dir, MANIFEST_NAME),
+               json.dumps(manifest, indent=2, sort_keys=True).encode() + b"\n")
+    return manifest
+
+
+class AssetManifest:
+    """빌드된 manifest (처음 쓸 때 읽음, 빌드 전이면 빈 manifest)"""
+
+    def __init__(self, static_dir):
+        self.path = os.path.join(static_dir, BUILD_DIR, MANIFEST_NAME)
+        self._lock = threading.Lock()
+        self._entries = None
+
+    def get(self, filename):
+        """filename의 빌드 경로 (static 기준), 빌드되지 않은 파일이면 None"""
+        entries = self._entries
+        if entries is None:
+            entries = self.reload()
+        return entries.get(filename)
+
+    def reload(self):
+        with self._lock:
+            try:
+                with open(self.path, encoding="utf-8") as file:
+                    self._entries = json.load(file)
+            except (OSError, ValueError):
+                self._entries = {}
+            return self._entries
+
+
+def select_precompressed(path, accept):
+    """Accept-Encoding(werkzeug Accept)에 맞는 미리 압축된 파일 (경로, 인코딩), 없으면 (path, None)"""
+    available = {encoding: path + suffix for encoding, suffix in PRECOMPRESSED if os.path.isfile(path + suffix)}
+    encoding = accept.best_match(list(available) + ["identity"], default="identity")
+    if encoding in available:
+        return available[encoding], encoding
+    return path, None
@@ -0,0 +1,21 @@
+import pytest
+
+from cafe_parsing import parse_price, parse_seats
+
+
+@pytest.mark.parametrize("text, value", [
+    ("₩4,500", 4500.0), ("₩ 4,500", 4500.0), ("4500원", 4500.0), ("2,800원", 2800.0),
+    ("4.5천원", 4500.0), ("KRW 4500", 4500.0), ("₩4,500 ~ 5,000", 4500.0),
+    # 다른 통화 / 통화를 알 수 없는 값은 원화와 비교하지 않음
+    ("£2.40", None), ("$3", None), ("4500", None), ("4.5k", None), ("£2 (₩3,500)", None),
+    ("정보 없음", None), ("Unknown", None), ("", None), (None, None),
+])
+def test_parse_price(text, value):
+    assert parse_price(text) == value
+
+
+@pytest.mark.parametrize("text, value", [
+    ("50석", 50), ("50+", 50), ("20-30", 20), ("약 40석", 40), (12, 12), ("Unknown", None), ("", None),
+])
+def test_parse_seats(text, value):
+    assert parse_seats(text) == value
@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+
+import pytest
+
+from cafe_serializer import FragmentStore
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def cafe(cafe_id, name, version):
+    return SimpleNamespace(id=cafe_id, name=name, version=version)
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def store(clock):
+    return FragmentStore(lambda c: {"id": c.id, "name": c.name}, ttl=300, max_entries=3, clock=clock)
+
+
+def test_fragment_reused_until_invalidated(store):
+    assert store.fragment(cafe(1, "A", 1)) == b'{"id":1,"name":"A"}'
+    assert store.fragment(cafe(1, "B", 1)) == b'{"id":1,"name":"A"}'
+    store.invalidate(1)
+    assert store.fragment(cafe(1, "B", 2)) == b'{"id":1,"name":"B"}'
+
+
+def test_invalidate_with_version_rejects_older_rows(store):
+    store.fragment(cafe(1, "A", 1))
+    store.invalidate(1, 5)
+    assert store.cached([1]) == ({}, [1])
+    # 변경 전에 읽어 둔 행: 이번 응답에는 쓰지만 저장하지 않음
+    assert store.fragment(cafe(1, "A", 1)) == b'{"id":1,"name":"A"}'
+    assert store.cached([1]) == ({}, [1])
+    store.fragment(cafe(1, "B", 5))
+    assert store.cached([1]) == ({1: b'{"id":1,"name":"B"}'}, [])
+
+
+def test_invalidate_keeps_newer_fragment(store):
+    store.fragment(cafe(1, "B", 5))
+    store.invalidate(1, 4)
+    assert store.cached([1])[0] == {1: b'{"id":1,"name":"B"}'}
+
+
+def test_invalidate_marker_expires(store, clock):
+    store.invalidate(1, 5)
+    clock.now += 301
+    store.fragment(cafe(1, "A", 1))
+    assert store.cached([1])[0] == {1: b'{"id":1,"name":"A"}'}
+
+
+def test_cached_checks_versions(store):
+    store.fragment(cafe(1, "A", 1))
+    assert store.cached([1], {1: 2}) == ({}, [1])
+    assert store.cached([1], {1: 1})[0] == {1: b'{"id":1,"name":"A"}'}
+
+
+def test_lru_eviction(store):
+    for cafe_id in (1, 2, 3):
+        store.fragment(cafe(cafe_id, "A", 1))
+    store.cached([1])  # 1을 최근 사용으로
+    store.fragment(cafe(4, "A", 1))
+    assert len(store) == 3 and store.evictions == 1
+    assert store.cached([1, 2, 3, 4])[1] == [2]
@@ -0,0 +1,223 @@
+import ipaddress
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+import pytest
+
+import cafe_thumbs
+from cafe_thumbs import ThumbnailCache, ThumbnailError, is_public_address
+
+Image = pytest.importorskip("PIL.Image")
+
+LOOPBACK = ipaddress.ip_address("127.0.0.1")
+
+
+def image_bytes(size=(800, 600), mode="RGB", fmt="JPEG"):
+    buffer = BytesIO()
+    Image.new(mode, size, (200, 100, 50, 128)[:len(mode)]).save(buffer, fmt)
+    return buffer.getvalue()
+
+
+SVG = b'<svg xmlns="http://www.w3.org/2000/svg"><script>alert(1)</script></svg>'
+
+
+class Origin:
+    """이미지 원본 서버 대역 (경로 -> (상태, Content-Type, 본문), 경로별 요청 수 기록)"""
+
+    def __init__(self):
+        self.routes = {}
+        self.hits = {}
+        origin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                origin.hits[self.path] = origin.hits.get(self.path, 0) + 1
+                status, content_type, body = origin.routes.get(self.path, (404, "text/plain", b"missing"))
+                self.send_response(status)
+                if status in (301, 302):
+                    self.send_header("Location", body.decode())
+                    body = b""
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def url(self, path):
+        return self.base + path
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class Clock:
+    def __init__(self):
+        self.now = time.time()
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def origin():
+    server = Origin()
+    server.routes["/photo.jpg"] = (200, "image/jpeg", image_bytes())
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    # 대역 서버가 루프백에 있으므로 이 주소만 허용
+    return ThumbnailCache(str(tmp_path), failure_seconds=60, refresh_seconds=3600,
+                          allow_address=lambda address: address == LOOPBACK, clock=clock)
+
+
+def test_cache_hit_does_not_refetch(cache, origin):
+    first = cache.get(origin.url("/photo.jpg"), 320)
+    second = cache.get(origin.url("/photo.jpg"), 320)
+    assert first == second
+    assert origin.hits["/photo.jpg"] == 1
+    assert (cache.fetches, cache.resized) == (1, 1)
+
+
+def test_refetch_after_refresh_and_forget(cache, origin, clock):
+    url = origin.url("/photo.jpg")
+    cache.get(url, 320)
+    clock.now += 3601
+    cache.get(url, 320)
+    assert origin.hits["/photo.jpg"] == 2
+    cache.forget(url)
+    cache.get(url, 320)
+    assert origin.hits["/photo.jpg"] == 3
+
+
+def test_failed_fetch_backs_off(cache, origin, clock):
+    url = origin.url("/broken.jpg")
+    origin.routes["/broken.jpg"] = (500, "text/plain", b"error")
+    with pytest.raises(ThumbnailError):
+        cache.get(url, 320)
+    with pytest.raises(ThumbnailError):
+        cache.get(url, 320)
+    assert origin.hits["/broken.jpg"] == 1
+
+    clock.now += 61
+    origin.routes["/broken.jpg"] = (200, "image/jpeg", image_bytes())
+    assert cache.get(url, 320).content_type == "image/jpeg"
+    assert origin.hits["/broken.jpg"] == 2
+    assert cache.fetch_errors == 1
+
+
+def test_stale_copy_served_when_refresh_fails(cache, origin, clock):
+    url = origin.url("/photo.jpg")
+    thumb = cache.get(url, 320)
+    clock.now += 3601
+    origin.routes["/photo.jpg"] = (503, "text/plain", b"down")
+    assert cache.get(url, 320) == thumb
+    assert cache.fetch_errors == 1
+
+
+def test_eviction_keeps_cache_under_limit(tmp_path, origin, clock):
+    for i in range(8):
+        origin.routes[f"/{i}.png"] = (200, "image/png", image_bytes((300 + i, 300), fmt="PNG"))
+    cache = ThumbnailCache(str(tmp_path), max_bytes=4000, allow_address=lambda address: address == LOOPBACK,
+                           clock=clock)
+    for i in range(8):
+        cache.get(origin.url(f"/{i}.png"))
+    cache.evict()
+    assert cache.evicted > 0
+    assert cache.size() <= 4000
+
+
+@pytest.mark.parametrize("content_type, body", [
+    ("image/svg+xml", SVG),
+    ("image/png", SVG),           # Content-Type만 이미지인 SVG
+    ("text/html", b"<html></html>"),
+    ("image/png", b"not really a png"),
+])
+def test_rejects_non_raster_images(cache, origin, content_type, body):
+    origin.routes["/bad"] = (200, content_type, body)
+    with pytest.raises(ThumbnailError):
+        cache.get(origin.url("/bad"), 320)
+    assert cache.fetches == 0
+    assert not os.path.exists(os.path.join(cache.root, "blobs"))
+
+
+def test_rejects_private_addresses(tmp_path, origin):
+    cache = ThumbnailCache(str(tmp_path))  # 기본 설정: 공개 주소만
+    for url in (origin.url("/photo.jpg"), f"http://localhost:{origin.server.server_port}/photo.jpg"):
+        with pytest.raises(ThumbnailError):
+            cache.get(url, 320)
+    assert origin.hits == {}
+
+
+def test_rejects_redirect_to_blocked_address(cache, origin):
+    origin.routes["/hop"] = (302, "text/plain", f"http://127.0.0.2:{origin.server.server_port}/photo.jpg".encode())
+    with pytest.raises(ThumbnailError):
+        cache.get(origin.url("/hop"), 320)
+    assert "/photo.jpg" not in origin.hits
+
+
+def test_checks_address_at_connect_time(cache, origin, monkeypatch):
+    # URL 확인 뒤 DNS 응답이 내부 주소로 바뀌어도 연결하지 않음
+    calls = []
+    real_check_url = cafe_thumbs.check_url
+
+    def check_then_rebind(url, allow_address):
+        real_check_url(url, allow_address)
+        calls.append(url)
+
+    monkeypatch.setattr(cafe_thumbs, "check_url", check_then_rebind)
+    cache.allow_address = lambda address: True
+    cache._opener = cafe_thumbs.build_opener(lambda address: address != LOOPBACK)
+    with pytest.raises(ThumbnailError):
+        cache.get(origin.url("/photo.jpg"), 320)
+    assert calls and origin.hits == {}
+
+
+@pytest.mark.parametrize("address, public", [
+    ("127.0.0.1", False), ("10.0.0.8", False), ("172.16.0.1", False), ("192.168.1.1", False),
+    ("169.254.169.254", False), ("100.64.0.1", False), ("0.0.0.0", False), ("240.0.0.1", False),
+    ("224.0.0.1", False), ("::1", False), ("fe80::1", False), ("fc00::1", False),
+    ("::ffff:127.0.0.1", False), ("64:ff9b::a00:1", False), ("2002:7f00:1::", False),
+    ("93.184.216.34", True), ("2606:2800:220:1::1", True),
+])
+def test_is_public_address(address, public):
+    assert is_public_address(ipaddress.ip_address(address)) is public
+
+
+def test_width_variants(cache, origin):
+    url = origin.url("/photo.jpg")
+    small, medium = cache.get(url, 160), cache.get(url, 320)
+    assert small.path != medium.path
+    with Image.open(small.path) as image:
+        assert image.size == (160, 120)
+    with Image.open(medium.path) as image:
+        assert image.size == (320, 240)
+    # 원본보다 큰 너비는 늘리지 않음
+    with Image.open(cache.get(url, 2000).path) as image:
+        assert image.size == (800, 600)
+    assert origin.hits["/photo.jpg"] == 1
+
+
+def test_transparent_images_stay_png(cache, origin):
+    origin.routes["/logo.png"] = (200, "image/png", image_bytes((400, 400), mode="RGBA", fmt="PNG"))
+    thumb = cache.get(origin.url("/logo.png"), 160)
+    assert thumb.content_type == "image/png"
+    with Image.open(thumb.path) as image:
+        assert image.mode == "RGBA" and image.size == (160, 160)
@@ -0,0 +1,68 @@
+import pytest
+
+from response_cache import ResponseCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def cache(clock):
+    return ResponseCache(max_entries=2, ttl=300, clock=clock)
+
+
+def test_etag_follows_global_version(cache):
+    assert cache.sync(7) == 7
+    assert cache.etag() == cache.etag(7) == "catalog-7"
+    # 다른 워커가 먼저 반영했어도 더 오래된 순번으로 되돌리지 않음
+    assert cache.sync(5) == 5
+    assert cache.version == 7
+
+
+def test_sync_drops_changed_layers_before_publishing(cache):
+    cache.sync(3)
+    cache.put("a", 3, 200, b"[]", "application/json")
+    seen = []
+
+    def drop_changed(since):
+        seen.append((since, cache.version, cache.get("a") is not None))
+
+    cache.sync(3, drop_changed)
+    assert seen == []
+    cache.sync(5, drop_changed)
+    # 새 순번을 반영하기 전에 호출됨 (그동안은 이전 순번 / 이전 항목이 그대로)
+    assert seen == [(3, 3, True)]
+    assert cache.version == 5 and cache.get("a") is None
+
+
+def test_put_rejects_older_version(cache):
+    cache.sync(2)
+    cache.put("a", 1, 200, b"[]", "application/json")
+    assert cache.get("a") is None
+    cache.put("a", 2, 200, b"[]", "application/json")
+    assert cache.get("a").body == b"[]"
+
+
+def test_entries_expire_and_evict(cache, clock):
+    for key in ("a", "b", "c"):
+        cache.put(key, 0, 200, key.encode(), "application/json")
+    assert cache.get("a") is None and cache.evictions == 1
+    clock.now += 301
+    assert cache.get("b") is None and cache.expirations == 1
+
+
+def test_bump_clears_entries(cache):
+    cache.put("a", 0, 200, b"[]", "application/json")
+    cache.bump()
+    assert cache.get("a") is None
+    assert cache.stats()["invalidations"] == 1
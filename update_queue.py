@@ -0,0 +1,144 @@
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+# ─────────────────────────────────────────────
+# 📌 수정 요청 그룹 커밋 큐 (백그라운드 쓰기 스레드)
+# ─────────────────────────────────────────────
+# 공개 수정 요청을 요청마다 커밋하면 SQLite 쓰기 잠금을 두고 경쟁하므로, 크기가 정해진 큐에 넣고
+# 쓰기 스레드가 batch_size개가 모이거나 첫 항목 이후 flush_seconds가 지나면 한 트랜잭션으로 넣는다.
+# 큐가 가득 차면 submit()이 QueueFull을 던진다 (라우트가 503 + Retry-After로 응답).
+# ticket별 결과는 최근 max_results개만 프로세스 메모리에 남긴다 (커밋된 요청은 DB의 ticket 컬럼으로도 찾음).
+
+logger = logging.getLogger("cafe_wifi.update_queue")
+
+QUEUED, STORED, FAILED = "queued", "stored", "failed"
+_STOP = object()
+
+
+class QueueFull(Exception):
+    pass
+
+
+class GroupCommitWriter:
+    """write_batch([(ticket, item)])는 한 트랜잭션으로 넣고 같은 순서의 id 목록을 돌려줘야 한다."""
+
+    def __init__(self, write_batch, max_queue=1000, batch_size=100, flush_seconds=0.02, max_results=10000):
+        self._write_batch = write_batch
+        self._queue = queue.Queue(max_queue)
+        self._batch_size = batch_size
+        self._flush_seconds = flush_seconds
+        self._max_results = max_results
+        self._lock = threading.Lock()
+        self._results = OrderedDict()  # ticket -> (상태, 요청 id)
+        self._thread = None
+        self._closed = False
+        self.batches = 0
+        self.stored = 0
+        self.failed = 0
+        self.rejected = 0
+
+    @property
+    def depth(self):
+        return self._queue.qsize()
+
+    def submit(self, item, timeout=0.0):
+        """item을 큐에 넣고 ticket을 돌려준다. timeout초 안에 자리가 나지 않거나 닫힌 뒤면 QueueFull"""
+        ticket = uuid.uuid4().hex
+        with self._lock:
+            if self._closed:
+                raise QueueFull("writer is shutting down")
+            self._start()
+            self._remember(ticket, QUEUED, None)
+        try:
+            self._queue.put((ticket, item), timeout=timeout)
+        except queue.Full:
+            with self._lock:
+                self._results.pop(ticket, None)
+                self.rejected += 1
+            raise QueueFull("update queue is full") from None
+        return ticket
+
+    def status(self, ticket):
+        """(상태, 요청 id) 또는 이 프로세스가 모르는 ticket이면 None"""
+        with self._lock:
+            return self._results.get(ticket)
+
+    def close(self, timeout=30.0):
+        """새 요청을 막고 큐에 남은 요청을 모두 넣은 뒤 쓰기 스레드를 끝낸다 (종료 시 호출)."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join(timeout)
+        # 스레드가 없었거나 제시간에 끝나지 않았으면 남은 항목을 여기서 넣음
+        leftover = []
+        while True:
+            try:
+                entry = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is not _STOP:
+                leftover.append(entry)
+        for start in range(0, len(leftover), self._batch_size):
+            self._flush(leftover[start:start + self._batch_size])
+
+    def _start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="update-request-writer", daemon=True)
+            self._thread.start()
+
+    def _remember(self, ticket, state, request_id):
+        self._results[ticket] = (state, request_id)
+        self._results.move_to_end(ticket)
+        while len(self._results) > self._max_results:
+            self._results.popitem(last=False)
+
+    def _run(self):
+        while True:
+            entry = self._queue.get()
+            if entry is _STOP:
+                return
+            batch = [entry]
+            deadline = time.monotonic() + self._flush_seconds
+            stopping = False
+            while len(batch) < self._batch_size:
+                try:
+                    entry = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+            self._flush(batch)
+            if stopping:
+                return
+
+    def _flush(self, batch):
+        try:
+            ids = self._write_batch(batch)
+        except Exception:
+            if len(batch) > 1:
+                # 한 항목 때문에 묶음 전체가 실패하지 않도록 하나씩 다시 시도
+                for entry in batch:
+                    self._flush([entry])
+                return
+            logger.exception("update request %s could not be stored", batch[0][0])
+            results = [(FAILED, None)]
+        else:
+            results = [(STORED, request_id) for request_id in ids]
+        with self._lock:
+            self.batches += 1
+            for (ticket, _), (state, request_id) in zip(batch, results):
+                if state == STORED:
+                    self.stored += 1
+                else:
+                    self.failed += 1
+                self._remember(ticket, state, request_id)